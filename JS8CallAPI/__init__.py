@@ -1,5 +1,7 @@
 from .core import JS8CallAPI
-from .grid_utils import lat_lon_to_grid_square
+from .async_core import AsyncJS8CallAPI
+from .grid_utils import lat_lon_to_grid_square, grid_square_to_lat_lon
+from .records import Spot, DirectedMessage, CallActivityEntry, BandActivityEntry, InboxMessage
 
 # Re-export constants for ease of use
 JS8_NORMAL = JS8CallAPI.JS8_NORMAL
@@ -9,5 +11,6 @@ JS8_SLOW = JS8CallAPI.JS8_SLOW
 JS8_ULTRA = JS8CallAPI.JS8_ULTRA
 
 __version__ = '0.2.0'
-__all__ = ['JS8CallAPI', 'lat_lon_to_grid_square', 
+__all__ = ['JS8CallAPI', 'AsyncJS8CallAPI', 'lat_lon_to_grid_square', 'grid_square_to_lat_lon',
+           'Spot', 'DirectedMessage', 'CallActivityEntry', 'BandActivityEntry', 'InboxMessage',
            'JS8_NORMAL', 'JS8_FAST', 'JS8_TURBO', 'JS8_SLOW', 'JS8_ULTRA'] 
\ No newline at end of file
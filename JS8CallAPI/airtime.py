@@ -0,0 +1,265 @@
+import functools
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from .core import JS8CallAPI
+
+SPEEDS = (JS8CallAPI.JS8_NORMAL, JS8CallAPI.JS8_FAST, JS8CallAPI.JS8_TURBO,
+          JS8CallAPI.JS8_SLOW, JS8CallAPI.JS8_ULTRA)
+
+# Transmit period (slot length) in seconds for each speed mode
+SPEED_PERIODS = {
+    JS8CallAPI.JS8_NORMAL: 15.0,
+    JS8CallAPI.JS8_FAST: 10.0,
+    JS8CallAPI.JS8_TURBO: 6.0,
+    JS8CallAPI.JS8_SLOW: 30.0,
+    JS8CallAPI.JS8_ULTRA: 4.0,
+}
+
+# Seconds on air per frame: 79 symbols of 1920/1200/600/3840/384 samples at 12 kHz
+FRAME_SECONDS = {
+    JS8CallAPI.JS8_NORMAL: 12.64,
+    JS8CallAPI.JS8_FAST: 7.9,
+    JS8CallAPI.JS8_TURBO: 3.95,
+    JS8CallAPI.JS8_SLOW: 25.28,
+    JS8CallAPI.JS8_ULTRA: 2.528,
+}
+
+# Free text characters carried by one frame's 72-bit payload (conservative; common words compress better)
+CHARS_PER_FRAME = 12
+
+# Characters added by the 16-bit checksum of commands that carry one
+CHECKSUM_CHARS = 3
+
+# Directed commands that JS8Call sends with a checksum on the text that follows
+CHECKSUM_COMMANDS = frozenset(('MSG', 'MSG TO:', 'QUERY', 'QUERY CALL', 'QUERY MSGS', 'CMD', 'GRID', '>'))
+
+# Other directed commands, so they are not counted as free text
+DIRECTED_COMMANDS = frozenset(('SNR?', '?', 'HEARING?', 'GRID?', 'STATUS?', 'STATUS', 'INFO?', 'INFO',
+                               'ACK', 'HEARING', 'SNR', 'NO', 'YES', '73', 'AGN?', 'RR', 'FB', 'QSL?',
+                               'QSL', 'SK', 'HB', 'HEARTBEAT', 'QUERY MSGS?')) | CHECKSUM_COMMANDS
+
+# A callsign (with a digit, optionally /portable) or an @GROUP, optionally followed by ':' or '>' (relay)
+_RECIPIENT_RE = re.compile(r'^(?:@[A-Z0-9/]+|[A-Z0-9/]*\d[A-Z0-9/]*)[:>]?$')
+
+
+class Airtime:
+    """
+    Airtime of one message in one speed mode.
+
+    Attributes:
+        frames (int): Number of JS8 frames
+        speed (int): Speed mode (JS8_NORMAL, ...)
+        airtime (float): Seconds the transmitter is keyed
+        duration (float): Seconds from the start of the first slot to the end of the last frame
+        slots (float): Seconds of slots the message occupies (frames * period)
+    """
+
+    __slots__ = ('frames', 'speed', 'airtime', 'duration', 'slots')
+
+    def __init__(self, frames: int, speed: int):
+        self.frames = frames
+        self.speed = speed
+        self.airtime = frames * FRAME_SECONDS[speed]
+        self.duration = (frames - 1) * SPEED_PERIODS[speed] + FRAME_SECONDS[speed] if frames else 0.0
+        self.slots = frames * SPEED_PERIODS[speed]
+
+    def __repr__(self) -> str:
+        return (f"Airtime(frames={self.frames}, speed={self.speed}, airtime={self.airtime:.2f}, "
+                f"duration={self.duration:.2f})")
+
+
+def parse_message(text: str) -> Tuple[bool, str, str]:
+    """
+    Split a message into its directed header and free text.
+
+    Returns:
+        tuple: (directed, command, text). directed is True when the first word is a
+        callsign or @GROUP, command is the directed command ('' when there is none)
+        and text is whatever is left to send as data frames.
+    """
+    text = ' '.join(text.upper().split())
+    words = text.split(' ', 1)
+    if not words[0] or not _RECIPIENT_RE.match(words[0]):
+        return False, '', text
+    rest = words[1] if len(words) > 1 else ''
+    if words[0].endswith('>'):
+        return True, '>', rest
+    # Longest command first, so 'MSG TO:' wins over 'MSG'
+    for length in (3, 2, 1):
+        candidate = ' '.join(rest.split(' ')[:length])
+        if candidate in DIRECTED_COMMANDS:
+            return True, candidate, rest[len(candidate):].lstrip()
+    if rest.startswith('>'):
+        return True, '>', rest[1:].lstrip()
+    return True, '', rest
+
+
+@functools.lru_cache(maxsize=4096)
+def _frame_parts(text: str) -> Tuple[int, int]:
+    """Return (header frames, data characters including checksum); cached since queues repeat texts."""
+    directed, command, rest = parse_message(text)
+    chars = len(rest)
+    if chars and command in CHECKSUM_COMMANDS:
+        chars += CHECKSUM_CHARS
+    return int(directed), chars
+
+
+def frame_count(text: str) -> int:
+    """
+    Estimate how many JS8 frames a message needs.
+
+    A directed message (one starting with a callsign or @GROUP) spends one
+    frame on its header: the sender, the recipient and the command. Any text
+    after that goes out in data frames of about CHARS_PER_FRAME characters,
+    plus a checksum for commands such as MSG and QUERY. The frame count is
+    the same in every speed mode; only the frame length changes.
+
+    Args:
+        text (str): The message as passed to send_message_text()
+
+    Returns:
+        int: Number of frames (at least 1 for non-empty text, 0 for empty text)
+    """
+    header, chars = _frame_parts(text)
+    if not header and not chars:
+        return 0
+    return header + -(-chars // CHARS_PER_FRAME)
+
+
+def estimate(text: str, speed: int = JS8CallAPI.JS8_NORMAL) -> Airtime:
+    """
+    Estimate the frame count and transmit time of a message in one speed mode.
+
+    Args:
+        text (str): The message text
+        speed (int): Speed mode (default: JS8_NORMAL)
+
+    Returns:
+        Airtime: Frames, keyed seconds and total duration
+
+    Raises:
+        ValueError: If speed is not a JS8Call speed mode
+    """
+    if speed not in SPEED_PERIODS:
+        raise ValueError(f"Unknown speed mode: {speed}")
+    return Airtime(frame_count(text), speed)
+
+
+def estimate_modes(text: str) -> Dict[int, Airtime]:
+    """Estimate a message's airtime in every speed mode, keyed by speed constant."""
+    frames = frame_count(text)
+    return {speed: Airtime(frames, speed) for speed in SPEEDS}
+
+
+# -- batch planning ----------------------------------------------------------
+
+def batch_frames(texts: Iterable[str], use_numpy: Optional[bool] = None):
+    """
+    Frame counts for many messages at once.
+
+    Each message is parsed once; the frame arithmetic runs over the whole
+    batch as NumPy arrays when NumPy is installed.
+
+    Args:
+        texts (iterable): Message texts
+        use_numpy (bool, optional): Force (True) or avoid (False) NumPy (default: use it if installed)
+
+    Returns:
+        numpy.ndarray of int32 when NumPy is used, else a list of ints
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    parts = [_frame_parts(text) for text in texts]
+    if use_numpy:
+        if not parts:
+            return np.zeros(0, dtype='int32')
+        header, chars = np.array(parts, dtype='int32').T
+        frames = header + (chars + CHARS_PER_FRAME - 1) // CHARS_PER_FRAME
+        return frames.astype('int32')
+    return [header + -(-chars // CHARS_PER_FRAME) for header, chars in parts]
+
+
+def batch_airtime(texts: Iterable[str], speeds: Sequence[int] = SPEEDS,
+                  use_numpy: Optional[bool] = None) -> Dict[int, Dict[str, float]]:
+    """
+    Plan a whole queue: total frames, keyed time and slot time per speed mode.
+
+    Messages are assumed to go out back to back, each starting in the slot
+    after the previous one ends.
+
+    Args:
+        texts (iterable): Message texts
+        speeds (sequence): Speed modes to plan for (default: all of them)
+        use_numpy (bool, optional): Force (True) or avoid (False) NumPy (default: use it if installed)
+
+    Returns:
+        dict: speed -> {'messages', 'frames', 'airtime', 'duration', 'messages_per_hour'}
+    """
+    frames = batch_frames(texts, use_numpy)
+    count = len(frames)
+    total_frames = int(frames.sum()) if hasattr(frames, 'sum') else sum(frames)
+    plan = {}
+    for speed in speeds:
+        duration = total_frames * SPEED_PERIODS[speed]
+        plan[speed] = {
+            'messages': count,
+            'frames': total_frames,
+            'airtime': total_frames * FRAME_SECONDS[speed],
+            'duration': duration,
+            'messages_per_hour': count * 3600.0 / duration if duration else 0.0,
+        }
+    return plan
+
+
+def split_message(text: str, max_frames: int) -> List[str]:
+    """
+    Split a message into parts that each fit in max_frames frames.
+
+    Words are kept whole where possible. For directed messages the recipient
+    and command are repeated at the start of every part.
+
+    Args:
+        text (str): The message text
+        max_frames (int): Frame budget per part (at least 2 for directed messages)
+
+    Returns:
+        list: The parts, in order (just [text] if it already fits)
+
+    Raises:
+        ValueError: If max_frames leaves no room for text
+    """
+    if frame_count(text) <= max_frames:
+        return [text]
+    directed, command, rest = parse_message(text)
+    prefix = ''
+    if directed:
+        recipient = text.split(None, 1)[0].upper()
+        prefix = f"{recipient} {command} " if command and not recipient.endswith('>') else f"{recipient} "
+    budget = (max_frames - int(directed)) * CHARS_PER_FRAME
+    if command in CHECKSUM_COMMANDS:
+        budget -= CHECKSUM_CHARS
+    if budget <= 0:
+        raise ValueError(f"max_frames={max_frames} leaves no room for message text")
+    parts, current = [], ''
+    for word in rest.split(' '):
+        while len(word) > budget:
+            if current:
+                parts.append(current)
+                current = ''
+            parts.append(word[:budget])
+            word = word[budget:]
+        candidate = f"{current} {word}" if current else word
+        if len(candidate) > budget:
+            parts.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        parts.append(current)
+    return [prefix + part for part in parts]
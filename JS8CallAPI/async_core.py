@@ -0,0 +1,800 @@
+import asyncio
+import random
+import logging
+import time
+from typing import Dict, Iterator, List, Optional, Any, Sequence, Set, Tuple, Union
+
+import gpsd
+
+from .core import JS8CallAPI, BatchRequest
+from .grid_utils import lat_lon_to_grid_square
+from .framing import LineFramer
+from .codec import Codec, RequestTemplates, get_codec
+from .envelope import envelope_ids, envelope_types
+from .streaming import iter_inbox_payload
+from .delta import ActivityDelta, ActivityTracker
+from .records import (Spot, DirectedMessage, call_activity_records, band_activity_records,
+                      inbox_records)
+from .events import EventDispatcher, AsyncEventStream, Subscription, EventCallback, TypeFilter
+
+# Set up logging - but don't display to console by default
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Create null handler to avoid messages being printed to console
+logger.addHandler(logging.NullHandler())
+
+
+class AsyncJS8CallAPI:
+    """
+    An asyncio client for the JS8Call TCP API.
+
+    Offers the same methods as JS8CallAPI, as coroutines. One reader task
+    receives every message from JS8Call and resolves the future waiting on
+    each response's ``_ID``, so a single event loop can keep many requests
+    in flight over one connection without a thread per call.
+
+    Attributes:
+        host (str): The hostname or IP address of the JS8Call server (default: '127.0.0.1')
+        port (int): The TCP port number for the JS8Call API (default: 2442)
+        timeout (float): Seconds to wait for a response to each request (default: 5)
+    """
+
+    # JS8Call Speed Constants
+    JS8_NORMAL = JS8CallAPI.JS8_NORMAL
+    JS8_FAST = JS8CallAPI.JS8_FAST
+    JS8_TURBO = JS8CallAPI.JS8_TURBO
+    JS8_SLOW = JS8CallAPI.JS8_SLOW
+    JS8_ULTRA = JS8CallAPI.JS8_ULTRA
+
+    NO_RESPONSE_TYPES = JS8CallAPI.NO_RESPONSE_TYPES
+    ALWAYS_DECODE_TYPES = JS8CallAPI.ALWAYS_DECODE_TYPES
+    SNAPSHOT_REQUESTS = JS8CallAPI.SNAPSHOT_REQUESTS
+
+    MAX_LINE_BYTES = JS8CallAPI.MAX_LINE_BYTES
+
+    def __init__(self, host='127.0.0.1', port=2442, timeout=5, codec: Union[str, Codec, None] = None,
+                 max_line_bytes: Optional[int] = None):
+        """
+        Initialize the asyncio JS8Call API client.
+
+        Args:
+            host (str): The hostname or IP address of the JS8Call server (default: '127.0.0.1')
+            port (int): The TCP port number for the JS8Call API (default: 2442)
+            timeout (float): Seconds to wait for a response to each request (default: 5)
+            codec (str or Codec, optional): JSON backend - 'orjson', 'msgspec' or 'json'
+                (default: the fastest one installed)
+            max_line_bytes (int, optional): Largest response line buffered; longer lines
+                are dropped (default: MAX_LINE_BYTES, 16 MiB)
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._reader_error: Optional[Exception] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        # IDs of pending requests that want the raw response line
+        self._raw_ids: Set[int] = set()
+        self._call_activity_tracker = ActivityTracker()
+        self._band_activity_tracker = ActivityTracker()
+        self._events = EventDispatcher()
+        self._framer = LineFramer(max_line_bytes or self.MAX_LINE_BYTES, on_drop=self._on_dropped_line)
+        # Response size caps of pending send_message_raw(max_bytes=...) requests, by ID
+        self._line_caps: Dict[int, int] = {}
+        self._codec = codec if isinstance(codec, Codec) else get_codec(codec)
+        self._templates = RequestTemplates(self._codec)
+        self._gps_connected = False
+        self._closed = False
+        self._message_handlers = {
+            'CLOSE': self._handle_close,
+            'RX.DIRECTED': self._handle_directed,
+            'RX.SPOT': self._handle_spot,
+            'TX.FRAME': self._handle_tx_frame
+        }
+
+    async def __aenter__(self) -> 'AsyncJS8CallAPI':
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def _handle_close(self, message: Dict[str, Any]) -> None:
+        """Handle CLOSE message from JS8Call."""
+        self._closed = True
+        logger.info("JS8Call closed")
+
+    def _handle_directed(self, message: Dict[str, Any]) -> None:
+        """Handle RX.DIRECTED message from JS8Call."""
+        params = message.get('params', {})
+        logger.info(f"Directed message from {params.get('FROM')}: {params.get('TEXT')}")
+
+    def _handle_spot(self, message: Dict[str, Any]) -> None:
+        """Handle RX.SPOT message from JS8Call."""
+        params = message.get('params', {})
+        logger.info(f"Spot: {params.get('CALL')} at {params.get('FREQ')} Hz")
+
+    def _handle_tx_frame(self, message: Dict[str, Any]) -> None:
+        """Handle TX.FRAME message from JS8Call."""
+        params = message.get('params', {})
+        logger.info(f"TX Frame: {params.get('TEXT')}")
+
+    async def connect(self) -> None:
+        """
+        Connect to the JS8Call TCP server and start the reader task.
+
+        Raises:
+            ConnectionRefusedError: If the connection is refused (JS8Call not running)
+            Exception: For other connection-related errors
+        """
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port),
+                self.timeout
+            )
+        except ConnectionRefusedError:
+            logger.error(f"Connection refused. Make sure JS8Call is running and TCP API is enabled on port {self.port}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to connect: {e}")
+            raise
+        self._write_lock = asyncio.Lock()
+        self._reader_error = None
+        self._framer.reset()
+        self._reader_task = asyncio.ensure_future(self._reader_loop())
+
+    async def _reader_loop(self) -> None:
+        """Read messages until the connection ends, then fail any waiting requests."""
+        error: Exception = ConnectionError("Connection closed by server")
+        framer = self._framer
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(self._reader.read(65536), self.timeout)
+                except asyncio.TimeoutError:
+                    # A fragment left unfinished for a full timeout is stale
+                    if framer.pending_bytes:
+                        framer.reset()
+                    continue
+                if not chunk:
+                    break
+                for line in framer.feed(chunk):
+                    self._dispatch_line(line)
+        except asyncio.CancelledError:
+            error = ConnectionError("Connection closed")
+            raise
+        except OSError as e:
+            error = ConnectionError(f"Connection lost: {e}")
+        finally:
+            self._reader_error = error
+            self._fail_pending(error)
+            self._events.close()
+
+    def _wants_line(self, line: bytes) -> bool:
+        """Decide from the raw bytes whether a line needs a full decode (see JS8CallAPI._wants_line)."""
+        if logger.isEnabledFor(logging.DEBUG):
+            return True
+        types = envelope_types(line)
+        if not types:
+            return True
+        log_handlers = logger.isEnabledFor(logging.INFO)
+        for msg_type in types:
+            if msg_type in self.ALWAYS_DECODE_TYPES or self._events.wants(msg_type):
+                return True
+            if log_handlers and msg_type in self._message_handlers:
+                return True
+        if self._pending:
+            for msg_id in envelope_ids(line):
+                if msg_id in self._pending:
+                    return True
+        return False
+
+    def _dispatch_line(self, line: bytes) -> None:
+        """Decode one received line, run its handler and resolve the waiting request."""
+        if self._raw_ids:
+            for msg_id in envelope_ids(line):
+                if msg_id in self._raw_ids:
+                    future = self._pending.pop(msg_id, None)
+                    if future is not None:
+                        if not future.done():
+                            future.set_result(line)
+                        return
+        if not self._wants_line(line):
+            return
+        try:
+            response = self._codec.loads(line)
+        except self._codec.errors:
+            logger.debug("Discarding malformed line: %r", line[:200])
+            return
+        if not isinstance(response, dict):
+            return
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Received: {line.decode(errors='replace')}")
+
+        msg_type = response.get('type')
+        handler = self._message_handlers.get(msg_type)
+        if handler is not None:
+            try:
+                handler(response)
+            except Exception as e:
+                logger.error(f"Handler for {msg_type} failed: {e}")
+
+        params = response.get('params')
+        response_id = params.get('_ID') if isinstance(params, dict) else None
+        future = self._pending.pop(response_id, None) if response_id is not None else None
+        if future is not None:
+            if not future.done():
+                future.set_result(response)
+        else:
+            self._events.dispatch(response)
+
+    def _on_dropped_line(self, tail: bytes, size: int) -> None:
+        """Fail the request answered by a line the framer dropped for being too long."""
+        for msg_id in envelope_ids(tail):
+            future = self._pending.pop(msg_id, None)
+            if future is not None and not future.done():
+                cap = self._line_caps.get(msg_id, self._framer.limit)
+                future.set_exception(ValueError(f"Response of {size} bytes exceeds the {cap} byte limit"))
+
+    def _update_line_limit(self) -> None:
+        """Apply the smallest pending size cap to the framer."""
+        caps = self._line_caps
+        limit = self._framer.max_line_bytes
+        self._framer.limit = min(limit, min(caps.values())) if caps else limit
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every request still waiting for a response."""
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    def _new_message_id(self) -> int:
+        """Return a message ID not used by any request currently in flight."""
+        while True:
+            msg_id = random.randint(100000000000, 999999999999)
+            if msg_id not in self._pending:
+                return msg_id
+
+    def _encode_request(self, type: str, value: str, params: Optional[Dict[str, Any]],
+                        msg_id: int) -> Tuple[Dict[str, Any], bytes]:
+        """Build the wire bytes for a request (see JS8CallAPI._encode_request)."""
+        if not value and not params:
+            return {'_ID': msg_id}, self._templates.encode(type, msg_id)
+        if params is None:
+            params = {}
+        params['_ID'] = msg_id
+        return params, self._codec.dumps({"type": type, "value": value, "params": params}) + b"\n"
+
+    async def _send_bytes(self, data: bytes) -> None:
+        """Write a complete message and wait for the transport to drain."""
+        if self._writer is None:
+            raise ConnectionError("Not connected to JS8Call")
+        async with self._write_lock:
+            self._writer.write(data)
+            await self._writer.drain()
+
+    async def connect_gps(self) -> None:
+        """
+        Connect to the GPS daemon (gpsd) without blocking the event loop.
+
+        Raises:
+            Exception: If connection to gpsd fails
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, gpsd.connect)
+            self._gps_connected = True
+        except Exception as e:
+            logger.error(f"Failed to connect to GPS: {e}")
+            self._gps_connected = False
+            raise
+
+    async def get_gps_grid_square(self) -> Optional[str]:
+        """
+        Get the current grid square based on GPS coordinates.
+
+        Returns:
+            str: The Maidenhead grid square calculated from current GPS position, or None if GPS error
+        """
+        if not self._gps_connected:
+            await self.connect_gps()
+
+        loop = asyncio.get_running_loop()
+        try:
+            packet = await loop.run_in_executor(None, gpsd.get_current)
+            if packet.mode < 2:
+                raise Exception("No GPS fix available")
+
+            return lat_lon_to_grid_square(packet.lat, packet.lon)
+        except Exception as e:
+            logger.error(f"Error getting GPS grid square: {e}")
+            return None
+
+    async def send_message(self, type: str, value: str = '', params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Send a message to the JS8Call API server and wait for a response.
+
+        Args:
+            type (str): The message type (e.g., 'RIG.GET_FREQ')
+            value (str): The message value (used for some API calls)
+            params (dict): Additional parameters for the message
+
+        Returns:
+            dict: The parsed response from JS8Call
+
+        Raises:
+            TimeoutError: If no response is received within the timeout period
+            ConnectionError: If the connection is lost
+        """
+        return await self._request(type, value, params)
+
+    async def send_message_raw(self, type: str, value: str = '', params: Optional[Dict[str, Any]] = None,
+                               max_bytes: Optional[int] = None) -> bytes:
+        """
+        Send a message and return the response line without decoding it.
+
+        See JS8CallAPI.send_message_raw.
+
+        Raises:
+            ValueError: If JS8Call does not answer this message type, or the
+                response is larger than max_bytes
+            TimeoutError: If no response is received within the timeout period
+            ConnectionError: If the connection is lost
+        """
+        if type in self.NO_RESPONSE_TYPES:
+            raise ValueError(f"JS8Call does not respond to {type}")
+        return await self._request(type, value, params, raw=True, max_bytes=max_bytes)
+
+    async def _request(self, type: str, value: str, params: Optional[Dict[str, Any]], raw: bool = False,
+                       max_bytes: Optional[int] = None) -> Any:
+        """Send one request and wait for its response (see send_message / send_message_raw)."""
+        msg_id = self._new_message_id()
+        params, data = self._encode_request(type, value, params, msg_id)
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        if type in self.NO_RESPONSE_TYPES:
+            if debug:
+                logger.debug(f"Sending: {data.decode().strip()}")
+            await self._send_bytes(data)
+            return {"type": type, "params": params}
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
+        if raw:
+            self._raw_ids.add(msg_id)
+        if max_bytes is not None:
+            self._line_caps[msg_id] = max_bytes
+            self._update_line_limit()
+        try:
+            if self._reader_error is not None:
+                raise ConnectionError(str(self._reader_error))
+            if debug:
+                logger.debug(f"Sending: {data.decode().strip()}")
+            await self._send_bytes(data)
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No response received for message type: {type}")
+        finally:
+            self._pending.pop(msg_id, None)
+            self._raw_ids.discard(msg_id)
+            if self._line_caps.pop(msg_id, None) is not None:
+                self._update_line_limit()
+
+    async def send_batch(self, requests: Sequence[BatchRequest]) -> List[Dict[str, Any]]:
+        """
+        Pipeline several requests in one write and collect their responses.
+
+        See JS8CallAPI.send_batch for the request format.
+
+        Returns:
+            list: The responses, in the same order as the requests
+
+        Raises:
+            TimeoutError: If any response is not received within the timeout period
+            ConnectionError: If the connection is lost
+        """
+        loop = asyncio.get_running_loop()
+        lines = []
+        types = []
+        msg_ids = []
+        results: List[Any] = []
+        for request in requests:
+            if isinstance(request, str):
+                request = (request,)
+            type = request[0]
+            value = request[1] if len(request) > 1 else ''
+            params = dict(request[2]) if len(request) > 2 and request[2] else {}
+            msg_id = self._new_message_id()
+            params, data = self._encode_request(type, value, params, msg_id)
+            lines.append(data)
+            types.append(type)
+            msg_ids.append(msg_id)
+            if type in self.NO_RESPONSE_TYPES:
+                results.append({"type": type, "params": params})
+            else:
+                future = loop.create_future()
+                self._pending[msg_id] = future
+                results.append(future)
+        try:
+            if self._reader_error is not None:
+                raise ConnectionError(str(self._reader_error))
+            payload = b"".join(lines)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Sending batch: {payload.decode().strip()}")
+            await self._send_bytes(payload)
+            futures = [r for r in results if isinstance(r, asyncio.Future)]
+            if futures:
+                _, pending = await asyncio.wait(futures, timeout=self.timeout)
+                if pending:
+                    missing = [t for t, r in zip(types, results) if isinstance(r, asyncio.Future) and r in pending]
+                    for future in pending:
+                        future.cancel()
+                    raise TimeoutError(f"No response received for message type: {', '.join(missing)}")
+            return [r.result() if isinstance(r, asyncio.Future) else r for r in results]
+        finally:
+            for msg_id in msg_ids:
+                self._pending.pop(msg_id, None)
+
+    async def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Get the complete station state in a single pipelined round trip.
+
+        Returns:
+            dict: See JS8CallAPI.get_snapshot
+        """
+        (freq, callsign, grid, speed, status,
+         info, ptt, selected) = await self.send_batch(self.SNAPSHOT_REQUESTS)
+        return {
+            'frequency': JS8CallAPI._parse_frequency(freq),
+            'callsign': callsign.get('value', ''),
+            'grid': grid.get('value', ''),
+            'speed': speed['params'].get('SPEED', self.JS8_NORMAL),
+            'status': status.get('value', ''),
+            'station_info': info.get('value', ''),
+            'ptt': ptt.get('params', {}).get('PTT', False),
+            'selected_call': selected.get('value', '')
+        }
+
+    async def get_frequency(self) -> Dict[str, int]:
+        """
+        Get the current frequency information from JS8Call.
+
+        Returns:
+            dict: 'freq', 'dial' and 'offset' in Hz (see JS8CallAPI.get_frequency)
+        """
+        response = await self.send_message("RIG.GET_FREQ")
+        return JS8CallAPI._parse_frequency(response)
+
+    async def get_callsign(self) -> str:
+        """Get the current station callsign."""
+        response = await self.send_message("STATION.GET_CALLSIGN")
+        return response.get('value', '')
+
+    async def get_grid(self) -> str:
+        """Get the current Maidenhead grid locator."""
+        response = await self.send_message("STATION.GET_GRID")
+        return response.get('value', '')
+
+    async def set_grid(self, grid: str) -> bool:
+        """
+        Set the current grid locator.
+
+        Returns:
+            bool: True if JS8Call echoed the new grid
+        """
+        response = await self.send_message("STATION.SET_GRID", value=grid.upper())
+        return response.get('value', '').upper() == grid.upper()
+
+    async def set_frequency(self, dial_freq: Optional[int] = None, offset: Optional[int] = None) -> bool:
+        """
+        Set the current frequency.
+
+        Returns:
+            bool: True if the command was sent successfully
+        """
+        params = {}
+        if dial_freq is not None:
+            params['DIAL'] = dial_freq
+        if offset is not None:
+            params['OFFSET'] = offset
+        await self.send_message("RIG.SET_FREQ", params=params)
+        return True  # JS8Call doesn't return confirmation for this command
+
+    async def get_station_info(self) -> str:
+        """Get the station information text."""
+        response = await self.send_message("STATION.GET_INFO")
+        return response.get('value', '')
+
+    async def set_station_info(self, info: str) -> bool:
+        """Set the station information text. Returns True if successful."""
+        response = await self.send_message("STATION.SET_INFO", value=info)
+        return response.get('value', '') == info
+
+    async def get_status(self) -> str:
+        """Get the current station status text."""
+        response = await self.send_message("STATION.GET_STATUS")
+        return response.get('value', '')
+
+    async def set_status(self, status: str) -> bool:
+        """Set the current station status. Returns True if successful."""
+        response = await self.send_message("STATION.SET_STATUS", value=status)
+        return response.get('value', '') == status
+
+    async def get_call_activity(self, as_records: bool = False) -> Dict[str, Any]:
+        """
+        Get information about recently heard stations.
+
+        Args:
+            as_records (bool): Return CallActivityEntry records instead of dicts (default: False)
+
+        Returns:
+            dict: Callsigns mapped to their details (see JS8CallAPI.get_call_activity)
+        """
+        response = await self.send_message("RX.GET_CALL_ACTIVITY")
+        activity = response.get('params', {}).copy()
+        if '_ID' in activity:
+            del activity['_ID']
+        if as_records:
+            return call_activity_records(activity)
+        return activity
+
+    async def get_selected_call(self) -> str:
+        """Get the currently selected callsign in the UI."""
+        response = await self.send_message("RX.GET_CALL_SELECTED")
+        return response.get('value', '')
+
+    async def get_band_activity(self, as_records: bool = False) -> Dict[Any, Any]:
+        """
+        Get activity across the band.
+
+        Args:
+            as_records (bool): Return BandActivityEntry records keyed by integer
+                offset instead of dicts (default: False)
+
+        Returns:
+            dict: Frequency offsets mapped to activity details (see JS8CallAPI.get_band_activity)
+        """
+        response = await self.send_message("RX.GET_BAND_ACTIVITY")
+        activity = response.get('params', {}).copy()
+        if '_ID' in activity:
+            del activity['_ID']
+        if as_records:
+            return band_activity_records(activity)
+        return activity
+
+    def activity_tracker(self) -> ActivityTracker:
+        """Create a tracker for one delta consumer (see JS8CallAPI.activity_tracker)."""
+        return ActivityTracker()
+
+    async def get_call_activity_delta(self, as_records: bool = False,
+                                      tracker: Optional[ActivityTracker] = None) -> ActivityDelta:
+        """Get what changed in call activity since the previous call (see JS8CallAPI.get_call_activity_delta)."""
+        raw = await self.send_message_raw("RX.GET_CALL_ACTIVITY")
+        delta = (tracker if tracker is not None else self._call_activity_tracker).update(raw, self._decode_activity)
+        if as_records:
+            return JS8CallAPI._delta_records(delta, call_activity_records)
+        return delta
+
+    async def get_band_activity_delta(self, as_records: bool = False,
+                                      tracker: Optional[ActivityTracker] = None) -> ActivityDelta:
+        """Get what changed in band activity since the previous call (see JS8CallAPI.get_band_activity_delta)."""
+        raw = await self.send_message_raw("RX.GET_BAND_ACTIVITY")
+        delta = (tracker if tracker is not None else self._band_activity_tracker).update(raw, self._decode_activity)
+        if as_records:
+            return JS8CallAPI._delta_records(delta, band_activity_records)
+        return delta
+
+    def _decode_activity(self, raw: bytes) -> Dict[str, Any]:
+        """Decode an activity response into its entry map, without the _ID."""
+        response = self._codec.loads(raw)
+        params = response.get('params') if isinstance(response, dict) else None
+        if not isinstance(params, dict):
+            return {}
+        params.pop('_ID', None)
+        return params
+
+    async def get_rx_text(self) -> str:
+        """Get text from the receive window."""
+        response = await self.send_message("RX.GET_TEXT")
+        return response.get('value', '')
+
+    async def get_tx_text(self) -> str:
+        """Get text from the transmit buffer."""
+        response = await self.send_message("TX.GET_TEXT")
+        return response.get('value', '')
+
+    async def set_tx_text(self, text: str) -> bool:
+        """Set text in the transmit buffer. Returns True if successful."""
+        response = await self.send_message("TX.SET_TEXT", value=text)
+        return response.get('value', '') == text
+
+    async def send_message_text(self, text: str) -> bool:
+        """
+        Send a message immediately.
+
+        Returns:
+            bool: True if the command was sent successfully
+        """
+        await self.send_message("TX.SEND_MESSAGE", value=text)
+        return True  # JS8Call doesn't return confirmation for this command
+
+    async def get_speed(self) -> int:
+        """Get the current JS8Call speed mode (see JS8Call speed constants)."""
+        response = await self.send_message("MODE.GET_SPEED")
+        return response['params'].get('SPEED', self.JS8_NORMAL)
+
+    async def set_speed(self, speed: int) -> bool:
+        """Set the JS8Call speed mode. Returns True if successful."""
+        response = await self.send_message("MODE.SET_SPEED", params={'SPEED': speed})
+        return response['params'].get('SPEED', -1) == speed
+
+    async def get_inbox_messages(self, callsign: Optional[str] = None, as_records: bool = False) -> List[Any]:
+        """
+        Get messages from the inbox.
+
+        Args:
+            callsign (str, optional): Filter messages by callsign
+            as_records (bool): Return InboxMessage records instead of dicts (default: False)
+
+        Returns:
+            list: Message objects (see JS8CallAPI.get_inbox_messages)
+        """
+        params = {}
+        if callsign:
+            params['CALLSIGN'] = callsign
+        response = await self.send_message("INBOX.GET_MESSAGES", params=params)
+        messages = response['params'].get('MESSAGES', [])
+        if as_records:
+            return inbox_records(messages)
+        return messages
+
+    async def iter_inbox_messages(self, callsign: Optional[str] = None, max_bytes: Optional[int] = None,
+                                  as_records: bool = False) -> Iterator[Any]:
+        """
+        Get messages from the inbox, parsed one at a time as the returned iterator advances.
+
+        See JS8CallAPI.iter_inbox_messages.
+        """
+        params = {'CALLSIGN': callsign} if callsign else None
+        raw = await self.send_message_raw("INBOX.GET_MESSAGES", params=params, max_bytes=max_bytes)
+        return iter_inbox_payload(raw, max_bytes, as_records)
+
+    async def store_message(self, callsign: str, text: str) -> Dict[str, Any]:
+        """
+        Store a message in the inbox.
+
+        Returns:
+            dict: The INBOX.MESSAGE response containing the message ID
+        """
+        params = {
+            'CALLSIGN': callsign,
+            'TEXT': text
+        }
+        return await self.send_message("INBOX.STORE_MESSAGE", params=params)
+
+    async def raise_window(self) -> bool:
+        """Raise the JS8Call window to the foreground."""
+        await self.send_message("WINDOW.RAISE")
+        return True  # JS8Call doesn't return confirmation for this command
+
+    async def ping(self) -> bool:
+        """
+        Send a PING message to check if JS8Call is responsive.
+
+        Returns:
+            bool: True if message was sent successfully
+        """
+        try:
+            message = {
+                "type": "PING",
+                "value": "",
+                "params": {
+                    "NAME": "JS8CallAPI",
+                    "VERSION": "1.0",
+                    "UTC": int(time.time() * 1000)
+                }
+            }
+            await self._send_bytes(self._codec.dumps(message) + b"\n")
+            return True
+        except Exception as e:
+            logger.error(f"Ping failed: {e}")
+            return False
+
+    async def get_ptt_status(self) -> bool:
+        """Get the current PTT status. Returns True if PTT is active."""
+        response = await self.send_message("RIG.GET_PTT")
+        return response.get('params', {}).get('PTT', False)
+
+    async def close(self) -> None:
+        """Close the connection to JS8Call and stop the reader task."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader_task = None
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+            self._writer = None
+
+    def is_closed(self) -> bool:
+        """Check if JS8Call has been closed."""
+        return self._closed
+
+    def on(self, types: TypeFilter, callback: EventCallback, callsign: Optional[str] = None) -> Subscription:
+        """
+        Subscribe to unsolicited messages pushed by JS8Call.
+
+        Callbacks run on the event loop inside the reader task and must not block.
+        See JS8CallAPI.on for the arguments.
+
+        Returns:
+            Subscription: Handle to pass to off() (or call .cancel() on)
+        """
+        return self._events.subscribe(types, callback, callsign)
+
+    def off(self, subscription: Subscription) -> None:
+        """Remove a subscription created by on()."""
+        subscription.cancel()
+
+    def events(self, types: TypeFilter = None, callsign: Optional[str] = None,
+               timeout: Optional[float] = None, maxsize: int = 10000) -> AsyncEventStream:
+        """
+        Asynchronously iterate over unsolicited messages as they arrive.
+
+        See JS8CallAPI.events for the arguments.
+
+        Example:
+            async for msg in api.events('RX.DIRECTED', callsign='W1AW'):
+                print(msg['params']['TEXT'])
+        """
+        return self._events.async_stream(types, callsign, timeout, maxsize)
+
+    async def get_directed_message(self, as_records: bool = False) -> Optional[Any]:
+        """Get the last directed message received (a DirectedMessage if as_records), or None if there is none."""
+        response = await self.send_message("RX.GET_DIRECTED")
+        params = response.get('params', {})
+        if not params:
+            return None
+        if as_records:
+            return DirectedMessage.from_params(params)
+        return {
+            'FROM': params.get('FROM', ''),
+            'TO': params.get('TO', ''),
+            'TEXT': params.get('TEXT', ''),
+            'UTC': params.get('UTC', 0)
+        }
+
+    async def get_spot(self, as_records: bool = False) -> Optional[Any]:
+        """Get the last spot received (a Spot if as_records), or None if there is none."""
+        response = await self.send_message("RX.GET_SPOT")
+        params = response.get('params', {})
+        if not params:
+            return None
+        if as_records:
+            return Spot.from_params(params)
+        return {
+            'CALL': params.get('CALL', ''),
+            'FREQ': params.get('FREQ', 0),
+            'SNR': params.get('SNR', 0),
+            'UTC': params.get('UTC', 0)
+        }
+
+    async def get_tx_frame(self) -> Optional[Dict[str, Any]]:
+        """Get the last TX frame sent, or None if there is none."""
+        response = await self.send_message("TX.GET_FRAME")
+        params = response.get('params', {})
+        if not params:
+            return None
+        return {
+            'TEXT': params.get('TEXT', ''),
+            'UTC': params.get('UTC', 0)
+        }
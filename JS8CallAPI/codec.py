@@ -0,0 +1,112 @@
+import json
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+
+class Codec:
+    """
+    A JSON encoder/decoder pair working directly on bytes.
+
+    Attributes:
+        name (str): Backend name ('orjson', 'msgspec' or 'json')
+        dumps (callable): Serialize an object to compact UTF-8 bytes
+        loads (callable): Parse bytes (or str) into Python objects
+        errors (tuple): Exception types raised by loads on malformed input
+    """
+
+    def __init__(self, name: str, dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any],
+                 errors: Tuple[Type[BaseException], ...]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+        self.errors = errors
+
+    def __repr__(self) -> str:
+        return f"Codec({self.name!r})"
+
+
+def _json_codec() -> Codec:
+    encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+    def dumps(obj: Any) -> bytes:
+        return encoder.encode(obj).encode()
+
+    return Codec('json', dumps, json.loads, (ValueError, UnicodeDecodeError))
+
+
+def _orjson_codec() -> Codec:
+    import orjson
+    return Codec('orjson', orjson.dumps, orjson.loads, (orjson.JSONDecodeError,))
+
+
+def _msgspec_codec() -> Codec:
+    import msgspec
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    return Codec('msgspec', encoder.encode, decoder.decode, (msgspec.DecodeError,))
+
+
+_FACTORIES: Dict[str, Callable[[], Codec]] = {
+    'orjson': _orjson_codec,
+    'msgspec': _msgspec_codec,
+    'json': _json_codec,
+}
+
+# Tried in this order when no codec is requested explicitly
+PREFERENCE = ('orjson', 'msgspec', 'json')
+
+_cache: Dict[str, Codec] = {}
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """
+    Return a JSON codec.
+
+    Args:
+        name (str, optional): 'orjson', 'msgspec' or 'json'. When omitted, the
+            fastest installed backend is used, falling back to the stdlib.
+
+    Returns:
+        Codec: The codec
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the requested backend is not installed
+    """
+    if name is None:
+        for candidate in PREFERENCE:
+            try:
+                return get_codec(candidate)
+            except ImportError:
+                continue
+    if name not in _FACTORIES:
+        raise ValueError(f"Unknown JSON codec: {name!r} (choose from {', '.join(PREFERENCE)})")
+    codec = _cache.get(name)
+    if codec is None:
+        codec = _cache[name] = _FACTORIES[name]()
+    return codec
+
+
+class RequestTemplates:
+    """
+    Pre-encoded bytes for requests that carry no value and no params.
+
+    Commands like RIG.GET_FREQ or RX.GET_CALL_ACTIVITY differ only in their
+    _ID, so the surrounding JSON is encoded once per type and the ID is
+    spliced in for each request.
+    """
+
+    def __init__(self, codec: Codec):
+        self._codec = codec
+        self._templates: Dict[str, Tuple[bytes, bytes]] = {}
+
+    def encode(self, msg_type: str, msg_id: int) -> bytes:
+        """Return the newline-terminated request for msg_type with the given _ID."""
+        template = self._templates.get(msg_type)
+        if template is None:
+            # Encode once with a marker ID and split around it
+            marker = 918273645546372819
+            encoded = self._codec.dumps({"type": msg_type, "value": "", "params": {"_ID": marker}})
+            prefix, suffix = encoded.split(str(marker).encode(), 1)
+            template = self._templates[msg_type] = (prefix, suffix + b"\n")
+        prefix, suffix = template
+        return b"".join((prefix, str(msg_id).encode(), suffix))
@@ -1,11 +1,22 @@
 import socket
-import json
 import random
 import logging
 import time
+import threading
 import gpsd
-from typing import Dict, List, Optional, Union, Any, Tuple
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Union, Any, Tuple, Sequence, Callable, Set, Iterator
 from .grid_utils import lat_lon_to_grid_square
+from .framing import LineFramer
+from .events import EventDispatcher, EventStream, Subscription, EventCallback, TypeFilter
+from .metrics import ClientMetrics, MetricsServer
+from .state import StateMirror
+from .codec import Codec, RequestTemplates, get_codec
+from .envelope import envelope_ids, envelope_types
+from .delta import ActivityDelta, ActivityTracker
+from .records import (Spot, DirectedMessage, call_activity_records, band_activity_records,
+                      inbox_records)
+from .streaming import iter_inbox_payload
 
 # Set up logging - but don't display to console by default
 logger = logging.getLogger(__name__)
@@ -13,6 +24,24 @@ logger.setLevel(logging.ERROR)
 # Create null handler to avoid messages being printed to console
 logger.addHandler(logging.NullHandler())
 
+# A batched request: a message type, (type, value) or (type, value, params)
+BatchRequest = Union[str, Tuple[str, str], Tuple[str, str, Optional[Dict[str, Any]]]]
+
+# Called with the new connection state and the error that caused it, if any
+ConnectionStateCallback = Callable[[str, Optional[Exception]], None]
+
+class _PendingRequest(Future):
+    """A request waiting for its response, with what is needed to resend it."""
+    
+    def __init__(self, msg_type: str, data: bytes, raw: bool = False):
+        super().__init__()
+        self.msg_type = msg_type
+        self.data = data
+        # Resolve with the undecoded response line instead of a dict
+        self.raw = raw
+        # Connection generation the request was last written on, -1 if never
+        self.generation = -1
+
 class JS8CallAPI:
     """
     A Python client for the JS8Call TCP API.
@@ -23,7 +52,13 @@ class JS8CallAPI:
     Attributes:
         host (str): The hostname or IP address of the JS8Call server (default: '127.0.0.1')
         port (int): The TCP port number for the JS8Call API (default: 2442)
+        timeout (float): Seconds to wait for a response to each request (default: 5)
         sock (socket.socket): The TCP socket connection to JS8Call
+
+    Once connected, a background reader thread owns the receive side of the
+    socket and routes each response to the caller waiting on its ``_ID``, so
+    a single client can be shared by several threads with requests in flight
+    at the same time.
     """
     
     # JS8Call Speed Constants
@@ -33,20 +68,80 @@ class JS8CallAPI:
     JS8_SLOW = 3
     JS8_ULTRA = 4
     
-    def __init__(self, host='127.0.0.1', port=2442):
+    # Commands JS8Call does not answer
+    NO_RESPONSE_TYPES = frozenset(["RIG.SET_FREQ", "TX.SEND_MESSAGE", "WINDOW.RAISE"])
+    
+    # Connection states reported to on_connection_state callbacks
+    STATE_DISCONNECTED = 'disconnected'
+    STATE_CONNECTED = 'connected'
+    STATE_RECONNECTING = 'reconnecting'
+    STATE_CLOSED = 'closed'
+    
+    # Largest single line accepted from JS8Call (large inboxes arrive on one line)
+    MAX_LINE_BYTES = 16 * 1024 * 1024
+    
+    # Received types that are decoded even with nobody listening
+    ALWAYS_DECODE_TYPES = frozenset(['CLOSE'])
+    
+    # Requests pipelined by get_snapshot, in the order it unpacks them
+    SNAPSHOT_REQUESTS = (
+        "RIG.GET_FREQ", "STATION.GET_CALLSIGN", "STATION.GET_GRID", "MODE.GET_SPEED",
+        "STATION.GET_STATUS", "STATION.GET_INFO", "RIG.GET_PTT", "RX.GET_CALL_SELECTED"
+    )
+    
+    def __init__(self, host='127.0.0.1', port=2442, timeout=5, metrics=False, mirror_state=False,
+                 reconnect=False, reconnect_delay=0.5, reconnect_max_delay=30.0,
+                 codec: Union[str, Codec, None] = None, max_line_bytes: Optional[int] = None):
         """
         Initialize the JS8Call API client.
         
         Args:
             host (str): The hostname or IP address of the JS8Call server (default: '127.0.0.1')
             port (int): The TCP port number for the JS8Call API (default: 2442)
+            timeout (float): Seconds to wait for a response to each request (default: 5)
+            metrics (bool): Collect per-command latency, error and byte counters (default: False)
+            mirror_state (bool): Keep a local copy of frequency, speed, PTT and selected call
+                so their getters answer without a round trip (default: False)
+            reconnect (bool): Reconnect automatically when the connection drops (default: False)
+            reconnect_delay (float): First retry delay in seconds, doubled per failed attempt (default: 0.5)
+            reconnect_max_delay (float): Upper bound for the retry delay in seconds (default: 30)
+            codec (str or Codec, optional): JSON backend - 'orjson', 'msgspec' or 'json'
+                (default: the fastest one installed)
+            max_line_bytes (int, optional): Largest response line buffered; longer lines
+                are dropped (default: MAX_LINE_BYTES, 16 MiB)
         """
         self.host = host
         self.port = port
+        self.timeout = timeout
+        self.reconnect = reconnect
+        self.reconnect_delay = reconnect_delay
+        self.reconnect_max_delay = reconnect_max_delay
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.settimeout(5)
+        self.sock.settimeout(timeout)
         self._gps_connected = False
         self._closed = False
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, _PendingRequest] = {}
+        # IDs of pending requests that want the raw response line
+        self._raw_ids: Set[int] = set()
+        # Response size caps of pending send_message_raw(max_bytes=...) requests, by ID
+        self._line_caps: Dict[int, int] = {}
+        self._pending_lock = threading.Lock()
+        self._reader_thread: Optional[threading.Thread] = None
+        self._reader_error: Optional[Exception] = None
+        self._stop_event = threading.Event()
+        self._connection_state = self.STATE_DISCONNECTED
+        self._generation = 0
+        self._state_callbacks: List[ConnectionStateCallback] = []
+        self._codec = codec if isinstance(codec, Codec) else get_codec(codec)
+        self._templates = RequestTemplates(self._codec)
+        self._events = EventDispatcher()
+        self._framer = LineFramer(max_line_bytes or self.MAX_LINE_BYTES, on_drop=self._on_dropped_line)
+        self._metrics: Optional[ClientMetrics] = ClientMetrics() if metrics else None
+        self._metrics_server: Optional[MetricsServer] = None
+        self._state: Optional[StateMirror] = StateMirror() if mirror_state else None
+        self._call_activity_tracker = ActivityTracker()
+        self._band_activity_tracker = ActivityTracker()
         self._message_handlers = {
             'CLOSE': self._handle_close,
             'RX.DIRECTED': self._handle_directed,
@@ -90,6 +185,341 @@ class JS8CallAPI:
         except Exception as e:
             logger.error(f"Failed to connect: {e}")
             raise
+        self._start_reader()
+        self._set_connection_state(self.STATE_CONNECTED)
+        if self._state is not None:
+            self._state.seed(self.get_snapshot())
+    
+    def _start_reader(self) -> None:
+        """Start the background thread that owns the receive side of the socket."""
+        self._stop_event.clear()
+        self._reader_error = None
+        self._framer.reset()
+        with self._send_lock:
+            self._connection_state = self.STATE_CONNECTED
+        self._reader_thread = threading.Thread(
+            target=self._reader_loop, name="JS8CallAPI-reader", daemon=True
+        )
+        self._reader_thread.start()
+    
+    def _reader_loop(self) -> None:
+        """
+        Read newline-delimited messages until the connection ends for good.
+        
+        Every complete line is handed to _dispatch_line; bytes of an
+        unfinished line stay in the framer until the rest arrives, so nothing
+        received is lost between requests. In reconnect mode a dropped
+        connection is re-established and in-flight requests are replayed.
+        Once the loop gives up, all requests still waiting for a response are
+        failed with the error that stopped it.
+        """
+        error = self._read_until_disconnect()
+        while self.reconnect and not self._stop_event.is_set():
+            self._handle_disconnect(error)
+            if not self._reconnect_with_backoff():
+                break
+            self._replay_pending()
+            error = self._read_until_disconnect()
+        if self._stop_event.is_set():
+            error = ConnectionError("Connection closed")
+        self._reader_error = error
+        with self._send_lock:
+            if not self._stop_event.is_set():
+                self._connection_state = self.STATE_DISCONNECTED
+        if self._state is not None:
+            self._state.invalidate()
+        self._fail_pending(error)
+        self._events.close()
+        if not self._stop_event.is_set():
+            self._notify_connection_state(self.STATE_DISCONNECTED, error)
+    
+    def _read_until_disconnect(self) -> Exception:
+        """Feed received bytes to the dispatcher until the socket fails; return the error."""
+        framer = self._framer
+        sock = self.sock
+        while not self._stop_event.is_set():
+            try:
+                chunk = sock.recv(65536)
+            except socket.timeout:
+                if framer.pending_bytes:
+                    logger.debug(f"Dropping {framer.pending_bytes} stale bytes after idle timeout")
+                    framer.reset()
+                continue
+            except OSError as e:
+                return ConnectionError(f"Connection lost: {e}")
+            if not chunk:
+                return ConnectionError("Connection closed by server")
+            for line in framer.feed(chunk):
+                self._dispatch_line(line)
+        return ConnectionError("Connection closed")
+    
+    def _handle_disconnect(self, error: Exception) -> None:
+        """
+        Prepare for reconnecting after the connection dropped.
+        
+        Requests that read state are kept for replay; anything else may or
+        may not have reached JS8Call, so it is failed rather than repeated.
+        """
+        logger.error(f"{error}; reconnecting to {self.host}:{self.port}")
+        with self._send_lock:
+            self._connection_state = self.STATE_RECONNECTING
+        self._framer.reset()
+        if self._state is not None:
+            self._state.invalidate()
+        with self._pending_lock:
+            unsafe = [msg_id for msg_id, request in self._pending.items()
+                      if not self._is_idempotent(request.msg_type)]
+            failed = [self._pending.pop(msg_id) for msg_id in unsafe]
+        for request in failed:
+            if not request.done():
+                request.set_exception(ConnectionError(f"{error} before {request.msg_type} was answered"))
+        self._notify_connection_state(self.STATE_RECONNECTING, error)
+    
+    def _reconnect_with_backoff(self) -> bool:
+        """
+        Open a new socket, retrying with jittered exponential backoff.
+        
+        Returns:
+            bool: True once connected, False if the client was closed meanwhile
+        """
+        attempt = 0
+        while not self._stop_event.is_set():
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect((self.host, self.port))
+            except OSError as e:
+                sock.close()
+                delay = min(self.reconnect_max_delay, self.reconnect_delay * (2 ** attempt))
+                delay = random.uniform(delay / 2, delay)
+                attempt += 1
+                logger.debug(f"Reconnect attempt {attempt} failed ({e}); retrying in {delay:.2f}s")
+                self._stop_event.wait(delay)
+                continue
+            with self._send_lock:
+                if self._stop_event.is_set():
+                    sock.close()
+                    return False
+                old, self.sock = self.sock, sock
+                self._generation += 1
+            try:
+                old.close()
+            except OSError:
+                pass
+            self._closed = False
+            return True
+        return False
+    
+    def _replay_pending(self) -> None:
+        """Mark the connection usable again and resend requests still waiting for an answer."""
+        with self._send_lock:
+            self._connection_state = self.STATE_CONNECTED
+            with self._pending_lock:
+                pending = list(self._pending.values())
+            for request in pending:
+                if request.done() or request.generation == self._generation:
+                    continue
+                try:
+                    self.sock.sendall(request.data)
+                    request.generation = self._generation
+                except OSError as e:
+                    logger.debug(f"Replay of {request.msg_type} failed: {e}")
+                    break
+        logger.info(f"Reconnected to {self.host}:{self.port}; replayed {len(pending)} request(s)")
+        self._notify_connection_state(self.STATE_CONNECTED, None)
+    
+    @staticmethod
+    def _is_idempotent(msg_type: str) -> bool:
+        """True for requests that only read state and can safely be sent twice."""
+        return '.GET' in msg_type
+    
+    def _set_connection_state(self, state: str, error: Optional[Exception] = None) -> None:
+        with self._send_lock:
+            self._connection_state = state
+        self._notify_connection_state(state, error)
+    
+    def _notify_connection_state(self, state: str, error: Optional[Exception]) -> None:
+        for callback in list(self._state_callbacks):
+            try:
+                callback(state, error)
+            except Exception as e:
+                logger.error(f"Connection state callback failed: {e}")
+    
+    def _wants_line(self, line: bytes) -> bool:
+        """
+        Decide from the raw bytes whether a line needs a full decode.
+        
+        Lines that answer no pending request and interest no handler,
+        subscriber or state mirror (typically RX.ACTIVITY / RX.SPOT traffic
+        nobody listens to) are counted by their type and dropped undecoded.
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            return True
+        types = envelope_types(line)
+        if not types:
+            return True
+        log_handlers = logger.isEnabledFor(logging.INFO)
+        state = self._state
+        for msg_type in types:
+            if msg_type in self.ALWAYS_DECODE_TYPES or self._events.wants(msg_type):
+                return True
+            if log_handlers and msg_type in self._message_handlers:
+                return True
+            if state is not None and msg_type in state.TYPES:
+                return True
+        if self._pending:
+            for msg_id in envelope_ids(line):
+                if msg_id in self._pending:
+                    return True
+        metrics = self._metrics
+        if metrics is not None:
+            if len(set(types)) > 1:
+                # Cannot tell which candidate is the top-level type
+                return True
+            metrics.record_received(types[0], len(line) + 1, event=True)
+        return False
+    
+    def _dispatch_line(self, line: bytes) -> None:
+        """Decode one received line, run its handler and resolve the waiting request."""
+        if self._raw_ids and self._resolve_raw(line):
+            return
+        if not self._wants_line(line):
+            return
+        try:
+            response = self._codec.loads(line)
+        except self._codec.errors:
+            logger.debug("Discarding malformed line: %r", line[:200])
+            return
+        if not isinstance(response, dict):
+            return
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Received: {line.decode(errors='replace')}")
+        
+        # Handle special messages
+        msg_type = response.get('type')
+        handler = self._message_handlers.get(msg_type)
+        if handler is not None:
+            try:
+                handler(response)
+            except Exception as e:
+                logger.error(f"Handler for {msg_type} failed: {e}")
+        
+        # Refresh the mirror before waking the caller so it reads the new value
+        state = self._state
+        if state is not None:
+            state.update(response)
+        
+        # Hand the response to the request waiting on its _ID, if any
+        params = response.get('params')
+        response_id = params.get('_ID') if isinstance(params, dict) else None
+        future = None
+        if response_id is not None:
+            with self._pending_lock:
+                future = self._pending.pop(response_id, None)
+        metrics = self._metrics
+        if metrics is not None:
+            metrics.record_received(str(msg_type), len(line) + 1, event=future is None)
+        if future is not None:
+            if not future.done():
+                future.set_result(response)
+        else:
+            self._events.dispatch(response)
+    
+    def _resolve_raw(self, line: bytes) -> bool:
+        """Hand an undecoded line to a send_message_raw caller if it answers one."""
+        for msg_id in envelope_ids(line):
+            if msg_id not in self._raw_ids:
+                continue
+            with self._pending_lock:
+                future = self._pending.pop(msg_id, None)
+            if future is None:
+                continue
+            metrics = self._metrics
+            if metrics is not None:
+                types = envelope_types(line)
+                msg_type = types[0] if len(set(types)) == 1 else future.msg_type
+                metrics.record_received(msg_type, len(line) + 1)
+            if not future.done():
+                future.set_result(line)
+            return True
+        return False
+    
+    def _on_dropped_line(self, tail: bytes, size: int) -> None:
+        """Fail the request answered by a line the framer dropped for being too long."""
+        for msg_id in envelope_ids(tail):
+            with self._pending_lock:
+                future = self._pending.pop(msg_id, None)
+                cap = self._line_caps.get(msg_id, self._framer.limit)
+            if future is not None and not future.done():
+                future.set_exception(ValueError(
+                    f"Response to {future.msg_type} of {size} bytes exceeds the {cap} byte limit"))
+    
+    def _update_line_limit(self) -> None:
+        """Apply the smallest pending size cap to the framer. Called with _pending_lock held."""
+        caps = self._line_caps
+        limit = self._framer.max_line_bytes
+        self._framer.limit = min(limit, min(caps.values())) if caps else limit
+    
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every request still waiting for a response."""
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+    
+    def _new_message_id(self) -> int:
+        """Return a message ID not used by any request currently in flight."""
+        while True:
+            msg_id = random.randint(100000000000, 999999999999)
+            if msg_id not in self._pending:
+                return msg_id
+    
+    def _encode_request(self, type: str, value: str, params: Optional[Dict[str, Any]],
+                        msg_id: int) -> Tuple[Dict[str, Any], bytes]:
+        """
+        Build the wire bytes for a request.
+        
+        Parameterless commands reuse a pre-encoded template with only the
+        _ID spliced in; anything else goes through the codec.
+        
+        Returns:
+            tuple: (params including _ID, newline-terminated request bytes)
+        """
+        if not value and not params:
+            return {'_ID': msg_id}, self._templates.encode(type, msg_id)
+        if params is None:
+            params = {}
+        params['_ID'] = msg_id
+        return params, self._codec.dumps({"type": type, "value": value, "params": params}) + b"\n"
+    
+    def _send_bytes(self, data: bytes) -> None:
+        """Write a complete message to the socket without interleaving with other senders."""
+        with self._send_lock:
+            self.sock.sendall(data)
+    
+    def _transmit(self, requests: List[_PendingRequest], data: bytes) -> None:
+        """
+        Write registered requests, tolerating a connection that is being restored.
+        
+        While reconnecting, read-only requests are left in the pending table
+        to be replayed; anything else fails with ConnectionError.
+        """
+        error: Optional[Exception] = None
+        with self._send_lock:
+            if self._connection_state == self.STATE_CONNECTED:
+                try:
+                    self.sock.sendall(data)
+                    for request in requests:
+                        request.generation = self._generation
+                    return
+                except OSError as e:
+                    error = e
+        if (self.reconnect and not self._stop_event.is_set()
+                and all(self._is_idempotent(r.msg_type) for r in requests)):
+            return
+        raise ConnectionError(f"Not connected to JS8Call: {error}" if error else "Not connected to JS8Call")
     
     def connect_gps(self) -> None:
         """
@@ -133,6 +563,9 @@ class JS8CallAPI:
         """
         Send a message to the JS8Call API server and wait for a response.
         
+        Safe to call from several threads at once; each caller waits only for
+        the response carrying its own ``_ID``.
+        
         Args:
             type (str): The message type (e.g., 'RIG.GET_FREQ')
             value (str): The message value (used for some API calls)
@@ -146,65 +579,207 @@ class JS8CallAPI:
             ConnectionError: If the connection is lost
             Exception: For other errors
         """
-        if params is None:
-            params = {}
-            
-        # Generate message ID
-        msg_id = random.randint(100000000000, 999999999999)
-        params['_ID'] = msg_id
+        return self._request(type, value, params)
+    
+    def send_message_raw(self, type: str, value: str = '', params: Optional[Dict[str, Any]] = None,
+                         max_bytes: Optional[int] = None) -> bytes:
+        """
+        Send a message and return the response line without decoding it.
         
-        # Create message
-        message = {
-            "type": type,
-            "value": value,
-            "params": params
-        }
+        The reader thread matches the response by ``_ID`` straight from the
+        bytes, so large responses can be hashed, stored or parsed
+        incrementally by the caller instead of always being decoded.
         
-        # Send message
-        message_str = json.dumps(message) + "\n"
-        logger.debug(f"Sending: {message_str.strip()}")
-        self.sock.sendall(message_str.encode())
+        With ``max_bytes`` the reader stops buffering as soon as a line grows
+        past the cap, so an oversized response never sits in memory in full.
+        While the request is outstanding the cap applies to every line
+        received, and other requests answered by a longer line fail the same
+        way.
+        
+        Args:
+            type (str): The message type (e.g., 'RX.GET_BAND_ACTIVITY')
+            value (str): The message value (used for some API calls)
+            params (dict): Additional parameters for the message
+            max_bytes (int, optional): Largest response accepted, in bytes
+        
+        Returns:
+            bytes: The JSON response line, without the trailing newline
+        
+        Raises:
+            ValueError: If JS8Call does not answer this message type, or the
+                response is larger than max_bytes
+            TimeoutError: If no response is received within the timeout period
+            ConnectionError: If the connection is lost
+        """
+        if type in self.NO_RESPONSE_TYPES:
+            raise ValueError(f"JS8Call does not respond to {type}")
+        return self._request(type, value, params, raw=True, max_bytes=max_bytes)
+    
+    def _request(self, type: str, value: str, params: Optional[Dict[str, Any]], raw: bool = False,
+                 max_bytes: Optional[int] = None) -> Any:
+        """Send one request and wait for its response (see send_message / send_message_raw)."""
+        # Generate message ID
+        msg_id = self._new_message_id()
+        params, data = self._encode_request(type, value, params, msg_id)
+        debug = logger.isEnabledFor(logging.DEBUG)
         
         # For commands that don't expect responses or have special handling, return immediately
-        if type in ["RIG.SET_FREQ", "TX.SEND_MESSAGE", "WINDOW.RAISE"]:
+        metrics = self._metrics
+        if type in self.NO_RESPONSE_TYPES:
+            if debug:
+                logger.debug(f"Sending: {data.decode().strip()}")
+            self._send_bytes(data)
+            if metrics is not None:
+                metrics.record_request(type, len(data))
             return {"type": type, "params": params}
         
-        # Wait for response
+        # Register before sending so a fast reply cannot beat us to the table
+        future = _PendingRequest(type, data, raw)
+        with self._pending_lock:
+            self._pending[msg_id] = future
+            if raw:
+                self._raw_ids.add(msg_id)
+            if max_bytes is not None:
+                self._line_caps[msg_id] = max_bytes
+                self._update_line_limit()
         try:
-            while True:
-                # Read until newline
-                data = b""
-                while b"\n" not in data:
-                    chunk = self.sock.recv(4096)
-                    if not chunk:
-                        raise ConnectionError("Connection closed by server")
-                    data += chunk
-                
-                # Process messages
-                messages = data.split(b"\n")
-                for msg in messages:
-                    if not msg:
-                        continue
-                    try:
-                        response = json.loads(msg.decode())
-                        logger.debug(f"Received: {msg.decode()}")
-                        
-                        # Handle special messages
-                        msg_type = response.get('type')
-                        if msg_type in self._message_handlers:
-                            self._message_handlers[msg_type](response)
-                        
-                        # Check if this is the response we're waiting for
-                        response_id = response.get('params', {}).get('_ID')
-                        if response_id == msg_id:
-                            return response
-                    except json.JSONDecodeError:
-                        continue
-                
-        except socket.timeout:
+            if self._reader_error is not None:
+                raise ConnectionError(str(self._reader_error))
+            if debug:
+                logger.debug(f"Sending: {data.decode().strip()}")
+            start = time.perf_counter()
+            self._transmit([future], data)
+            if metrics is None:
+                return future.result(timeout=self.timeout)
+            metrics.record_request(type, len(data))
+            response = future.result(timeout=self.timeout)
+            metrics.record_response(type, time.perf_counter() - start)
+            return response
+        except (FutureTimeoutError, socket.timeout):
+            if metrics is not None:
+                metrics.record_timeout(type)
             raise TimeoutError(f"No response received for message type: {type}")
-        except Exception as e:
+        except (ConnectionError, OSError):
+            if metrics is not None:
+                metrics.record_error(type)
             raise
+        finally:
+            with self._pending_lock:
+                self._pending.pop(msg_id, None)
+                self._raw_ids.discard(msg_id)
+                if self._line_caps.pop(msg_id, None) is not None:
+                    self._update_line_limit()
+    
+    def send_batch(self, requests: Sequence[BatchRequest]) -> List[Dict[str, Any]]:
+        """
+        Pipeline several requests over the connection and collect their responses.
+        
+        All requests are written with a single sendall and the responses are
+        gathered by ``_ID``, so the whole batch costs roughly one round trip
+        instead of one per request.
+        
+        Args:
+            requests (list): Each item is a message type such as 'RIG.GET_FREQ',
+                or a (type, value) or (type, value, params) tuple
+        
+        Returns:
+            list: The responses, in the same order as the requests
+        
+        Raises:
+            TimeoutError: If any response is not received within the timeout period
+            ConnectionError: If the connection is lost
+        """
+        lines = []
+        types = []
+        msg_ids = []
+        results: List[Optional[Dict[str, Any]]] = []
+        futures: List[Optional[_PendingRequest]] = []
+        with self._pending_lock:
+            for request in requests:
+                if isinstance(request, str):
+                    request = (request,)
+                type = request[0]
+                value = request[1] if len(request) > 1 else ''
+                params = dict(request[2]) if len(request) > 2 and request[2] else {}
+                msg_id = self._new_message_id()
+                params, data = self._encode_request(type, value, params, msg_id)
+                lines.append(data)
+                types.append(type)
+                msg_ids.append(msg_id)
+                if type in self.NO_RESPONSE_TYPES:
+                    results.append({"type": type, "params": params})
+                    futures.append(None)
+                else:
+                    future = _PendingRequest(type, lines[-1])
+                    self._pending[msg_id] = future
+                    results.append(None)
+                    futures.append(future)
+        try:
+            if self._reader_error is not None:
+                raise ConnectionError(str(self._reader_error))
+            payload = b"".join(lines)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Sending batch: {payload.decode().strip()}")
+            start = time.perf_counter()
+            self._transmit([f for f in futures if f is not None], payload)
+            metrics = self._metrics
+            if metrics is not None:
+                for type, line in zip(types, lines):
+                    metrics.record_request(type, len(line))
+            deadline = start + self.timeout
+            for index, future in enumerate(futures):
+                if future is None:
+                    continue
+                try:
+                    results[index] = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+                except FutureTimeoutError:
+                    if metrics is not None:
+                        metrics.record_timeout(types[index])
+                    raise TimeoutError(f"No response received for message type: {types[index]}")
+                if metrics is not None:
+                    metrics.record_response(types[index], time.perf_counter() - start)
+            return results
+        finally:
+            with self._pending_lock:
+                for msg_id in msg_ids:
+                    self._pending.pop(msg_id, None)
+    
+    @staticmethod
+    def _parse_frequency(response: Dict[str, Any]) -> Dict[str, int]:
+        """Extract freq/dial/offset from a RIG.FREQ response."""
+        return {
+            'freq': response['params'].get('FREQ', 0),
+            'dial': response['params'].get('DIAL', 0),
+            'offset': response['params'].get('OFFSET', 0)
+        }
+    
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Get the complete station state in a single pipelined round trip.
+        
+        Returns:
+            dict: A dictionary containing:
+                - frequency (dict): As returned by get_frequency()
+                - callsign (str): The station callsign
+                - grid (str): The Maidenhead grid locator
+                - speed (int): The current speed mode
+                - status (str): The station status text
+                - station_info (str): The station information text
+                - ptt (bool): True if PTT is active
+                - selected_call (str): The callsign selected in the UI
+        """
+        (freq, callsign, grid, speed, status,
+         info, ptt, selected) = self.send_batch(self.SNAPSHOT_REQUESTS)
+        return {
+            'frequency': self._parse_frequency(freq),
+            'callsign': callsign.get('value', ''),
+            'grid': grid.get('value', ''),
+            'speed': speed['params'].get('SPEED', self.JS8_NORMAL),
+            'status': status.get('value', ''),
+            'station_info': info.get('value', ''),
+            'ptt': ptt.get('params', {}).get('PTT', False),
+            'selected_call': selected.get('value', '')
+        }
     
     def get_frequency(self) -> Dict[str, int]:
         """
@@ -216,12 +791,12 @@ class JS8CallAPI:
                 - dial (int): The dial frequency in Hz
                 - offset (int): The frequency offset in Hz
         """
+        if self._state is not None:
+            cached = self._state.get('frequency')
+            if cached is not None:
+                return dict(cached)
         response = self.send_message("RIG.GET_FREQ")
-        return {
-            'freq': response['params'].get('FREQ', 0),
-            'dial': response['params'].get('DIAL', 0),
-            'offset': response['params'].get('OFFSET', 0)
-        }
+        return self._parse_frequency(response)
     
     def get_callsign(self) -> str:
         """
@@ -253,6 +828,8 @@ class JS8CallAPI:
         Returns:
             bool: True if successful
         """
+        if self._state is not None:
+            self._state.invalidate('grid')
         # Send grid as 'value', not in 'params'
         response = self.send_message("STATION.SET_GRID", value=grid.upper())
         # Verify by checking the response value
@@ -274,6 +851,8 @@ class JS8CallAPI:
             params['DIAL'] = dial_freq
         if offset is not None:
             params['OFFSET'] = offset
+        if self._state is not None:
+            self._state.invalidate('frequency')
         response = self.send_message("RIG.SET_FREQ", params=params)
         return True  # JS8Call doesn't return confirmation for this command
     
@@ -323,10 +902,13 @@ class JS8CallAPI:
         response = self.send_message("STATION.SET_STATUS", value=status)
         return response.get('value', '') == status
     
-    def get_call_activity(self) -> Dict[str, Dict[str, Any]]:
+    def get_call_activity(self, as_records: bool = False) -> Dict[str, Any]:
         """
         Get information about recently heard stations.
         
+        Args:
+            as_records (bool): Return CallActivityEntry records instead of dicts (default: False)
+        
         Returns:
             dict: Dictionary mapping callsigns to their details:
                 {
@@ -343,6 +925,8 @@ class JS8CallAPI:
         activity = response.get('params', {}).copy()
         if '_ID' in activity:
             del activity['_ID']
+        if as_records:
+            return call_activity_records(activity)
         return activity
     
     def get_selected_call(self) -> str:
@@ -352,13 +936,21 @@ class JS8CallAPI:
         Returns:
             str: The selected callsign or empty string if none selected
         """
+        if self._state is not None:
+            cached = self._state.get('selected_call')
+            if cached is not None:
+                return cached
         response = self.send_message("RX.GET_CALL_SELECTED")
         return response.get('value', '')
     
-    def get_band_activity(self) -> Dict[str, Dict[str, Any]]:
+    def get_band_activity(self, as_records: bool = False) -> Dict[Any, Any]:
         """
         Get activity across the band.
         
+        Args:
+            as_records (bool): Return BandActivityEntry records keyed by integer
+                offset instead of dicts (default: False)
+        
         Returns:
             dict: Dictionary mapping frequency offsets to activity details:
                 {
@@ -378,8 +970,89 @@ class JS8CallAPI:
         activity = response.get('params', {}).copy()
         if '_ID' in activity:
             del activity['_ID']
+        if as_records:
+            return band_activity_records(activity)
         return activity
     
+    def activity_tracker(self) -> ActivityTracker:
+        """
+        Create a tracker for get_call_activity_delta() / get_band_activity_delta().
+        
+        Each consumer that polls for deltas needs its own tracker: a tracker
+        remembers what it last reported, so two consumers sharing one (the
+        client's default) would each see only part of the changes. Call and
+        band activity need separate trackers too.
+        
+        Returns:
+            ActivityTracker: A tracker whose first delta reports every entry as added
+        """
+        return ActivityTracker()
+    
+    def get_call_activity_delta(self, as_records: bool = False,
+                                tracker: Optional[ActivityTracker] = None) -> ActivityDelta:
+        """
+        Get what changed in call activity since the previous call.
+        
+        The first call reports every station as added. A response identical
+        to the previous one is recognised by its hash and not decoded.
+        
+        Without ``tracker`` the changes are measured against the client's
+        default tracker, which is shared by every caller that omits it. If
+        more than one consumer polls (say a database writer and a UI), give
+        each its own tracker from activity_tracker().
+        
+        Args:
+            as_records (bool): Return CallActivityEntry records instead of dicts (default: False)
+            tracker (ActivityTracker, optional): Tracker to compare against and update
+                (default: the client's shared call activity tracker)
+        
+        Returns:
+            ActivityDelta: added, updated and expired callsigns mapped to their
+                details (same shape as get_call_activity)
+        """
+        raw = self.send_message_raw("RX.GET_CALL_ACTIVITY")
+        delta = (tracker if tracker is not None else self._call_activity_tracker).update(raw, self._decode_activity)
+        if as_records:
+            return self._delta_records(delta, call_activity_records)
+        return delta
+    
+    def get_band_activity_delta(self, as_records: bool = False,
+                                tracker: Optional[ActivityTracker] = None) -> ActivityDelta:
+        """
+        Get what changed in band activity since the previous call.
+        
+        As with get_call_activity_delta(), the default tracker is shared;
+        pass one from activity_tracker() per consumer.
+        
+        Args:
+            as_records (bool): Return BandActivityEntry records keyed by integer
+                offset instead of dicts (default: False)
+            tracker (ActivityTracker, optional): Tracker to compare against and update
+                (default: the client's shared band activity tracker)
+        
+        Returns:
+            ActivityDelta: added, updated and expired offsets mapped to their
+                details (same shape as get_band_activity)
+        """
+        raw = self.send_message_raw("RX.GET_BAND_ACTIVITY")
+        delta = (tracker if tracker is not None else self._band_activity_tracker).update(raw, self._decode_activity)
+        if as_records:
+            return self._delta_records(delta, band_activity_records)
+        return delta
+    
+    def _decode_activity(self, raw: bytes) -> Dict[str, Any]:
+        """Decode an activity response into its entry map, without the _ID."""
+        response = self._codec.loads(raw)
+        params = response.get('params') if isinstance(response, dict) else None
+        if not isinstance(params, dict):
+            return {}
+        params.pop('_ID', None)
+        return params
+    
+    @staticmethod
+    def _delta_records(delta: ActivityDelta, convert: Callable[[Dict[Any, Any]], Dict[Any, Any]]) -> ActivityDelta:
+        return ActivityDelta(convert(delta.added), convert(delta.updated), convert(delta.expired), delta.changed)
+    
     def get_rx_text(self) -> str:
         """
         Get text from the receive window.
@@ -433,6 +1106,10 @@ class JS8CallAPI:
         Returns:
             int: The current speed mode (see JS8Call speed constants)
         """
+        if self._state is not None:
+            cached = self._state.get('speed')
+            if cached is not None:
+                return cached
         response = self.send_message("MODE.GET_SPEED")
         return response['params'].get('SPEED', self.JS8_NORMAL)
     
@@ -446,15 +1123,18 @@ class JS8CallAPI:
         Returns:
             bool: True if successful
         """
+        if self._state is not None:
+            self._state.invalidate('speed')
         response = self.send_message("MODE.SET_SPEED", params={'SPEED': speed})
         return response['params'].get('SPEED', -1) == speed
     
-    def get_inbox_messages(self, callsign: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_inbox_messages(self, callsign: Optional[str] = None, as_records: bool = False) -> List[Any]:
         """
         Get messages from the inbox.
         
         Args:
             callsign (str, optional): Filter messages by callsign
+            as_records (bool): Return InboxMessage records instead of dicts (default: False)
             
         Returns:
             list: List of message objects with the following structure:
@@ -476,7 +1156,40 @@ class JS8CallAPI:
         if callsign:
             params['CALLSIGN'] = callsign
         response = self.send_message("INBOX.GET_MESSAGES", params=params)
-        return response['params'].get('MESSAGES', [])
+        messages = response['params'].get('MESSAGES', [])
+        if as_records:
+            return inbox_records(messages)
+        return messages
+    
+    def iter_inbox_messages(self, callsign: Optional[str] = None, max_bytes: Optional[int] = None,
+                            as_records: bool = False) -> Iterator[Any]:
+        """
+        Get messages from the inbox one at a time.
+        
+        The request is made immediately, but the response is not decoded as
+        a whole: messages are parsed from the MESSAGES array as the iterator
+        advances, so at most one decoded message is held next to the raw
+        response instead of the full list.
+        
+        ``max_bytes`` is enforced while the response is received (see
+        send_message_raw), so a mailbox over the cap is dropped without
+        ever being buffered in full.
+        
+        Args:
+            callsign (str, optional): Filter messages by callsign
+            max_bytes (int, optional): Refuse responses larger than this many bytes
+            as_records (bool): Yield InboxMessage records instead of dicts (default: False)
+        
+        Returns:
+            iterator: Messages in the same format as get_inbox_messages()
+        
+        Raises:
+            ValueError: If the response is larger than max_bytes
+            TimeoutError: If no response is received within the timeout period
+        """
+        params = {'CALLSIGN': callsign} if callsign else None
+        raw = self.send_message_raw("INBOX.GET_MESSAGES", params=params, max_bytes=max_bytes)
+        return iter_inbox_payload(raw, max_bytes, as_records)
     
     def store_message(self, callsign: str, text: str) -> Dict[str, Any]:
         """
@@ -539,8 +1252,7 @@ class JS8CallAPI:
                 "params": params
             }
             
-            message_str = json.dumps(message) + "\n"
-            self.sock.sendall(message_str.encode())
+            self._send_bytes(self._codec.dumps(message) + b"\n")
             
             # A successful send indicates JS8Call is responsive
             return True
@@ -555,15 +1267,32 @@ class JS8CallAPI:
         Returns:
             bool: True if PTT is active, False otherwise
         """
+        if self._state is not None:
+            cached = self._state.get('ptt')
+            if cached is not None:
+                return cached
         response = self.send_message("RIG.GET_PTT")
         return response.get('params', {}).get('PTT', False)
 
     def close(self) -> None:
-        """Close the socket connection to JS8Call."""
+        """Close the socket connection to JS8Call and stop the reader thread."""
+        if self._metrics_server is not None:
+            self._metrics_server.stop()
+            self._metrics_server = None
+        self._stop_event.set()
+        self._set_connection_state(self.STATE_CLOSED)
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
         try:
             self.sock.close()
         except:
             pass
+        reader = self._reader_thread
+        if reader is not None and reader is not threading.current_thread():
+            reader.join(timeout=self.timeout)
+        self._reader_thread = None
 
     def is_closed(self) -> bool:
         """
@@ -574,10 +1303,156 @@ class JS8CallAPI:
         """
         return self._closed
 
-    def get_directed_message(self) -> Optional[Dict[str, Any]]:
+    def on_connection_state(self, callback: ConnectionStateCallback) -> None:
+        """
+        Register a callback for connection state changes.
+        
+        The callback receives the new state ('connected', 'reconnecting',
+        'disconnected' or 'closed') and the error that caused it, if any.
+        It runs on the reader thread and should return quickly.
+        
+        Args:
+            callback (callable): Called as callback(state, error)
+        """
+        self._state_callbacks.append(callback)
+    
+    @property
+    def connection_state(self) -> str:
+        """The current connection state ('connected', 'reconnecting', 'disconnected' or 'closed')."""
+        return self._connection_state
+    
+    def enable_state_mirror(self) -> None:
+        """
+        Start mirroring station state locally.
+        
+        Seeds the mirror with one pipelined fetch (see get_snapshot) when
+        already connected; afterwards get_frequency, get_speed, get_ptt_status
+        and get_selected_call answer from memory while their value is known.
+        The mirror follows every response and notification JS8Call sends, and
+        set_frequency / set_speed / set_grid invalidate what they change.
+        """
+        if self._state is None:
+            self._state = StateMirror()
+        if self._reader_thread is not None and self._reader_error is None:
+            self._state.seed(self.get_snapshot())
+    
+    def mirrored_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Get every value currently held by the state mirror.
+        
+        Returns:
+            Optional[Dict[str, Any]]: None if mirroring is disabled, otherwise the
+                known values keyed as in get_snapshot() plus 'tx_frame'
+        """
+        if self._state is None:
+            return None
+        return self._state.snapshot()
+    
+    def metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Get a snapshot of the client's instrumentation counters.
+        
+        Returns:
+            Optional[Dict[str, Any]]: None if metrics are disabled, otherwise:
+                {
+                    'uptime': float,      # Seconds since metrics were enabled
+                    'commands': {         # Per request type, e.g. 'RIG.GET_FREQ'
+                        'TYPE': {
+                            'requests': int, 'responses': int, 'timeouts': int,
+                            'errors': int, 'bytes_sent': int,
+                            'latency_sum': float, 'latency_max': float, 'latency_mean': float,
+                            'latency_histogram': {'0.001': int, ..., '+Inf': int}
+                        }
+                    },
+                    'received': {'TYPE': {'messages': int, 'bytes': int}},
+                    'events': {'TYPE': int}   # Unsolicited messages by type
+                }
+        """
+        if self._metrics is None:
+            return None
+        return self._metrics.snapshot()
+    
+    def enable_metrics(self) -> None:
+        """Start collecting metrics if the client was created with metrics=False."""
+        if self._metrics is None:
+            self._metrics = ClientMetrics()
+    
+    def start_metrics_server(self, port: int = 9842, host: str = '127.0.0.1') -> MetricsServer:
+        """
+        Expose metrics in Prometheus text format over HTTP.
+        
+        Enables metrics if needed. The server stops when the client is closed.
+        
+        Args:
+            port (int): TCP port to listen on, 0 for any free port (default: 9842)
+            host (str): Interface to bind (default: '127.0.0.1')
+            
+        Returns:
+            MetricsServer: The running server; its port attribute holds the bound port
+        """
+        self.enable_metrics()
+        if self._metrics_server is None:
+            self._metrics_server = MetricsServer(self._metrics, port, host)
+        return self._metrics_server
+    
+    def on(self, types: TypeFilter, callback: EventCallback, callsign: Optional[str] = None) -> Subscription:
+        """
+        Subscribe to unsolicited messages pushed by JS8Call.
+        
+        Callbacks run on the reader thread as soon as a message arrives, so
+        they should return quickly; hand longer work to another thread.
+        
+        Args:
+            types (str or iterable): Message type(s) such as 'RX.DIRECTED' or
+                ['RX.SPOT', 'RX.ACTIVITY'], or '*' for every type
+            callback (callable): Called with the full message dict
+            callsign (str, optional): Only deliver messages whose FROM, TO or CALL matches
+            
+        Returns:
+            Subscription: Handle to pass to off() (or call .cancel() on)
+        
+        Example:
+            api.on('RX.DIRECTED', lambda msg: print(msg['params']['TEXT']))
+        """
+        return self._events.subscribe(types, callback, callsign)
+    
+    def off(self, subscription: Subscription) -> None:
+        """
+        Remove a subscription created by on().
+        
+        Args:
+            subscription (Subscription): The handle returned by on()
+        """
+        subscription.cancel()
+    
+    def events(self, types: TypeFilter = None, callsign: Optional[str] = None,
+               timeout: Optional[float] = None, maxsize: int = 10000) -> EventStream:
+        """
+        Iterate over unsolicited messages as they arrive.
+        
+        Args:
+            types (str or iterable, optional): Message type(s) to receive (default: all)
+            callsign (str, optional): Only yield messages whose FROM, TO or CALL matches
+            timeout (float, optional): Stop iterating after this many seconds without an event
+            maxsize (int): Events buffered before new ones are dropped (default: 10000)
+            
+        Returns:
+            EventStream: Iterator of message dicts; ends when the connection closes
+        
+        Example:
+            with api.events(['RX.DIRECTED', 'RX.SPOT']) as stream:
+                for msg in stream:
+                    print(msg['type'], msg['params'])
+        """
+        return self._events.stream(types, callsign, timeout, maxsize)
+
+    def get_directed_message(self, as_records: bool = False) -> Optional[Any]:
         """
         Get the last directed message received.
         
+        Args:
+            as_records (bool): Return a DirectedMessage record instead of a dict (default: False)
+        
         Returns:
             Optional[Dict[str, Any]]: The directed message details or None if no message:
                 {
@@ -591,6 +1466,8 @@ class JS8CallAPI:
         params = response.get('params', {})
         if not params:
             return None
+        if as_records:
+            return DirectedMessage.from_params(params)
         return {
             'FROM': params.get('FROM', ''),
             'TO': params.get('TO', ''),
@@ -598,10 +1475,13 @@ class JS8CallAPI:
             'UTC': params.get('UTC', 0)
         }
 
-    def get_spot(self) -> Optional[Dict[str, Any]]:
+    def get_spot(self, as_records: bool = False) -> Optional[Any]:
         """
         Get the last spot received.
         
+        Args:
+            as_records (bool): Return a Spot record instead of a dict (default: False)
+        
         Returns:
             Optional[Dict[str, Any]]: The spot details or None if no spot:
                 {
@@ -615,6 +1495,8 @@ class JS8CallAPI:
         params = response.get('params', {})
         if not params:
             return None
+        if as_records:
+            return Spot.from_params(params)
         return {
             'CALL': params.get('CALL', ''),
             'FREQ': params.get('FREQ', 0),
@@ -0,0 +1,93 @@
+import hashlib
+from typing import Any, Callable, Dict, Optional
+
+from .envelope import strip_ids
+
+
+class ActivityDelta:
+    """
+    Changes between two activity polls.
+
+    Attributes:
+        added (dict): Entries not present in the previous poll
+        updated (dict): Entries present before whose details changed
+        expired (dict): Entries from the previous poll that JS8Call no longer
+            reports, with their last known details
+        changed (bool): False when the response was byte-for-byte identical to
+            the previous one and nothing was compared
+    """
+
+    __slots__ = ('added', 'updated', 'expired', 'changed')
+
+    def __init__(self, added: Dict[Any, Any], updated: Dict[Any, Any], expired: Dict[Any, Any],
+                 changed: bool = True):
+        self.added = added
+        self.updated = updated
+        self.expired = expired
+        self.changed = changed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.expired)
+
+    def __repr__(self) -> str:
+        return (f"ActivityDelta(added={len(self.added)}, updated={len(self.updated)}, "
+                f"expired={len(self.expired)}, changed={self.changed})")
+
+
+class ActivityTracker:
+    """
+    Remember the last activity map and report what changed in the next one.
+
+    The raw response is hashed (with its _ID blanked) before anything is
+    decoded, so an unchanged band costs one hash per poll. Otherwise the
+    work is one dict comparison per entry, and the caller receives only the
+    entries that changed.
+    """
+
+    def __init__(self):
+        self._digest: Optional[bytes] = None
+        self._entries: Dict[Any, Any] = {}
+
+    @staticmethod
+    def digest(raw: bytes) -> bytes:
+        """Hash a raw response line, ignoring its _ID."""
+        return hashlib.blake2b(strip_ids(raw), digest_size=16).digest()
+
+    def update(self, raw: bytes, decode: Callable[[bytes], Dict[Any, Any]]) -> ActivityDelta:
+        """
+        Compare a new response against the previous one.
+
+        Args:
+            raw (bytes): The raw response line
+            decode (callable): Turns the raw line into the entry map, called only if the bytes changed
+
+        Returns:
+            ActivityDelta: Entries added, updated and expired since the previous call
+        """
+        digest = self.digest(raw)
+        if digest == self._digest:
+            return ActivityDelta({}, {}, {}, changed=False)
+        entries = decode(raw)
+        previous = self._entries
+        added = {}
+        updated = {}
+        for key, entry in entries.items():
+            old = previous.get(key)
+            if old is None:
+                added[key] = entry
+            elif old != entry:
+                updated[key] = entry
+        expired = {key: entry for key, entry in previous.items() if key not in entries}
+        self._digest = digest
+        self._entries = entries
+        return ActivityDelta(added, updated, expired)
+
+    @property
+    def entries(self) -> Dict[Any, Any]:
+        """The entry map from the most recent poll."""
+        return self._entries
+
+    def reset(self) -> None:
+        """Forget the previous poll so the next call reports every entry as added."""
+        self._digest = None
+        self._entries = {}
@@ -0,0 +1,33 @@
+import re
+from typing import List
+
+# JS8Call serializes with Qt, which sorts keys, so the top-level "type" comes
+# after "params" and nested objects (e.g. INBOX.MESSAGES entries) may carry
+# their own "type" and "_ID". The scanners therefore return every candidate
+# and leave it to the caller to treat the line as wanted if any matches.
+_TYPE_RE = re.compile(rb'"type"\s*:\s*"([^"\\]*)"')
+_ID_RE = re.compile(rb'"_ID"\s*:\s*(-?\d+)')
+
+
+def envelope_types(line: bytes) -> List[str]:
+    """
+    Pull candidate message types out of a raw line without decoding it.
+
+    Args:
+        line (bytes): One JSON message as received, without the newline
+
+    Returns:
+        list: Every "type" string value found anywhere in the line. An empty
+            list means the line could not be classified and must be decoded.
+    """
+    return [match.decode('utf-8', 'replace') for match in _TYPE_RE.findall(line)]
+
+
+def envelope_ids(line: bytes) -> List[int]:
+    """Pull every integer "_ID" value out of a raw line without decoding it."""
+    return [int(match) for match in _ID_RE.findall(line)]
+
+
+def strip_ids(line: bytes) -> bytes:
+    """Return the line with every "_ID" value blanked, so responses to different requests compare equal."""
+    return _ID_RE.sub(b'"_ID":0', line)
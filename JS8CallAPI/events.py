@@ -0,0 +1,276 @@
+import asyncio
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Union
+
+# Set up logging - but don't display to console by default
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Create null handler to avoid messages being printed to console
+logger.addHandler(logging.NullHandler())
+
+# Params that may carry a callsign in unsolicited JS8Call messages
+CALLSIGN_KEYS = ('FROM', 'TO', 'CALL')
+
+EventCallback = Callable[[Dict[str, Any]], None]
+TypeFilter = Union[str, Iterable[str], None]
+
+
+def _normalize_types(types: TypeFilter) -> Optional[FrozenSet[str]]:
+    """Turn a type filter into a frozenset, or None to match every type."""
+    if types is None or types == '*':
+        return None
+    if isinstance(types, str):
+        return frozenset([types])
+    return frozenset(types)
+
+
+class Subscription:
+    """
+    A registered event consumer.
+
+    Returned by EventDispatcher.subscribe (and JS8CallAPI.on); call cancel()
+    to stop receiving events.
+
+    Attributes:
+        types (frozenset): Message types delivered, or None for all types
+        callsign (str): Only deliver messages whose FROM, TO or CALL matches, or None
+        callback (callable): Called with each matching message dict
+    """
+
+    def __init__(self, dispatcher: 'EventDispatcher', types: Optional[FrozenSet[str]],
+                 callback: EventCallback, callsign: Optional[str] = None):
+        self.types = types
+        self.callsign = callsign.upper() if callsign else None
+        self.callback = callback
+        self._dispatcher = dispatcher
+
+    def matches(self, msg_type: str, message: Dict[str, Any]) -> bool:
+        """Check whether a message passes this subscription's filters."""
+        if self.types is not None and msg_type not in self.types:
+            return False
+        if self.callsign is None:
+            return True
+        params = message.get('params')
+        if not isinstance(params, dict):
+            return False
+        for key in CALLSIGN_KEYS:
+            value = params.get(key)
+            if isinstance(value, str) and value.upper() == self.callsign:
+                return True
+        return False
+
+    def cancel(self) -> None:
+        """Stop delivering events to this subscription."""
+        self._dispatcher.unsubscribe(self)
+
+
+class EventStream:
+    """
+    Blocking iterator over messages delivered to a subscription.
+
+    Events are queued by the client's reader thread and consumed by the
+    iterating thread. Iteration ends when the client closes, when the
+    stream is closed, or when no event arrives within ``timeout`` seconds.
+    If the queue is full, new events are dropped rather than stalling the
+    reader thread.
+    """
+
+    _END = object()
+
+    def __init__(self, dispatcher: 'EventDispatcher', types: Optional[FrozenSet[str]],
+                 callsign: Optional[str] = None, timeout: Optional[float] = None,
+                 maxsize: int = 10000):
+        self.timeout = timeout
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._subscription = dispatcher.subscribe(types, self._put, callsign)
+        self._closed = False
+
+    def _put(self, message: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def _end(self) -> None:
+        try:
+            self._queue.put_nowait(self._END)
+        except queue.Full:
+            # Make room so the consumer is guaranteed to see the end marker
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._queue.put_nowait(self._END)
+
+    def __iter__(self) -> 'EventStream':
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        if self._closed:
+            raise StopIteration
+        try:
+            item = self._queue.get(timeout=self.timeout)
+        except queue.Empty:
+            self.close()
+            raise StopIteration
+        if item is self._END:
+            self.close()
+            raise StopIteration
+        return item
+
+    def close(self) -> None:
+        """Unsubscribe and end iteration."""
+        if not self._closed:
+            self._closed = True
+            self._subscription.cancel()
+
+    def __enter__(self) -> 'EventStream':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class AsyncEventStream:
+    """
+    Async iterator over messages delivered to a subscription.
+
+    Used by AsyncJS8CallAPI.events(); events are queued from the client's
+    reader task on the same event loop.
+    """
+
+    _END = object()
+
+    def __init__(self, dispatcher: 'EventDispatcher', types: Optional[FrozenSet[str]],
+                 callsign: Optional[str] = None, timeout: Optional[float] = None,
+                 maxsize: int = 10000):
+        self.timeout = timeout
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._subscription = dispatcher.subscribe(types, self._put, callsign)
+        self._closed = False
+
+    def _put(self, message: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _end(self) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(self._END)
+
+    def __aiter__(self) -> 'AsyncEventStream':
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if self._closed:
+            raise StopAsyncIteration
+        try:
+            item = await asyncio.wait_for(self._queue.get(), self.timeout)
+        except asyncio.TimeoutError:
+            self.close()
+            raise StopAsyncIteration
+        if item is self._END:
+            self.close()
+            raise StopAsyncIteration
+        return item
+
+    def close(self) -> None:
+        """Unsubscribe and end iteration."""
+        if not self._closed:
+            self._closed = True
+            self._subscription.cancel()
+
+
+class EventDispatcher:
+    """
+    Route unsolicited JS8Call messages to subscribers.
+
+    Subscribers filter by message type and optionally by callsign. The
+    subscriber list is replaced rather than mutated, so dispatching from the
+    reader never holds a lock while callbacks run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: List[Subscription] = []
+        self._streams: List[Union[EventStream, AsyncEventStream]] = []
+
+    def subscribe(self, types: TypeFilter, callback: EventCallback,
+                  callsign: Optional[str] = None) -> Subscription:
+        """
+        Register a callback for matching messages.
+
+        Args:
+            types (str or iterable): Message type(s) to receive, or '*'/None for all
+            callback (callable): Called with each matching message dict
+            callsign (str, optional): Only deliver messages whose FROM, TO or CALL matches
+
+        Returns:
+            Subscription: Handle whose cancel() removes the callback
+        """
+        subscription = Subscription(self, _normalize_types(types), callback, callsign)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription; unknown subscriptions are ignored."""
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+            self._streams = [s for s in self._streams if s._subscription is not subscription]
+
+    def stream(self, types: TypeFilter = None, callsign: Optional[str] = None,
+               timeout: Optional[float] = None, maxsize: int = 10000) -> EventStream:
+        """Create a blocking iterator over matching messages."""
+        stream = EventStream(self, _normalize_types(types), callsign, timeout, maxsize)
+        with self._lock:
+            self._streams = self._streams + [stream]
+        return stream
+
+    def async_stream(self, types: TypeFilter = None, callsign: Optional[str] = None,
+                     timeout: Optional[float] = None, maxsize: int = 10000) -> AsyncEventStream:
+        """Create an async iterator over matching messages."""
+        stream = AsyncEventStream(self, _normalize_types(types), callsign, timeout, maxsize)
+        with self._lock:
+            self._streams = self._streams + [stream]
+        return stream
+
+    def wants(self, msg_type: str) -> bool:
+        """True if any subscription takes messages of this type, ignoring callsign filters."""
+        for subscription in self._subscriptions:
+            if subscription.types is None or msg_type in subscription.types:
+                return True
+        return False
+
+    def dispatch(self, message: Dict[str, Any]) -> None:
+        """Deliver a message to every matching subscription."""
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            return
+        msg_type = message.get('type')
+        for subscription in subscriptions:
+            if not subscription.matches(msg_type, message):
+                continue
+            try:
+                subscription.callback(message)
+            except Exception as e:
+                logger.error(f"Event callback for {msg_type} failed: {e}")
+
+    def close(self) -> None:
+        """End every open stream; callback subscriptions are kept."""
+        with self._lock:
+            streams = self._streams
+            self._streams = []
+        for stream in streams:
+            stream._end()
+
+    @property
+    def has_subscribers(self) -> bool:
+        """True if any subscription is registered."""
+        return bool(self._subscriptions)
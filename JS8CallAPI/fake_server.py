@@ -0,0 +1,525 @@
+import heapq
+import json
+import logging
+import random
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Set up logging - but don't display to console by default
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Create null handler to avoid messages being printed to console
+logger.addHandler(logging.NullHandler())
+
+_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_PREFIXES = ("K", "W", "N", "AA", "KB", "KD", "VE", "G", "DL", "F", "JA", "VK", "EA", "I", "PY")
+_WORDS = ("CQ", "HB", "SNR?", "QTH?", "GRID?", "ACK", "73", "TU", "GM", "GE", "INFO?", "HEARING?")
+
+
+def _random_callsign(rng: random.Random) -> str:
+    """Make a plausible amateur callsign."""
+    suffix = "".join(rng.choice(_LETTERS) for _ in range(rng.randint(1, 3)))
+    return f"{rng.choice(_PREFIXES)}{rng.randint(0, 9)}{suffix}"
+
+
+def _random_grid(rng: random.Random) -> str:
+    """Make a random 4-character Maidenhead locator."""
+    return f"{rng.choice(_LETTERS[:18])}{rng.choice(_LETTERS[:18])}{rng.randint(0, 9)}{rng.randint(0, 9)}"
+
+
+class _Client:
+    """One accepted connection with its own scheduled, optionally fragmented writer."""
+
+    def __init__(self, server: 'FakeJS8CallServer', sock: socket.socket):
+        self.server = server
+        self.sock = sock
+        self.closed = False
+        self._outbox: List[Tuple[float, int, bytes]] = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._reader = threading.Thread(target=self._read_loop, name="FakeJS8Call-client", daemon=True)
+        self._writer = threading.Thread(target=self._write_loop, name="FakeJS8Call-writer", daemon=True)
+
+    def start(self) -> None:
+        self._reader.start()
+        self._writer.start()
+
+    def send(self, data: bytes, delay: float = 0.0) -> None:
+        """Queue bytes to be written after delay seconds."""
+        with self._cond:
+            self._seq += 1
+            heapq.heappush(self._outbox, (time.monotonic() + delay, self._seq, data))
+            self._cond.notify()
+
+    def close(self) -> None:
+        self.closed = True
+        with self._cond:
+            self._cond.notify()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    def _read_loop(self) -> None:
+        buffer = bytearray()
+        try:
+            while not self.closed:
+                chunk = self.sock.recv(65536)
+                if not chunk:
+                    break
+                buffer += chunk
+                start = 0
+                newline = buffer.find(b"\n")
+                while newline >= 0:
+                    line = bytes(buffer[start:newline])
+                    start = newline + 1
+                    if line.strip():
+                        self.server._handle_request(self, line)
+                    newline = buffer.find(b"\n", start)
+                del buffer[:start]
+        except OSError:
+            pass
+        finally:
+            self.server._drop_client(self)
+
+    def _write_loop(self) -> None:
+        server = self.server
+        while True:
+            with self._cond:
+                while not self.closed:
+                    if self._outbox:
+                        wait = self._outbox[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self.closed:
+                    return
+                # Coalesce everything that is due into one write
+                parts = []
+                now = time.monotonic()
+                while self._outbox and self._outbox[0][0] <= now:
+                    parts.append(heapq.heappop(self._outbox)[2])
+            data = b"".join(parts)
+            try:
+                if server.partial_writes:
+                    self._write_fragmented(data)
+                else:
+                    self.sock.sendall(data)
+                server.stats['bytes_sent'] += len(data)
+            except OSError:
+                self.close()
+                return
+
+    def _write_fragmented(self, data: bytes) -> None:
+        """Write data in random-sized pieces so messages straddle reads."""
+        server = self.server
+        view = memoryview(data)
+        offset = 0
+        while offset < len(data):
+            size = server._rng.randint(1, server.max_fragment)
+            self.sock.sendall(view[offset:offset + size])
+            offset += size
+            if server.fragment_delay:
+                time.sleep(server.fragment_delay)
+
+
+class FakeJS8CallServer:
+    """
+    A local TCP server that behaves like JS8Call's API.
+
+    Speaks the same newline-delimited JSON protocol as JS8Call, answers the
+    requests JS8CallAPI sends with realistic payloads, and can push
+    unsolicited RX.SPOT / RX.DIRECTED / RX.ACTIVITY traffic at configurable
+    rates. Latency, jitter and partial writes can be injected to exercise
+    clients without a radio:
+
+        with FakeJS8CallServer(spot_rate=50, latency=0.02, jitter=0.01) as server:
+            api = JS8CallAPI(port=server.port)
+            api.connect()
+            print(api.get_frequency())
+
+    Attributes:
+        host (str): Interface to listen on (default: '127.0.0.1')
+        port (int): Port actually bound; pass 0 to pick a free one (default: 0)
+        latency (float): Seconds added before every response (default: 0)
+        jitter (float): Extra random delay, uniform in [0, jitter] seconds (default: 0)
+        partial_writes (bool): Split outgoing data into random fragments (default: False)
+        max_fragment (int): Largest fragment when partial_writes is on (default: 64)
+        fragment_delay (float): Pause between fragments in seconds (default: 0)
+        spot_rate (float): Average unsolicited RX.SPOT messages per second (default: 0)
+        directed_rate (float): Average unsolicited RX.DIRECTED messages per second (default: 0)
+        activity_rate (float): Average unsolicited RX.ACTIVITY messages per second (default: 0)
+        stats (dict): Counters for requests, events and bytes sent
+    """
+
+    # Message types JS8Call does not answer
+    NO_RESPONSE_TYPES = frozenset(["RIG.SET_FREQ", "TX.SEND_MESSAGE", "WINDOW.RAISE", "PING"])
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, *,
+                 latency: float = 0.0, jitter: float = 0.0,
+                 partial_writes: bool = False, max_fragment: int = 64, fragment_delay: float = 0.0,
+                 spot_rate: float = 0.0, directed_rate: float = 0.0, activity_rate: float = 0.0,
+                 stations: int = 50, inbox_size: int = 10, seed: Optional[int] = None):
+        """
+        Initialize the server; call start() (or use it as a context manager) to listen.
+
+        Args:
+            host (str): Interface to listen on (default: '127.0.0.1')
+            port (int): Port to bind, 0 for any free port (default: 0)
+            latency (float): Seconds added before every response (default: 0)
+            jitter (float): Extra random delay per response, up to this many seconds (default: 0)
+            partial_writes (bool): Split outgoing data into random fragments (default: False)
+            max_fragment (int): Largest fragment size in bytes (default: 64)
+            fragment_delay (float): Pause between fragments in seconds (default: 0)
+            spot_rate (float): Unsolicited RX.SPOT messages per second (default: 0)
+            directed_rate (float): Unsolicited RX.DIRECTED messages per second (default: 0)
+            activity_rate (float): Unsolicited RX.ACTIVITY messages per second (default: 0)
+            stations (int): Number of heard stations in call/band activity (default: 50)
+            inbox_size (int): Number of messages initially in the inbox (default: 10)
+            seed (int, optional): Seed for reproducible traffic
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.partial_writes = partial_writes
+        self.max_fragment = max_fragment
+        self.fragment_delay = fragment_delay
+        self.spot_rate = spot_rate
+        self.directed_rate = directed_rate
+        self.activity_rate = activity_rate
+        self.stats = {'requests': 0, 'events': 0, 'bytes_sent': 0, 'connections': 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._clients: List[_Client] = []
+        self._listener: Optional[socket.socket] = None
+        self._running = False
+        self._threads: List[threading.Thread] = []
+        self._request_hooks: Dict[str, Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = {}
+
+        # Station state
+        self.callsign = "N0CALL"
+        self.grid = "FN20"
+        self.info = "FakeJS8Call stand-in"
+        self.status = "IDLE"
+        self.dial = 14078000
+        self.offset = 1500
+        self.speed = 0
+        self.ptt = False
+        self.selected_call = ""
+        self.rx_text = ""
+        self.tx_text = ""
+        self.last_directed: Dict[str, Any] = {}
+        self.last_spot: Dict[str, Any] = {}
+        self.last_tx_frame: Dict[str, Any] = {}
+
+        now = int(time.time() * 1000)
+        self.call_activity: Dict[str, Dict[str, Any]] = {}
+        self.band_activity: Dict[str, Dict[str, Any]] = {}
+        for _ in range(stations):
+            self._hear(_random_callsign(self._rng), now - self._rng.randint(0, 1800000))
+        self.inbox: List[Dict[str, Any]] = []
+        self._next_message_id = 1
+        for _ in range(inbox_size):
+            self._store(_random_callsign(self._rng), self.callsign,
+                        " ".join(self._rng.choice(_WORDS) for _ in range(self._rng.randint(2, 12))),
+                        now - self._rng.randint(0, 86400000))
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> 'FakeJS8CallServer':
+        """Bind, listen and start the accept and traffic threads."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((self.host, self.port))
+        listener.listen(16)
+        self.port = listener.getsockname()[1]
+        self._listener = listener
+        self._running = True
+        for target, name in ((self._accept_loop, "FakeJS8Call-accept"),
+                             (self._traffic_loop, "FakeJS8Call-traffic")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        """Close the listener and every client connection."""
+        self._running = False
+        if self._listener is not None:
+            try:
+                self._listener.close()
+            except OSError:
+                pass
+            self._listener = None
+        self.disconnect_clients()
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads = []
+
+    def __enter__(self) -> 'FakeJS8CallServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def disconnect_clients(self, send_close: bool = False) -> None:
+        """
+        Drop every connected client, e.g. to simulate JS8Call restarting.
+
+        Args:
+            send_close (bool): Send a CLOSE message first, as JS8Call does on exit
+        """
+        with self._lock:
+            clients = self._clients
+            self._clients = []
+        for client in clients:
+            if send_close:
+                try:
+                    client.sock.sendall(self._encode("CLOSE", "", {}))
+                except OSError:
+                    pass
+            client.close()
+
+    @property
+    def client_count(self) -> int:
+        """Number of connected clients."""
+        return len(self._clients)
+
+    def _accept_loop(self) -> None:
+        while self._running:
+            try:
+                sock, _ = self._listener.accept()
+            except OSError:
+                return
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = _Client(self, sock)
+            with self._lock:
+                self._clients.append(client)
+            self.stats['connections'] += 1
+            client.start()
+
+    def _drop_client(self, client: _Client) -> None:
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+        client.close()
+
+    # -- traffic -----------------------------------------------------------
+
+    def push_event(self, type: str, params: Optional[Dict[str, Any]] = None, value: str = '') -> None:
+        """
+        Send an unsolicited message to every connected client.
+
+        Args:
+            type (str): Message type, e.g. 'RX.SPOT'
+            params (dict, optional): Message params
+            value (str): Message value
+        """
+        data = self._encode(type, value, params or {})
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            client.send(data)
+        self.stats['events'] += 1
+
+    def on_request(self, type: str, hook: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]) -> None:
+        """
+        Override the reply for one request type.
+
+        The hook receives the request dict and returns the response dict to
+        send (the request's _ID is copied in), or None to send nothing.
+        """
+        self._request_hooks[type] = hook
+
+    def _traffic_loop(self) -> None:
+        rng = self._rng
+        next_at = {}
+        while self._running:
+            rates = {'RX.SPOT': self.spot_rate, 'RX.DIRECTED': self.directed_rate,
+                     'RX.ACTIVITY': self.activity_rate}
+            now = time.monotonic()
+            for kind, rate in rates.items():
+                if rate <= 0:
+                    next_at.pop(kind, None)
+                    continue
+                if kind not in next_at:
+                    next_at[kind] = now + rng.expovariate(rate)
+                while next_at[kind] <= now:
+                    self._emit(kind)
+                    next_at[kind] += rng.expovariate(rate)
+            wake = min(next_at.values(), default=now + 0.05)
+            time.sleep(min(max(wake - time.monotonic(), 0.0005), 0.05))
+
+    def _emit(self, kind: str) -> None:
+        rng = self._rng
+        utc = int(time.time() * 1000)
+        call = _random_callsign(rng) if rng.random() < 0.3 or not self.call_activity \
+            else rng.choice(list(self.call_activity))
+        grid = self.call_activity.get(call, {}).get('GRID') or _random_grid(rng)
+        snr = rng.randint(-24, 10)
+        offset = rng.randint(300, 2700)
+        self._hear(call, utc, grid=grid, snr=snr, offset=offset)
+        if kind == 'RX.SPOT':
+            params = {'CALL': call, 'GRID': grid, 'SNR': snr, 'FREQ': self.dial + offset,
+                      'DIAL': self.dial, 'OFFSET': offset, 'UTC': utc, '_ID': -1}
+            self.last_spot = params
+            self.push_event('RX.SPOT', params)
+        elif kind == 'RX.DIRECTED':
+            to = self.callsign if rng.random() < 0.2 else rng.choice(("@ALLCALL", "@HB", _random_callsign(rng)))
+            text = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 6)))
+            full = f"{call}: {to} {text}"
+            params = {'FROM': call, 'TO': to, 'CMD': " " + text.split()[0], 'TEXT': full, 'GRID': grid,
+                      'SNR': snr, 'FREQ': self.dial + offset, 'DIAL': self.dial, 'OFFSET': offset,
+                      'SPEED': self.speed, 'TDRIFT': round(rng.uniform(-0.5, 0.5), 2),
+                      'UTC': utc, '_ID': -1}
+            self.last_directed = params
+            self.push_event('RX.DIRECTED', params, value=full)
+        else:
+            text = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 4)))
+            params = {'FREQ': self.dial + offset, 'DIAL': self.dial, 'OFFSET': offset, 'SNR': snr,
+                      'SPEED': self.speed, 'TDRIFT': round(rng.uniform(-0.5, 0.5), 2),
+                      'UTC': utc, '_ID': -1}
+            self.push_event('RX.ACTIVITY', params, value=text)
+
+    def _hear(self, call: str, utc: int, grid: Optional[str] = None,
+              snr: Optional[int] = None, offset: Optional[int] = None) -> None:
+        """Record a station in call and band activity."""
+        rng = self._rng
+        snr = rng.randint(-24, 10) if snr is None else snr
+        offset = rng.randint(300, 2700) if offset is None else offset
+        grid = grid or _random_grid(rng)
+        with self._lock:
+            self.call_activity[call] = {'SNR': snr, 'GRID': grid, 'UTC': utc}
+            self.band_activity[str(offset)] = {
+                'FREQ': self.dial + offset, 'DIAL': self.dial, 'OFFSET': offset,
+                'TEXT': f"{call}: " + " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 5))),
+                'SNR': snr, 'UTC': utc
+            }
+
+    def _store(self, origin: str, to: str, text: str, utc: int) -> int:
+        """Add a message to the inbox and return its ID."""
+        with self._lock:
+            message_id = self._next_message_id
+            self._next_message_id += 1
+            self.inbox.append({
+                'type': 'MESSAGE',
+                'value': '',
+                'params': {'_ID': message_id, 'FROM': origin, 'TO': to, 'TEXT': text,
+                           'UTC': utc, 'PATH': origin, 'CMD': ' MSG', 'DIAL': self.dial,
+                           'OFFSET': self.offset, 'SNR': self._rng.randint(-24, 10)}
+            })
+        return message_id
+
+    # -- requests ----------------------------------------------------------
+
+    @staticmethod
+    def _encode(type: str, value: Any, params: Dict[str, Any]) -> bytes:
+        return (json.dumps({"type": type, "value": value, "params": params}) + "\n").encode()
+
+    def _handle_request(self, client: _Client, line: bytes) -> None:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            logger.debug(f"Ignoring malformed request: {line[:200]!r}")
+            return
+        self.stats['requests'] += 1
+        msg_type = request.get('type', '')
+        params = request.get('params') or {}
+        msg_id = params.get('_ID')
+
+        hook = self._request_hooks.get(msg_type)
+        if hook is not None:
+            response = hook(request)
+        else:
+            response = self._respond(msg_type, request.get('value', ''), params)
+        if response is None:
+            return
+        response.setdefault('value', '')
+        response.setdefault('params', {})
+        if msg_id is not None:
+            response['params']['_ID'] = msg_id
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        client.send(self._encode(response['type'], response['value'], response['params']), delay)
+
+    def _respond(self, msg_type: str, value: Any, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply a request to the station state and build the reply."""
+        if msg_type == 'RIG.SET_FREQ':
+            self.dial = params.get('DIAL', self.dial)
+            self.offset = params.get('OFFSET', self.offset)
+            self.push_event('RIG.FREQ', {'FREQ': self.dial + self.offset, 'DIAL': self.dial,
+                                         'OFFSET': self.offset, '_ID': -1})
+            return None
+        if msg_type == 'TX.SEND_MESSAGE':
+            self.last_tx_frame = {'TEXT': value, 'UTC': int(time.time() * 1000), '_ID': -1}
+            self.push_event('TX.FRAME', dict(self.last_tx_frame))
+            return None
+        if msg_type in self.NO_RESPONSE_TYPES:
+            return None
+
+        if msg_type == 'RIG.GET_FREQ':
+            return {'type': 'RIG.FREQ', 'params': {'FREQ': self.dial + self.offset,
+                                                   'DIAL': self.dial, 'OFFSET': self.offset}}
+        if msg_type == 'RIG.GET_PTT':
+            return {'type': 'RIG.PTT', 'value': 'on' if self.ptt else 'off', 'params': {'PTT': self.ptt}}
+        if msg_type == 'STATION.GET_CALLSIGN':
+            return {'type': 'STATION.CALLSIGN', 'value': self.callsign}
+        if msg_type in ('STATION.GET_GRID', 'STATION.SET_GRID'):
+            if msg_type == 'STATION.SET_GRID':
+                self.grid = value
+            return {'type': 'STATION.GRID', 'value': self.grid}
+        if msg_type in ('STATION.GET_INFO', 'STATION.SET_INFO'):
+            if msg_type == 'STATION.SET_INFO':
+                self.info = value
+            return {'type': 'STATION.INFO', 'value': self.info}
+        if msg_type in ('STATION.GET_STATUS', 'STATION.SET_STATUS'):
+            if msg_type == 'STATION.SET_STATUS':
+                self.status = value
+            return {'type': 'STATION.STATUS', 'value': self.status}
+        if msg_type == 'RX.GET_CALL_ACTIVITY':
+            with self._lock:
+                activity = {call: dict(entry) for call, entry in self.call_activity.items()}
+            return {'type': 'RX.CALL_ACTIVITY', 'params': activity}
+        if msg_type == 'RX.GET_BAND_ACTIVITY':
+            with self._lock:
+                activity = {offset: dict(entry) for offset, entry in self.band_activity.items()}
+            return {'type': 'RX.BAND_ACTIVITY', 'params': activity}
+        if msg_type == 'RX.GET_CALL_SELECTED':
+            return {'type': 'RX.CALL_SELECTED', 'value': self.selected_call}
+        if msg_type == 'RX.GET_TEXT':
+            return {'type': 'RX.TEXT', 'value': self.rx_text}
+        if msg_type in ('TX.GET_TEXT', 'TX.SET_TEXT'):
+            if msg_type == 'TX.SET_TEXT':
+                self.tx_text = value
+            return {'type': 'TX.TEXT', 'value': self.tx_text}
+        if msg_type in ('MODE.GET_SPEED', 'MODE.SET_SPEED'):
+            if msg_type == 'MODE.SET_SPEED':
+                self.speed = params.get('SPEED', self.speed)
+            return {'type': 'MODE.SPEED', 'params': {'SPEED': self.speed}}
+        if msg_type == 'INBOX.GET_MESSAGES':
+            callsign = params.get('CALLSIGN')
+            with self._lock:
+                messages = [m for m in self.inbox
+                            if not callsign or callsign in (m['params']['FROM'], m['params']['TO'])]
+            return {'type': 'INBOX.MESSAGES', 'params': {'MESSAGES': messages}}
+        if msg_type == 'INBOX.STORE_MESSAGE':
+            message_id = self._store(self.callsign, params.get('CALLSIGN', ''), params.get('TEXT', ''),
+                                     int(time.time() * 1000))
+            return {'type': 'INBOX.MESSAGE', 'params': {'ID': message_id}}
+        if msg_type == 'RX.GET_DIRECTED':
+            return {'type': 'RX.DIRECTED', 'params': dict(self.last_directed)}
+        if msg_type == 'RX.GET_SPOT':
+            return {'type': 'RX.SPOT', 'params': dict(self.last_spot)}
+        if msg_type == 'TX.GET_FRAME':
+            return {'type': 'TX.FRAME', 'params': dict(self.last_tx_frame)}
+
+        logger.debug(f"Unhandled request type: {msg_type}")
+        return {'type': 'API.ERROR', 'value': f"Unknown message type: {msg_type}"}
@@ -0,0 +1,135 @@
+import logging
+from typing import Callable, List, Optional
+
+# Set up logging - but don't display to console by default
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Create null handler to avoid messages being printed to console
+logger.addHandler(logging.NullHandler())
+
+# Bytes kept from the end of a dropped line; JS8Call writes "_ID" last, in the final few dozen
+DROPPED_TAIL_BYTES = 256
+
+# Called with (tail of the dropped line, its size in bytes) once the line has ended
+DropCallback = Callable[[bytes, int], None]
+
+
+class LineFramer:
+    """
+    Split a byte stream into newline-delimited messages.
+
+    Received chunks are appended to one persistent bytearray, so bytes after
+    the last newline are kept for the next call instead of being thrown away
+    with the rest of the read. Each chunk is scanned only once, and consumed
+    bytes are trimmed from the front in a single step per feed.
+
+    If a line grows past the limit without a newline, the buffered bytes
+    are dropped and everything up to the next newline is skipped, so the
+    stream resynchronizes on the following message instead of stalling.
+    Memory use therefore never exceeds the limit, however long the line.
+    Once a dropped line ends, on_drop is told its size and handed its last
+    DROPPED_TAIL_BYTES bytes, so the request it answered can be failed.
+
+    Attributes:
+        max_line_bytes (int): Largest line accepted before resynchronizing
+        limit (int): Limit in force; lowered below max_line_bytes while the
+            client waits for a response with a smaller size cap
+    """
+
+    def __init__(self, max_line_bytes: int = 16 * 1024 * 1024, on_drop: Optional[DropCallback] = None):
+        """
+        Initialize the framer.
+
+        Args:
+            max_line_bytes (int): Largest line accepted before resynchronizing (default: 16 MiB)
+            on_drop (callable, optional): Called with (tail, size) for every dropped line
+        """
+        self.max_line_bytes = max_line_bytes
+        self.limit = max_line_bytes
+        self.on_drop = on_drop
+        self._buffer = bytearray()
+        self._scanned = 0
+        self._discarding = False
+        self._dropped_tail = b""
+        self._dropped_size = 0
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """
+        Add received bytes and return every line they complete.
+
+        Args:
+            data (bytes): Bytes just read from the socket
+
+        Returns:
+            list: Complete lines without their trailing newline; empty lines are skipped
+        """
+        buffer = self._buffer
+        buffer += data
+        limit = self.limit
+        lines = []
+        dropped = []
+        start = 0
+        newline = buffer.find(b"\n", self._scanned)
+        if newline >= 0:
+            view = memoryview(buffer)
+            try:
+                while newline >= 0:
+                    end = newline
+                    if end > start and buffer[end - 1] == 0x0D:
+                        end -= 1
+                    if self._discarding:
+                        self._discarding = False
+                        tail = self._dropped_tail + bytes(view[max(start, end - DROPPED_TAIL_BYTES):end])
+                        dropped.append((tail[-DROPPED_TAIL_BYTES:], self._dropped_size + end - start))
+                    elif end - start > limit:
+                        logger.error(f"Dropping {end - start} byte line over the {limit} byte limit")
+                        dropped.append((bytes(view[max(start, end - DROPPED_TAIL_BYTES):end]), end - start))
+                    elif end > start:
+                        lines.append(bytes(view[start:end]))
+                    start = newline + 1
+                    newline = buffer.find(b"\n", start)
+            finally:
+                view.release()
+            del buffer[:start]
+        self._scanned = len(buffer)
+
+        if len(buffer) > limit:
+            if not self._discarding:
+                logger.error(f"Dropping {len(buffer)} bytes without a newline; resynchronizing on next line")
+            self._discard_partial()
+        if dropped and self.on_drop is not None:
+            for tail, size in dropped:
+                self.on_drop(tail, size)
+        return lines
+
+    def _discard_partial(self) -> None:
+        """Drop the partial line and skip input up to the next newline."""
+        buffer = self._buffer
+        if not self._discarding:
+            self._dropped_tail = b""
+            self._dropped_size = 0
+        self._dropped_tail = (self._dropped_tail + bytes(buffer[-DROPPED_TAIL_BYTES:]))[-DROPPED_TAIL_BYTES:]
+        self._dropped_size += len(buffer)
+        buffer.clear()
+        self._scanned = 0
+        self._discarding = True
+
+    def reset(self) -> None:
+        """
+        Forget all buffered bytes.
+
+        Used after reconnecting, and when the stream goes idle in the middle
+        of a line: JS8Call writes whole lines, so a fragment that sits
+        unfinished for a full timeout is stale and would otherwise corrupt
+        the next message it gets glued to.
+        """
+        self._buffer.clear()
+        self._scanned = 0
+        self._discarding = False
+        self._dropped_tail = b""
+        self._dropped_size = 0
+
+    @property
+    def pending_bytes(self) -> int:
+        """Number of buffered bytes belonging to an incomplete line."""
+        return len(self._buffer)
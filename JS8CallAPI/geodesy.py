@@ -0,0 +1,189 @@
+import functools
+import math
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from .grid_utils import grid_square_to_lat_lon
+
+# Mean Earth radius (IUGG), km
+EARTH_RADIUS_KM = 6371.0088
+
+# Grids whose centroids are kept; a busy band rarely shows more than a few thousand
+CENTROID_CACHE_SIZE = 65536
+
+
+@functools.lru_cache(maxsize=CENTROID_CACHE_SIZE)
+def grid_centroid(grid: str) -> Optional[Tuple[float, float]]:
+    """
+    Centre (lat, lon) of a grid square, or None if grid is empty or invalid.
+
+    Results are memoized in a bounded LRU cache, so repeated lookups of the
+    same stations cost a dictionary hit.
+    """
+    try:
+        return grid_square_to_lat_lon(grid)
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+def distance_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> Tuple[float, float]:
+    """
+    Great-circle distance and initial bearing between two points.
+
+    Args:
+        lat1, lon1 (float): Start point in degrees
+        lat2, lon2 (float): End point in degrees
+
+    Returns:
+        tuple: (distance in km, bearing in degrees clockwise from true north, 0-360)
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    distance = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+    y = math.sin(dlmb) * math.cos(phi2)
+    x = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(dlmb)
+    return distance, math.degrees(math.atan2(y, x)) % 360.0
+
+
+def distances_bearings(lat: float, lon: float, lats: Any, lons: Any):
+    """
+    Great-circle distance and initial bearing from one point to many, as NumPy arrays.
+
+    NaN coordinates give NaN results.
+
+    Args:
+        lat, lon (float): Start point in degrees
+        lats, lons (array-like): End points in degrees
+
+    Returns:
+        tuple: (distances in km, bearings in degrees) as numpy.ndarray
+    """
+    phi1 = math.radians(lat)
+    phi2 = np.radians(np.asarray(lats, dtype='float64'))
+    dlmb = np.radians(np.asarray(lons, dtype='float64') - lon)
+    cos_phi2 = np.cos(phi2)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * cos_phi2 * np.sin(dlmb / 2) ** 2
+    distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    y = np.sin(dlmb) * cos_phi2
+    x = math.cos(phi1) * np.sin(phi2) - math.sin(phi1) * cos_phi2 * np.cos(dlmb)
+    return distance, np.degrees(np.arctan2(y, x)) % 360.0
+
+
+def _grid_of(entry: Any) -> str:
+    """GRID of a message params dict, or grid of a record."""
+    if isinstance(entry, Mapping):
+        return entry.get('GRID') or ''
+    return getattr(entry, 'grid', '') or ''
+
+
+class DistanceCalculator:
+    """
+    Distance and bearing from the station's own grid to the stations it hears.
+
+    The origin is a grid square (or a lat/lon pair). Targets are looked up
+    by grid through the grid_centroid() cache, and whole activity snapshots
+    are computed in one vectorized pass when NumPy is installed. Stations
+    without a usable grid get None (or NaN in array results).
+
+        calc = DistanceCalculator.from_api(api)
+        for call, (km, bearing) in calc.call_activity(api.get_call_activity()).items():
+            print(f"{call}: {km:.0f} km at {bearing:.0f} deg")
+    """
+
+    def __init__(self, origin: Any, use_numpy: Optional[bool] = None):
+        """
+        Args:
+            origin (str or tuple): Own grid square, or (lat, lon) in degrees
+            use_numpy (bool, optional): Force (True) or avoid (False) NumPy (default: use it if installed)
+
+        Raises:
+            ValueError: If origin is not a valid grid square
+        """
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+        self.set_origin(origin)
+
+    @classmethod
+    def from_api(cls, api: Any, use_gps: bool = False, use_numpy: Optional[bool] = None) -> 'DistanceCalculator':
+        """
+        Use the grid configured in JS8Call, or the GPS position, as the origin.
+
+        Args:
+            api (JS8CallAPI): A connected client
+            use_gps (bool): Prefer get_gps_grid_square() and fall back to get_grid() (default: False)
+            use_numpy (bool, optional): As for the constructor
+
+        Raises:
+            ValueError: If neither source gives a valid grid
+        """
+        grid = None
+        if use_gps:
+            try:
+                grid = api.get_gps_grid_square()
+            except Exception:
+                # No gpsd or no fix: fall back to the configured grid
+                grid = None
+        return cls(grid or api.get_grid(), use_numpy)
+
+    def set_origin(self, origin: Any) -> None:
+        """Move the origin to a new grid square or (lat, lon)."""
+        if isinstance(origin, str):
+            centroid = grid_centroid(origin.strip())
+            if centroid is None:
+                raise ValueError(f"Invalid origin grid square: {origin!r}")
+            self.origin_grid = origin.strip()
+            self.lat, self.lon = centroid
+        else:
+            self.lat, self.lon = float(origin[0]), float(origin[1])
+            self.origin_grid = None
+
+    def to_grid(self, grid: str) -> Optional[Tuple[float, float]]:
+        """Return (km, bearing) to the centre of grid, or None if grid is empty or invalid."""
+        centroid = grid_centroid(grid)
+        if centroid is None:
+            return None
+        return distance_bearing(self.lat, self.lon, centroid[0], centroid[1])
+
+    def to_grids(self, grids: Iterable[str]):
+        """
+        Distance and bearing to many grid squares.
+
+        Returns:
+            tuple: (distances, bearings) as numpy.ndarray with NaN for unknown grids,
+            or lists with None entries without NumPy
+        """
+        centroids = [grid_centroid(grid) for grid in grids]
+        if not self.use_numpy:
+            results = [distance_bearing(self.lat, self.lon, c[0], c[1]) if c else (None, None) for c in centroids]
+            return [r[0] for r in results], [r[1] for r in results]
+        coords = np.array([c if c else (math.nan, math.nan) for c in centroids], dtype='float64').reshape(-1, 2)
+        return distances_bearings(self.lat, self.lon, coords[:, 0], coords[:, 1])
+
+    def call_activity(self, activity: Mapping[str, Any]) -> Dict[str, Optional[Tuple[float, float]]]:
+        """
+        Tag a get_call_activity() snapshot (dicts or records) with (km, bearing) per callsign.
+
+        Returns:
+            dict: callsign -> (km, bearing), or None for stations without a usable grid
+        """
+        calls = list(activity)
+        distances, bearings = self.to_grids(_grid_of(activity[call]) for call in calls)
+        return {call: (None if distance is None or distance != distance else (float(distance), float(bearing)))
+                for call, distance, bearing in zip(calls, distances, bearings)}
+
+    def spots(self, spots: Iterable[Any]) -> List[Optional[Tuple[float, float]]]:
+        """Tag RX.SPOT / RX.DIRECTED params (or Spot / DirectedMessage records) with (km, bearing), in order."""
+        distances, bearings = self.to_grids(_grid_of(spot) for spot in spots)
+        return [None if distance is None or distance != distance else (float(distance), float(bearing))
+                for distance, bearing in zip(distances, bearings)]
+
+    def farthest(self, activity: Mapping[str, Any], limit: int = 10) -> List[Tuple[str, float, float]]:
+        """The limit most distant stations of a call activity snapshot as (callsign, km, bearing), farthest first."""
+        tagged = [(call, result[0], result[1]) for call, result in self.call_activity(activity).items() if result]
+        tagged.sort(key=lambda item: item[1], reverse=True)
+        return tagged[:limit]
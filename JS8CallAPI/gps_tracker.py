@@ -0,0 +1,255 @@
+import logging
+import math
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+import gpsd
+
+from .events import EventCallback, EventDispatcher, EventStream, Subscription
+from .grid_utils import _LAT_SIZES, _LON_SIZES, grid_square_to_lat_lon, lat_lon_to_grid_square
+
+# Set up logging - but don't display to console by default
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Create null handler to avoid messages being printed to console
+logger.addHandler(logging.NullHandler())
+
+# Event type emitted by GPSTracker
+GRID_CHANGED = 'GPS.GRID_CHANGED'
+
+KM_PER_DEGREE_LAT = 111.2
+
+
+class GPSFix:
+    """
+    A position reported by gpsd.
+
+    Attributes:
+        lat, lon (float): Position in degrees
+        mode (int): gpsd fix mode (2 = 2D, 3 = 3D)
+        time (float): time.time() when the fix was read
+        gps_time (str): Time reported by the receiver, if any
+    """
+
+    __slots__ = ('lat', 'lon', 'mode', 'time', 'gps_time')
+
+    def __init__(self, lat: float, lon: float, mode: int, time: float, gps_time: str = ''):
+        self.lat = lat
+        self.lon = lon
+        self.mode = mode
+        self.time = time
+        self.gps_time = gps_time
+
+    def __repr__(self) -> str:
+        return f"GPSFix(lat={self.lat:.5f}, lon={self.lon:.5f}, mode={self.mode}, time={self.time:.0f})"
+
+
+def _cell_bounds(grid: str, margin_km: float) -> Tuple[float, float, float, float]:
+    """(south, west, north, east) of a grid square, widened by margin_km on every side."""
+    lat, lon = grid_square_to_lat_lon(grid)
+    depth = len(grid) // 2 - 1
+    margin_lat = margin_km / KM_PER_DEGREE_LAT
+    margin_lon = margin_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+    half_lat, half_lon = _LAT_SIZES[depth] / 2 + margin_lat, _LON_SIZES[depth] / 2 + margin_lon
+    return lat - half_lat, lon - half_lon, lat + half_lat, lon + half_lon
+
+
+class GPSTracker:
+    """
+    Background gpsd reader that keeps the latest fix and grid square in memory.
+
+    A daemon thread polls gpsd, reconnecting with backoff when it is not
+    available, so grid and fix reads never block on the GPS. The grid only
+    changes once the position has moved more than ``hysteresis_km`` past
+    the edge of the current square; a receiver wandering a few metres either
+    side of a boundary does not flip the grid back and forth.
+
+    Each change is published as a GPS.GRID_CHANGED event. With
+    ``auto_set_grid`` the tracker also calls api.set_grid(), at most once
+    every ``min_set_interval`` seconds.
+
+        tracker = GPSTracker(api, auto_set_grid=True)
+        tracker.on(lambda event: print("now in", event['value']))
+        tracker.start()
+        print(tracker.grid)            # None until the first fix
+    """
+
+    def __init__(self, api: Any = None, precision: int = 6, interval: float = 1.0,
+                 hysteresis_km: float = 0.5, auto_set_grid: bool = False, min_set_interval: float = 60.0,
+                 host: str = '127.0.0.1', port: int = 2947, max_retry_delay: float = 60.0):
+        """
+        Args:
+            api (JS8CallAPI, optional): Client to update with set_grid() when auto_set_grid is on
+            precision (int): Grid length to track, 4, 6, 8 or 10 (default: 6)
+            interval (float): Seconds between gpsd polls (default: 1)
+            hysteresis_km (float): How far past a square's edge the position must move
+                before the grid changes (default: 0.5)
+            auto_set_grid (bool): Call api.set_grid() when the grid changes (default: False)
+            min_set_interval (float): Minimum seconds between set_grid() calls (default: 60)
+            host (str): gpsd host (default: '127.0.0.1')
+            port (int): gpsd port (default: 2947)
+            max_retry_delay (float): Longest wait between gpsd reconnect attempts (default: 60)
+
+        Raises:
+            ValueError: If auto_set_grid is on without an api, or precision is invalid
+        """
+        if auto_set_grid and api is None:
+            raise ValueError("auto_set_grid needs an api to call set_grid() on")
+        if precision not in (4, 6, 8, 10):
+            raise ValueError(f"Grid precision must be 4, 6, 8 or 10, got {precision}")
+        self.api = api
+        self.precision = precision
+        self.interval = interval
+        self.hysteresis_km = hysteresis_km
+        self.auto_set_grid = auto_set_grid
+        self.min_set_interval = min_set_interval
+        self.host = host
+        self.port = port
+        self.max_retry_delay = max_retry_delay
+        self._lock = threading.Lock()
+        self._fix: Optional[GPSFix] = None
+        self._grid: Optional[str] = None
+        self._bounds: Optional[Tuple[float, float, float, float]] = None
+        self._set_grid: Optional[str] = None
+        self._last_set = 0.0
+        self._have_fix = threading.Event()
+        self._events = EventDispatcher()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    # -- readers -------------------------------------------------------------
+
+    @property
+    def grid(self) -> Optional[str]:
+        """The current grid square, or None before the first fix. Never blocks on gpsd."""
+        return self._grid
+
+    @property
+    def fix(self) -> Optional[GPSFix]:
+        """The latest fix, or None. Never blocks on gpsd."""
+        return self._fix
+
+    def fix_age(self) -> Optional[float]:
+        """Seconds since the latest fix was read, or None if there is none."""
+        fix = self._fix
+        return None if fix is None else time.time() - fix.time
+
+    def wait_for_fix(self, timeout: Optional[float] = None) -> Optional[GPSFix]:
+        """Block until the first fix arrives (or timeout passes) and return it."""
+        self._have_fix.wait(timeout)
+        return self._fix
+
+    # -- events --------------------------------------------------------------
+
+    def on(self, callback: EventCallback) -> Subscription:
+        """
+        Call back when the grid changes.
+
+        Args:
+            callback (callable): Called on the tracker thread with
+                {'type': 'GPS.GRID_CHANGED', 'value': grid, 'params': {'GRID', 'PREVIOUS', 'LAT', 'LON'}}
+
+        Returns:
+            Subscription: Call cancel() to unsubscribe
+        """
+        return self._events.subscribe(GRID_CHANGED, callback)
+
+    def events(self, timeout: Optional[float] = None, maxsize: int = 100) -> EventStream:
+        """Iterate over GPS.GRID_CHANGED events."""
+        return self._events.stream(GRID_CHANGED, None, timeout, maxsize)
+
+    # -- tracking ------------------------------------------------------------
+
+    def update(self, lat: float, lon: float, mode: int = 3, gps_time: str = '') -> Optional[str]:
+        """
+        Feed a position to the tracker (the polling thread calls this for every gpsd fix).
+
+        Returns:
+            str: The new grid if this fix changed it, else None
+        """
+        fix = GPSFix(lat, lon, mode, time.time(), gps_time)
+        with self._lock:
+            self._fix = fix
+            previous = self._grid
+            bounds = self._bounds
+            if bounds is not None:
+                south, west, north, east = bounds
+                if south <= lat <= north and west <= lon <= east:
+                    self._have_fix.set()
+                    return None
+            grid = lat_lon_to_grid_square(lat, lon, self.precision)
+            if grid == previous:
+                self._have_fix.set()
+                return None
+            self._grid = grid
+            self._bounds = _cell_bounds(grid, self.hysteresis_km)
+        self._have_fix.set()
+        logger.info(f"GPS grid changed from {previous} to {grid}")
+        self._events.dispatch({'type': GRID_CHANGED, 'value': grid,
+                               'params': {'GRID': grid, 'PREVIOUS': previous, 'LAT': lat, 'LON': lon}})
+        return grid
+
+    def _apply_grid(self) -> None:
+        """Push the current grid to JS8Call if it differs and the rate limit allows."""
+        grid = self._grid
+        if grid is None or grid == self._set_grid:
+            return
+        if time.monotonic() - self._last_set < self.min_set_interval:
+            return
+        self._last_set = time.monotonic()
+        try:
+            if self.api.set_grid(grid):
+                self._set_grid = grid
+        except (TimeoutError, ConnectionError, OSError) as e:
+            logger.error(f"Failed to set grid {grid}: {e}")
+
+    def _poll(self) -> None:
+        packet = gpsd.get_current()
+        if packet.mode < 2:
+            return
+        self.update(packet.lat, packet.lon, packet.mode, getattr(packet, 'time', '') or '')
+
+    def _run(self) -> None:
+        connected = False
+        delay = self.interval
+        while not self._stop_event.is_set():
+            try:
+                if not connected:
+                    gpsd.connect(host=self.host, port=self.port)
+                    connected = True
+                    delay = self.interval
+                self._poll()
+            except Exception as e:
+                # gpsd raises plain exceptions (and UserWarning) for lost connections and bad data
+                logger.error(f"GPS read failed: {e}")
+                connected = False
+                delay = min(max(delay * 2, self.interval), self.max_retry_delay)
+                self._stop_event.wait(delay)
+                continue
+            if self.auto_set_grid:
+                self._apply_grid()
+            self._stop_event.wait(self.interval)
+
+    def start(self) -> None:
+        """Start polling gpsd in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="JS8CallAPI-gps", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and end open event streams."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._events.close()
+
+    def __enter__(self) -> 'GPSTracker':
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
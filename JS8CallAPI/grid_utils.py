@@ -1,30 +1,175 @@
-def lat_lon_to_grid_square(lat, lon):
+import math
+from typing import Iterable, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+PRECISIONS = (2, 4, 6, 8, 10)
+
+# Number of divisions per character pair: field (A-R), square (0-9), subsquare (a-x),
+# extended square (0-9), extended subsquare (a-x)
+_RADICES = (18, 10, 24, 10, 24)
+# First character of each pair
+_BASES = ('A', '0', 'a', '0', 'a')
+# Cells across the whole globe at 10 characters, per axis
+_CELLS = 18 * 10 * 24 * 10 * 24
+# Size in degrees of one cell at each pair, longitude and latitude
+_LON_SIZES = (20.0, 2.0, 2.0 / 24, 2.0 / 240, 2.0 / 5760)
+_LAT_SIZES = (10.0, 1.0, 1.0 / 24, 1.0 / 240, 1.0 / 5760)
+# (first character code, radix, cells per step) of each pair, for splitting a cell index into digits
+_PAIRS = tuple((ord(_BASES[pair]), _RADICES[pair], _CELLS // math.prod(_RADICES[:pair + 1])) for pair in range(5))
+
+
+def _check_precision(precision: int) -> int:
+    if precision not in PRECISIONS:
+        raise ValueError(f"Grid precision must be one of {PRECISIONS}, got {precision}")
+    return precision // 2
+
+
+def lat_lon_to_grid_square(lat, lon, precision=6):
     """
     Convert latitude and longitude to Maidenhead grid square
+
+    Args:
+        lat (float): Latitude in degrees (-90 to 90)
+        lon (float): Longitude in degrees (-180 to 180)
+        precision (int): Locator length, one of 2, 4, 6, 8 or 10 (default: 6)
+
+    Returns:
+        str: The locator, e.g. 'FN42ab' (fields upper case, subsquares lower case)
     """
-    # Normalize coordinates
-    lon = lon + 180
-    lat = lat + 90
-    
-    # Calculate first level (field)
-    field_lon = int(lon / 20)
-    field_lat = int(lat / 10)
-    
-    # Calculate second level (square)
-    square_lon = int((lon % 20) / 2)
-    square_lat = int((lat % 10) / 1)
-    
-    # Calculate third level (subsquare)
-    subsquare_lon = int((lon % 2) * 12)
-    subsquare_lat = int((lat % 1) * 24)
-    
-    # Convert to characters
-    field_lon_char = chr(ord('A') + field_lon)
-    field_lat_char = chr(ord('A') + field_lat)
-    square_lon_char = str(square_lon)
-    square_lat_char = str(square_lat)
-    subsquare_lon_char = chr(ord('a') + subsquare_lon)
-    subsquare_lat_char = chr(ord('a') + subsquare_lat)
-    
-    # Combine into grid square
-    return f"{field_lon_char}{field_lat_char}{square_lon_char}{square_lat_char}{subsquare_lon_char}{subsquare_lat_char}" 
\ No newline at end of file
+    pairs = _check_precision(precision)
+    # Index of the 10-character cell on each axis, clamped so the poles and 180E stay valid
+    x = min(max(math.floor((lon + 180) * (_CELLS / 360.0)), 0), _CELLS - 1)
+    y = min(max(math.floor((lat + 90) * (_CELLS / 180.0)), 0), _CELLS - 1)
+    return ''.join([chr(base + x // step % radix) + chr(base + y // step % radix)
+                    for base, radix, step in _PAIRS[:pairs]])
+
+
+def grid_square_to_lat_lon(grid: str) -> Tuple[float, float]:
+    """
+    Convert a Maidenhead grid square to the latitude and longitude of its centre.
+
+    Args:
+        grid (str): Locator of 2, 4, 6, 8 or 10 characters, in any case
+
+    Returns:
+        tuple: (lat, lon) in degrees
+
+    Raises:
+        ValueError: If grid is not a valid locator
+    """
+    grid = grid.strip()
+    if len(grid) not in PRECISIONS:
+        raise ValueError(f"Invalid grid square: {grid!r}")
+    upper = grid.upper()
+    lat, lon = -90.0, -180.0
+    for pair in range(len(grid) // 2):
+        base, radix = ord(_BASES[pair].upper()), _RADICES[pair]
+        x = ord(upper[2 * pair]) - base
+        y = ord(upper[2 * pair + 1]) - base
+        if not (0 <= x < radix and 0 <= y < radix):
+            raise ValueError(f"Invalid grid square: {grid!r}")
+        lon += x * _LON_SIZES[pair]
+        lat += y * _LAT_SIZES[pair]
+    last = len(grid) // 2 - 1
+    return lat + _LAT_SIZES[last] / 2, lon + _LON_SIZES[last] / 2
+
+
+def lat_lon_to_grid_squares(lats: Sequence[float], lons: Sequence[float], precision: int = 6,
+                            use_numpy: Optional[bool] = None):
+    """
+    Convert many coordinates to grid squares at once.
+
+    With NumPy the whole batch is converted with array arithmetic: each
+    coordinate becomes an integer cell index, the index is split into its
+    locator digits, and the characters are assembled as one byte matrix.
+
+    Args:
+        lats (sequence or numpy.ndarray): Latitudes in degrees
+        lons (sequence or numpy.ndarray): Longitudes in degrees, same length as lats
+        precision (int): Locator length, one of 2, 4, 6, 8 or 10 (default: 6)
+        use_numpy (bool, optional): Force (True) or avoid (False) NumPy (default: use it if installed)
+
+    Returns:
+        numpy.ndarray of str when NumPy is used, else a list of str
+
+    Raises:
+        ValueError: If precision is invalid or lats and lons differ in length
+    """
+    pairs = _check_precision(precision)
+    if use_numpy is None:
+        use_numpy = np is not None
+    if len(lats) != len(lons):
+        raise ValueError(f"lats and lons differ in length ({len(lats)} != {len(lons)})")
+    if not use_numpy:
+        return [lat_lon_to_grid_square(lat, lon, precision) for lat, lon in zip(lats, lons)]
+
+    chars = np.empty((len(lats), precision), dtype='uint8')
+    for column, values, offset, span in ((0, lons, 180.0, 360.0), (1, lats, 90.0, 180.0)):
+        values = np.asarray(values, dtype='float64')
+        index = np.floor((values + offset) * (_CELLS / span)).astype('int64')
+        np.clip(index, 0, _CELLS - 1, out=index)
+        for pair, (base, radix, step) in enumerate(_PAIRS[:pairs]):
+            chars[:, 2 * pair + column] = index // step % radix + base
+    return chars.view(f'S{precision}').ravel().astype(f'U{precision}')
+
+
+def grid_squares_to_lat_lon(grids: Iterable[str], use_numpy: Optional[bool] = None):
+    """
+    Convert many grid squares to the latitude and longitude of their centres.
+
+    Locators of different lengths can be mixed. Invalid locators give NaN
+    coordinates instead of raising, so one bad row does not spoil a batch.
+
+    Args:
+        grids (iterable): Locators of 2, 4, 6, 8 or 10 characters, in any case
+        use_numpy (bool, optional): Force (True) or avoid (False) NumPy (default: use it if installed)
+
+    Returns:
+        tuple: (lats, lons) as numpy.ndarray of float64 when NumPy is used, else lists of float
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if not use_numpy:
+        lats, lons = [], []
+        for grid in grids:
+            try:
+                lat, lon = grid_square_to_lat_lon(grid)
+            except (ValueError, TypeError, AttributeError):
+                lat = lon = math.nan
+            lats.append(lat)
+            lons.append(lon)
+        return lats, lons
+
+    # One extra character so over-long locators are seen as invalid rather than truncated
+    text = np.asarray(grids if isinstance(grids, np.ndarray) else list(grids), dtype='U11')
+    codes = text.view('uint32').reshape(-1, 11)
+    if np.isin(codes, (9, 10, 13, 32)).any():
+        text = np.char.strip(text)
+        codes = text.view('uint32').reshape(-1, 11)
+    lengths = np.count_nonzero(codes, axis=1)
+    chars = codes[:, :10].astype('int64')
+    lats = np.full(len(text), -90.0)
+    lons = np.full(len(text), -180.0)
+    valid = np.isin(lengths, PRECISIONS)
+    for pair in range(5):
+        present = lengths > 2 * pair
+        x = chars[:, 2 * pair]
+        y = chars[:, 2 * pair + 1]
+        if _BASES[pair].isalpha():
+            # Clearing bit 5 upper-cases ASCII letters
+            x, y = x & ~0x20, y & ~0x20
+        base = ord(_BASES[pair].upper())
+        x, y = x - base, y - base
+        valid &= ~present | ((x >= 0) & (x < _RADICES[pair]) & (y >= 0) & (y < _RADICES[pair]))
+        lons += np.where(present, x * _LON_SIZES[pair], 0.0)
+        lats += np.where(present, y * _LAT_SIZES[pair], 0.0)
+    last = np.clip(lengths // 2 - 1, 0, 4)
+    lons += np.take(_LON_SIZES, last) / 2
+    lats += np.take(_LAT_SIZES, last) / 2
+    lats[~valid] = np.nan
+    lons[~valid] = np.nan
+    return lats, lons
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .delta import ActivityTracker
+from .events import EventDispatcher, EventCallback, EventStream, Subscription
+from .streaming import iter_json_array
+
+# Set up logging - but don't display to console by default
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Create null handler to avoid messages being printed to console
+logger.addHandler(logging.NullHandler())
+
+MessageKey = Tuple[Any, int]
+
+# Event types emitted by InboxSync
+NEW_MESSAGE = 'INBOX.NEW_MESSAGE'
+CHANGED_MESSAGE = 'INBOX.CHANGED_MESSAGE'
+REMOVED_MESSAGE = 'INBOX.REMOVED_MESSAGE'
+
+
+def message_key(message: Dict[str, Any]) -> MessageKey:
+    """Identify an inbox message by its ID and UTC (falling back to the sender when there is no ID)."""
+    params = message.get('params') or {}
+    msg_id = params.get('_ID')
+    if msg_id is None:
+        msg_id = params.get('FROM', '')
+    return msg_id, params.get('UTC', 0)
+
+
+def message_digest(message: Dict[str, Any]) -> str:
+    """Hash a message's type and params so status changes (e.g. UNREAD -> READ) are noticed."""
+    canonical = json.dumps([message.get('type'), message.get('params')], sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode(), digest_size=12).hexdigest()
+
+
+class InboxChanges:
+    """
+    Result of one InboxSync.sync() call.
+
+    Attributes:
+        new (list): Messages not seen before, oldest first
+        changed (list): Known messages whose type or params changed
+        removed (list): Messages that are no longer in the inbox; one removed
+            while the service was down, known only from the cursor, has just
+            ``_ID`` and ``UTC`` in its params
+        unchanged (bool): True when the inbox response was identical to the previous one
+    """
+
+    __slots__ = ('new', 'changed', 'removed', 'unchanged')
+
+    def __init__(self, new: List[Dict[str, Any]], changed: List[Dict[str, Any]],
+                 removed: List[Dict[str, Any]], unchanged: bool = False):
+        self.new = new
+        self.changed = changed
+        self.removed = removed
+        self.unchanged = unchanged
+
+    def __bool__(self) -> bool:
+        return bool(self.new or self.changed or self.removed)
+
+    def __repr__(self) -> str:
+        return (f"InboxChanges(new={len(self.new)}, changed={len(self.changed)}, "
+                f"removed={len(self.removed)}, unchanged={self.unchanged})")
+
+
+class InboxSync:
+    """
+    Local mirror of the JS8Call inbox, updated incrementally.
+
+    JS8Call's API has no "messages since" query, so every sync still asks
+    for the whole inbox. The response is fetched undecoded and hashed first;
+    when nothing changed, the sync ends there without decoding anything.
+    Otherwise each message is compared to the mirror by (ID, UTC) and a
+    content digest, and only new, changed and removed messages are applied
+    and reported.
+
+    The cursor (every known message key with its digest) is saved to
+    ``cursor_path`` whenever a sync finds changes, so a restarted service
+    does not report the whole inbox as new again.
+
+        sync = InboxSync(api, cursor_path='inbox.cursor')
+        sync.on(lambda event: relay(event['params']))
+        sync.start(interval=30)
+    """
+
+    def __init__(self, api: Any, cursor_path: Optional[str] = None, callsign: Optional[str] = None):
+        """
+        Args:
+            api (JS8CallAPI): A connected client
+            cursor_path (str, optional): File to persist the sync cursor in
+            callsign (str, optional): Only mirror messages to or from this callsign
+        """
+        self.api = api
+        self.cursor_path = cursor_path
+        self.callsign = callsign
+        self._lock = threading.Lock()
+        self._messages: Dict[MessageKey, Dict[str, Any]] = {}
+        self._digests: Dict[MessageKey, str] = {}
+        self._response_digest: Optional[bytes] = None
+        # Keys and digests loaded from the cursor, consumed by the first sync
+        self._known: Dict[MessageKey, str] = {}
+        self._events = EventDispatcher()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        if cursor_path:
+            self._load_cursor()
+
+    # -- cursor --------------------------------------------------------------
+
+    def _load_cursor(self) -> None:
+        try:
+            with open(self.cursor_path) as f:
+                cursor = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable inbox cursor {self.cursor_path}: {e}")
+            return
+        self._known = {(msg_id, utc): digest for msg_id, utc, digest in cursor.get('messages', [])}
+
+    def _save_cursor(self) -> None:
+        cursor = {
+            'version': 1,
+            'callsign': self.callsign,
+            'messages': [[msg_id, utc, digest] for (msg_id, utc), digest in self._digests.items()],
+        }
+        temp_path = self.cursor_path + '.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(cursor, f)
+            os.replace(temp_path, self.cursor_path)
+        except OSError as e:
+            logger.error(f"Failed to save inbox cursor {self.cursor_path}: {e}")
+
+    # -- syncing -------------------------------------------------------------
+
+    def _fetch(self) -> Tuple[bytes, bytes]:
+        params = {'CALLSIGN': self.callsign} if self.callsign else None
+        raw = self.api.send_message_raw("INBOX.GET_MESSAGES", params=params)
+        return raw, ActivityTracker.digest(raw)
+
+    def sync(self) -> InboxChanges:
+        """
+        Fetch the inbox and apply what changed to the mirror.
+
+        Subscribers registered with on() / events() receive an
+        INBOX.NEW_MESSAGE, INBOX.CHANGED_MESSAGE or INBOX.REMOVED_MESSAGE
+        event for each affected message.
+
+        Returns:
+            InboxChanges: The new, changed and removed messages
+
+        Raises:
+            TimeoutError: If JS8Call does not answer in time
+            ConnectionError: If the connection is lost
+            ValueError: If the MESSAGES array is malformed or truncated; the
+                mirror is left as it was
+        """
+        raw, response_digest = self._fetch()
+        with self._lock:
+            if response_digest == self._response_digest:
+                return InboxChanges([], [], [], unchanged=True)
+            new, changed = [], []
+            seen = set()
+            # Applied only once the whole array has parsed, so a bad response changes nothing
+            updates = []
+            for message in iter_json_array(raw, 'MESSAGES'):
+                if not isinstance(message, dict):
+                    continue
+                key = message_key(message)
+                digest = message_digest(message)
+                seen.add(key)
+                previous = self._digests.get(key)
+                if previous is None and key in self._known:
+                    # Seen before a restart: only report it if it changed since
+                    if self._known[key] != digest:
+                        changed.append(message)
+                elif previous is None:
+                    new.append(message)
+                elif previous != digest:
+                    changed.append(message)
+                else:
+                    continue
+                updates.append((key, message, digest))
+            for key, message, digest in updates:
+                self._messages[key] = message
+                self._digests[key] = digest
+            removed = [self._messages.pop(key) for key in list(self._messages) if key not in seen]
+            for message in removed:
+                self._digests.pop(message_key(message), None)
+            # Deleted while the service was down: the cursor holds no bodies, only the key
+            removed.extend({'params': {'_ID': msg_id, 'UTC': utc}}
+                           for msg_id, utc in self._known if (msg_id, utc) not in seen)
+            self._known = {}
+            self._response_digest = response_digest
+            if self.cursor_path and (new or changed or removed):
+                self._save_cursor()
+        new.sort(key=lambda message: message_key(message)[1])
+        changes = InboxChanges(new, changed, removed)
+        for event_type, messages in ((NEW_MESSAGE, new), (CHANGED_MESSAGE, changed), (REMOVED_MESSAGE, removed)):
+            for message in messages:
+                self._events.dispatch({'type': event_type, 'value': message.get('type', ''),
+                                       'params': message.get('params') or {}})
+        return changes
+
+    # -- mirror --------------------------------------------------------------
+
+    def messages(self) -> List[Dict[str, Any]]:
+        """Every mirrored message, oldest first, in get_inbox_messages() format."""
+        with self._lock:
+            return sorted(self._messages.values(), key=lambda message: message_key(message)[1])
+
+    def get(self, msg_id: Any) -> Optional[Dict[str, Any]]:
+        """Return the mirrored message with this ID, or None."""
+        with self._lock:
+            for (key_id, _), message in self._messages.items():
+                if key_id == msg_id:
+                    return message
+        return None
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    # -- events --------------------------------------------------------------
+
+    def on(self, callback: EventCallback, types: Any = NEW_MESSAGE,
+           callsign: Optional[str] = None) -> Subscription:
+        """
+        Call back for inbox changes found by sync().
+
+        Args:
+            callback (callable): Called with {'type': event type, 'value': message type, 'params': ...}
+            types (str or iterable): INBOX.NEW_MESSAGE, INBOX.CHANGED_MESSAGE, INBOX.REMOVED_MESSAGE
+                or '*' (default: INBOX.NEW_MESSAGE)
+            callsign (str, optional): Only messages whose FROM or TO matches
+
+        Returns:
+            Subscription: Call cancel() to unsubscribe
+        """
+        return self._events.subscribe(types, callback, callsign)
+
+    def events(self, types: Any = NEW_MESSAGE, callsign: Optional[str] = None,
+               timeout: Optional[float] = None, maxsize: int = 10000) -> EventStream:
+        """Iterate over inbox change events (see on() for the arguments)."""
+        return self._events.stream(types, callsign, timeout, maxsize)
+
+    # -- background polling --------------------------------------------------
+
+    def start(self, interval: float = 30.0) -> None:
+        """Call sync() every interval seconds in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def run() -> None:
+            while not self._stop_event.is_set():
+                try:
+                    self.sync()
+                except (TimeoutError, ConnectionError, OSError, ValueError) as e:
+                    logger.error(f"Inbox sync failed: {e}")
+                self._stop_event.wait(interval)
+
+        self._thread = threading.Thread(target=run, name="JS8CallAPI-inbox-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop background polling and end open event streams."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._events.close()
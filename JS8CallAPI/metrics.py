@@ -0,0 +1,222 @@
+import bisect
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Any, Dict, Tuple
+
+# Set up logging - but don't display to console by default
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Create null handler to avoid messages being printed to console
+logger.addHandler(logging.NullHandler())
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class CommandStats:
+    """Counters for one request type."""
+
+    __slots__ = ('requests', 'responses', 'timeouts', 'errors', 'bytes_sent',
+                 'latency_sum', 'latency_max', 'buckets')
+
+    def __init__(self):
+        self.requests = 0
+        self.responses = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        # One slot per bucket plus the +Inf overflow
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def as_dict(self) -> Dict[str, Any]:
+        cumulative = 0
+        histogram = {}
+        for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), self.buckets):
+            cumulative += count
+            histogram['+Inf' if bound == float('inf') else str(bound)] = cumulative
+        return {
+            'requests': self.requests,
+            'responses': self.responses,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+            'bytes_sent': self.bytes_sent,
+            'latency_sum': self.latency_sum,
+            'latency_max': self.latency_max,
+            'latency_mean': self.latency_sum / self.responses if self.responses else 0.0,
+            'latency_histogram': histogram,
+        }
+
+
+class ClientMetrics:
+    """
+    Per-message-type counters for a JS8Call client.
+
+    Request counts, timeouts, errors, bytes sent and a latency histogram are
+    kept per request type (e.g. 'RIG.GET_FREQ'). Bytes received are kept per
+    received message type, and unsolicited events are counted by type.
+    All methods are safe to call from the reader and caller threads at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._commands: Dict[str, CommandStats] = {}
+        self._received_bytes: Dict[str, int] = {}
+        self._received_messages: Dict[str, int] = {}
+        self._events: Dict[str, int] = {}
+        self._started = time.time()
+
+    def _command(self, msg_type: str) -> CommandStats:
+        stats = self._commands.get(msg_type)
+        if stats is None:
+            stats = self._commands[msg_type] = CommandStats()
+        return stats
+
+    def record_request(self, msg_type: str, nbytes: int) -> None:
+        """Count a request written to the socket."""
+        with self._lock:
+            stats = self._command(msg_type)
+            stats.requests += 1
+            stats.bytes_sent += nbytes
+
+    def record_response(self, msg_type: str, latency: float) -> None:
+        """Record the round-trip time of an answered request."""
+        with self._lock:
+            stats = self._command(msg_type)
+            stats.responses += 1
+            stats.latency_sum += latency
+            if latency > stats.latency_max:
+                stats.latency_max = latency
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def record_timeout(self, msg_type: str) -> None:
+        """Count a request that got no response in time."""
+        with self._lock:
+            self._command(msg_type).timeouts += 1
+
+    def record_error(self, msg_type: str) -> None:
+        """Count a request that failed because of a connection error."""
+        with self._lock:
+            self._command(msg_type).errors += 1
+
+    def record_received(self, msg_type: str, nbytes: int, event: bool = False) -> None:
+        """Count a received line and, for unsolicited messages, the event."""
+        with self._lock:
+            self._received_bytes[msg_type] = self._received_bytes.get(msg_type, 0) + nbytes
+            self._received_messages[msg_type] = self._received_messages.get(msg_type, 0) + 1
+            if event:
+                self._events[msg_type] = self._events.get(msg_type, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return a point-in-time copy of all counters.
+
+        Returns:
+            dict: A dictionary containing:
+                - uptime (float): Seconds since metrics were enabled
+                - commands (dict): Request type -> counters and latency histogram
+                - received (dict): Message type -> {'messages': int, 'bytes': int}
+                - events (dict): Unsolicited message type -> count
+        """
+        with self._lock:
+            return {
+                'uptime': time.time() - self._started,
+                'commands': {t: s.as_dict() for t, s in self._commands.items()},
+                'received': {t: {'messages': self._received_messages[t], 'bytes': b}
+                             for t, b in self._received_bytes.items()},
+                'events': dict(self._events),
+            }
+
+    def prometheus_text(self) -> str:
+        """Render the counters in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        commands = snap['commands']
+        lines = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def label(value: str) -> str:
+            return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        for name, key, help_text in (
+                ('js8call_requests_total', 'requests', 'Requests sent, by message type.'),
+                ('js8call_request_timeouts_total', 'timeouts', 'Requests that timed out, by message type.'),
+                ('js8call_request_errors_total', 'errors', 'Requests failed by connection errors, by message type.'),
+                ('js8call_bytes_sent_total', 'bytes_sent', 'Bytes sent, by message type.')):
+            family(name, 'counter', help_text)
+            for msg_type, stats in sorted(commands.items()):
+                lines.append(f'{name}{{type="{label(msg_type)}"}} {stats[key]}')
+
+        family('js8call_request_latency_seconds', 'histogram', 'Request round-trip time, by message type.')
+        for msg_type, stats in sorted(commands.items()):
+            escaped = label(msg_type)
+            for bound, count in stats['latency_histogram'].items():
+                lines.append(f'js8call_request_latency_seconds_bucket{{type="{escaped}",le="{bound}"}} {count}')
+            lines.append(f'js8call_request_latency_seconds_sum{{type="{escaped}"}} {stats["latency_sum"]}')
+            lines.append(f'js8call_request_latency_seconds_count{{type="{escaped}"}} {stats["responses"]}')
+
+        family('js8call_bytes_received_total', 'counter', 'Bytes received, by message type.')
+        for msg_type, received in sorted(snap['received'].items()):
+            lines.append(f'js8call_bytes_received_total{{type="{label(msg_type)}"}} {received["bytes"]}')
+        family('js8call_messages_received_total', 'counter', 'Messages received, by message type.')
+        for msg_type, received in sorted(snap['received'].items()):
+            lines.append(f'js8call_messages_received_total{{type="{label(msg_type)}"}} {received["messages"]}')
+        family('js8call_events_total', 'counter', 'Unsolicited messages received, by message type.')
+        for msg_type, count in sorted(snap['events'].items()):
+            lines.append(f'js8call_events_total{{type="{label(msg_type)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class MetricsServer:
+    """
+    Serve ClientMetrics in Prometheus text format over HTTP.
+
+    Any GET path returns the exposition; it is meant for a local scraper, so
+    it binds to 127.0.0.1 unless told otherwise.
+    """
+
+    def __init__(self, metrics: ClientMetrics, port: int = 9842, host: str = '127.0.0.1'):
+        """
+        Start serving in a background thread.
+
+        Args:
+            metrics (ClientMetrics): The counters to expose
+            port (int): TCP port to listen on, 0 for any free port (default: 9842)
+            host (str): Interface to bind (default: '127.0.0.1')
+        """
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._httpd = _ThreadingHTTPServer((host, port), Handler)
+        self.address: Tuple[str, int] = self._httpd.server_address[:2]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="JS8CallAPI-metrics", daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        return self.address[1]
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join(timeout=1)
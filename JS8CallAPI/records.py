@@ -0,0 +1,160 @@
+import sys
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+_intern = sys.intern
+
+
+def _text(value: Any) -> str:
+    """Return value as an interned string (callsigns, grids and other short repeated tokens)."""
+    if not isinstance(value, str):
+        value = '' if value is None else str(value)
+    return _intern(value)
+
+
+class _Record:
+    """
+    Base for the compact record types.
+
+    Each subclass lists its fields as (attribute, wire key, default) in
+    _FIELDS and the attributes whose strings should be interned in
+    _INTERNED. Records hold only their slots; the wire dict they came from
+    is not kept.
+    """
+
+    __slots__ = ()
+    _FIELDS: Tuple[Tuple[str, str, Any], ...] = ()
+    _INTERNED: frozenset = frozenset()
+
+    def __init__(self, **values: Any):
+        for attr, _, default in self._FIELDS:
+            value = values.get(attr, default)
+            if attr in self._INTERNED:
+                value = _text(value)
+            setattr(self, attr, value)
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, Any], **extra: Any) -> '_Record':
+        """
+        Build a record from the params of a JS8Call message.
+
+        Args:
+            params (dict): Message params with upper-case wire keys
+            **extra: Attribute values that do not come from params (e.g. the dict key)
+        """
+        record = cls.__new__(cls)
+        interned = cls._INTERNED
+        for attr, key, default in cls._FIELDS:
+            if attr in extra:
+                value = extra[attr]
+            else:
+                value = params.get(key, default)
+            if attr in interned:
+                value = _text(value)
+            setattr(record, attr, value)
+        return record
+
+    def to_params(self) -> Dict[str, Any]:
+        """Return the record as a dict with the original upper-case wire keys."""
+        return {key: getattr(self, attr) for attr, key, _ in self._FIELDS if key}
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr) for attr, _, _ in self._FIELDS)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{attr}={getattr(self, attr)!r}" for attr, _, _ in self._FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    __hash__ = None
+
+
+class Spot(_Record):
+    """A station spotted by JS8Call (RX.SPOT)."""
+
+    __slots__ = ('call', 'grid', 'snr', 'freq', 'dial', 'offset', 'utc')
+    _FIELDS = (('call', 'CALL', ''), ('grid', 'GRID', ''), ('snr', 'SNR', 0), ('freq', 'FREQ', 0),
+               ('dial', 'DIAL', 0), ('offset', 'OFFSET', 0), ('utc', 'UTC', 0))
+    _INTERNED = frozenset(('call', 'grid'))
+
+
+class DirectedMessage(_Record):
+    """A directed message decoded by JS8Call (RX.DIRECTED)."""
+
+    __slots__ = ('from_call', 'to', 'cmd', 'text', 'grid', 'snr', 'freq', 'dial', 'offset',
+                 'speed', 'tdrift', 'utc')
+    _FIELDS = (('from_call', 'FROM', ''), ('to', 'TO', ''), ('cmd', 'CMD', ''), ('text', 'TEXT', ''),
+               ('grid', 'GRID', ''), ('snr', 'SNR', 0), ('freq', 'FREQ', 0), ('dial', 'DIAL', 0),
+               ('offset', 'OFFSET', 0), ('speed', 'SPEED', 0), ('tdrift', 'TDRIFT', 0.0),
+               ('utc', 'UTC', 0))
+    _INTERNED = frozenset(('from_call', 'to', 'cmd', 'grid'))
+
+
+class CallActivityEntry(_Record):
+    """One heard station from RX.CALL_ACTIVITY, keyed by callsign."""
+
+    __slots__ = ('callsign', 'snr', 'grid', 'utc')
+    _FIELDS = (('callsign', '', ''), ('snr', 'SNR', 0), ('grid', 'GRID', ''), ('utc', 'UTC', 0))
+    _INTERNED = frozenset(('callsign', 'grid'))
+
+
+class BandActivityEntry(_Record):
+    """One audio offset from RX.BAND_ACTIVITY, keyed by offset."""
+
+    __slots__ = ('offset', 'freq', 'dial', 'text', 'snr', 'utc')
+    _FIELDS = (('offset', 'OFFSET', 0), ('freq', 'FREQ', 0), ('dial', 'DIAL', 0), ('text', 'TEXT', ''),
+               ('snr', 'SNR', 0), ('utc', 'UTC', 0))
+
+
+class InboxMessage(_Record):
+    """A message stored in the JS8Call inbox (one entry of INBOX.MESSAGES)."""
+
+    __slots__ = ('id', 'type', 'from_call', 'to', 'text', 'utc', 'path', 'cmd', 'dial', 'offset', 'snr')
+    _FIELDS = (('id', '_ID', 0), ('type', '', ''), ('from_call', 'FROM', ''), ('to', 'TO', ''),
+               ('text', 'TEXT', ''), ('utc', 'UTC', 0), ('path', 'PATH', ''), ('cmd', 'CMD', ''),
+               ('dial', 'DIAL', 0), ('offset', 'OFFSET', 0), ('snr', 'SNR', 0))
+    _INTERNED = frozenset(('type', 'from_call', 'to', 'path', 'cmd'))
+
+
+def call_activity_records(activity: Mapping[str, Any]) -> Dict[str, CallActivityEntry]:
+    """Convert get_call_activity() output (callsign -> params) to records."""
+    return {_intern(call): CallActivityEntry.from_params(params, callsign=call)
+            for call, params in activity.items() if isinstance(params, dict)}
+
+
+def band_activity_records(activity: Mapping[str, Any]) -> Dict[int, BandActivityEntry]:
+    """Convert get_band_activity() output (offset -> params) to records keyed by integer offset."""
+    records = {}
+    for offset, params in activity.items():
+        if not isinstance(params, dict):
+            continue
+        try:
+            key = int(offset)
+        except (TypeError, ValueError):
+            continue
+        records[key] = BandActivityEntry.from_params(params, offset=params.get('OFFSET', key))
+    return records
+
+
+def inbox_records(messages: List[Dict[str, Any]]) -> List[InboxMessage]:
+    """Convert get_inbox_messages() output to records."""
+    return [InboxMessage.from_params(message.get('params') or {}, type=message.get('type', ''))
+            for message in messages]
+
+
+# Unsolicited message types with a record equivalent
+_EVENT_RECORDS = {'RX.SPOT': Spot, 'RX.DIRECTED': DirectedMessage}
+
+
+def record_from_message(message: Mapping[str, Any]) -> Optional[_Record]:
+    """
+    Convert an RX.SPOT or RX.DIRECTED message (as delivered to api.on / api.events) to a record.
+
+    Returns:
+        Spot or DirectedMessage, or None for other message types
+    """
+    record_type = _EVENT_RECORDS.get(message.get('type'))
+    if record_type is None:
+        return None
+    params = message.get('params')
+    return record_type.from_params(params if isinstance(params, dict) else {})
@@ -0,0 +1,507 @@
+import heapq
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from .geodesy import EARTH_RADIUS_KM, grid_centroid
+from .grid_utils import _LAT_SIZES, _LON_SIZES
+from .records import DirectedMessage, Spot
+
+
+# Below this many children or stations, a plain loop beats NumPy's per-call overhead
+_VECTOR_MIN = 32
+# A partly covered cell with at most this many stations is scanned in one pass instead of descended
+_SCAN_MAX = 4096
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _cell_radius(depth: int) -> float:
+    """
+    Upper bound in km on the distance from a cell's centre to any point of a cell at this depth.
+
+    Every point of the cell lies within half sizes h of latitude and w of
+    longitude from the centre, so its haversine term
+    sin^2(dlat/2) + cos(lat1)cos(lat2)sin^2(dlon/2) is at most
+    sin^2(h/2) + sin^2(w/2).
+    """
+    half_lat, half_lon = math.radians(_LAT_SIZES[depth] / 2), math.radians(_LON_SIZES[depth] / 2)
+    a = math.sin(half_lat / 2) ** 2 + math.sin(half_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+_CELL_RADII = tuple(_cell_radius(depth) for depth in range(5))
+
+
+def _cos_distance(distance_km: float) -> float:
+    """
+    Cosine of the central angle of a distance, clamped to [0, pi].
+
+    Points are compared as unit vectors: a point lies within distance_km
+    of the query when the dot product of their vectors is at least this.
+    """
+    return math.cos(min(max(distance_km, 0.0) / EARTH_RADIUS_KM, math.pi))
+
+
+def _unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    phi, lmb = math.radians(lat), math.radians(lon)
+    return math.cos(phi) * math.cos(lmb), math.cos(phi) * math.sin(lmb), math.sin(phi)
+
+
+class StationEntry:
+    """
+    A station in a StationIndex.
+
+    Attributes:
+        callsign (str): The station's callsign
+        grid (str): Grid square it was last heard from, upper case
+        lat, lon (float): Centre of that grid square
+        utc (int): When it was last heard, UTC milliseconds
+        snr (int): SNR of the last report, or None
+    """
+
+    __slots__ = ('callsign', 'grid', 'lat', 'lon', 'utc', 'snr')
+
+    def __init__(self, callsign: str, grid: str, lat: float, lon: float, utc: int, snr: Optional[int]):
+        self.callsign = callsign
+        self.grid = grid
+        self.lat = lat
+        self.lon = lon
+        self.utc = utc
+        self.snr = snr
+
+    def __repr__(self) -> str:
+        return f"StationEntry({self.callsign!r}, grid={self.grid!r}, utc={self.utc}, snr={self.snr})"
+
+
+class _Node:
+    """
+    A trie node: the root, or a grid cell.
+
+    ``child_points`` caches the children and the unit vectors of their
+    centres as arrays and is reset when a child is added or removed.
+    """
+
+    __slots__ = ('children', 'child_points')
+
+    def __init__(self):
+        self.children: Dict[str, '_Cell'] = {}
+        self.child_points: Optional[Tuple[Any, ...]] = None
+
+
+class _Cell(_Node):
+    """
+    One node of the grid trie: a field, square, subsquare or extended square.
+
+    ``stations`` holds every callsign in the cell and its sub-cells, so a
+    cell that lies entirely inside a query is answered without descending;
+    ``here`` holds only the stations whose grid is exactly this cell.
+    ``members`` caches the StationEntry objects of ``stations`` and
+    ``points`` their positions as arrays; both are reset whenever the
+    stations change.
+    """
+
+    __slots__ = ('prefix', 'depth', 'lat', 'lon', 'vector', 'south', 'west', 'north', 'east',
+                 'stations', 'here', 'members', 'points')
+
+    def __init__(self, prefix: str):
+        super().__init__()
+        self.prefix = prefix
+        self.depth = depth = len(prefix) // 2 - 1
+        self.lat, self.lon = grid_centroid(prefix)
+        # Centre as a unit vector, for the radius query
+        self.vector = _unit_vector(self.lat, self.lon)
+        half_lat, half_lon = _LAT_SIZES[depth] / 2, _LON_SIZES[depth] / 2
+        self.south, self.north = self.lat - half_lat, self.lat + half_lat
+        self.west, self.east = self.lon - half_lon, self.lon + half_lon
+        self.stations: Set[str] = set()
+        self.here: Set[str] = set()
+        self.members: Optional[List[StationEntry]] = None
+        self.points: Optional[Tuple[Any, ...]] = None
+
+
+class StationIndex:
+    """
+    In-memory spatial index of heard stations, keyed by Maidenhead grid.
+
+    Stations are kept in a trie of grid prefixes (field, square, subsquare
+    and, when reported, extended square), each cell with a precomputed
+    centre and extent. Radius and bounding-box queries prune whole fields
+    and squares that are out of range and take cells that are entirely in
+    range without looking at their stations one by one, so their cost grows
+    with the number of matching stations rather than the size of the index.
+    Grid prefix queries are a walk down the trie.
+
+    Each callsign appears once, at the grid it was last heard from. Entries
+    not heard for max_age seconds are evicted.
+
+        index = StationIndex(max_age=6 * 3600)
+        index.attach(api)
+        index.add_call_activity(api.get_call_activity())
+        half_hour_ago = int(time.time() * 1000) - 30 * 60 * 1000
+        nearby = index.within_radius('FN42', 500, since=half_hour_ago)
+    """
+
+    def __init__(self, max_age: float = 86400, evict_interval: float = 60):
+        """
+        Args:
+            max_age (float): Seconds after which a station not heard again is evicted (default: 1 day)
+            evict_interval (float): Minimum seconds between automatic evictions (default: 60)
+        """
+        self.max_age = max_age
+        self.evict_interval = evict_interval
+        self._lock = threading.RLock()
+        self._entries: Dict[str, StationEntry] = {}
+        self._root = _Node()
+        # (utc, callsign) per update; stale items are skipped when popped
+        self._expiry: List[Tuple[int, str]] = []
+        self._last_evict = 0.0
+        self._subscriptions: List[Any] = []
+
+    # -- updates -------------------------------------------------------------
+
+    def _path(self, grid: str) -> List[_Cell]:
+        """The cells from the field down to grid, created as needed."""
+        cells = []
+        node = self._root
+        for end in range(2, len(grid) + 1, 2):
+            prefix = grid[:end]
+            cell = node.children.get(prefix)
+            if cell is None:
+                cell = node.children[prefix] = _Cell(prefix)
+                node.child_points = None
+            cells.append(cell)
+            node = cell
+        return cells
+
+    def _unlink(self, entry: StationEntry) -> None:
+        node, parents = self._root, []
+        for end in range(2, len(entry.grid) + 1, 2):
+            cell = node.children[entry.grid[:end]]
+            cell.stations.discard(entry.callsign)
+            cell.members = cell.points = None
+            parents.append((node, cell))
+            node = cell
+        parents[-1][1].here.discard(entry.callsign)
+        # Drop cells left empty, deepest first
+        for node, cell in reversed(parents):
+            if cell.stations:
+                break
+            del node.children[cell.prefix]
+            node.child_points = None
+
+    def update(self, callsign: str, grid: str = '', utc: Optional[int] = None,
+               snr: Optional[int] = None) -> Optional[StationEntry]:
+        """
+        Add a station or record that it was heard again.
+
+        Args:
+            callsign (str): The station's callsign
+            grid (str): Grid square it was heard from; empty keeps the previous grid
+            utc (int, optional): When it was heard, UTC milliseconds (default: now)
+            snr (int, optional): SNR of the report
+
+        Returns:
+            StationEntry: The entry, or None if the station has no valid grid yet
+        """
+        if not callsign:
+            return None
+        utc = _now_ms() if utc is None else utc
+        grid = (grid or '').strip().upper()
+        if grid and grid_centroid(grid) is None:
+            grid = ''
+        with self._lock:
+            entry = self._entries.get(callsign)
+            if entry is None:
+                if not grid:
+                    return None
+                lat, lon = grid_centroid(grid)
+                entry = self._entries[callsign] = StationEntry(callsign, grid, lat, lon, utc, snr)
+            else:
+                if utc < entry.utc:
+                    return entry
+                if grid and grid != entry.grid:
+                    self._unlink(entry)
+                    entry.grid = grid
+                    entry.lat, entry.lon = grid_centroid(grid)
+                else:
+                    grid = ''
+                entry.utc = utc
+                if snr is not None:
+                    entry.snr = snr
+            if grid:
+                cells = self._path(grid)
+                for cell in cells:
+                    cell.stations.add(callsign)
+                    cell.members = cell.points = None
+                cells[-1].here.add(callsign)
+            heapq.heappush(self._expiry, (utc, callsign))
+            self._maybe_evict()
+            return entry
+
+    def remove(self, callsign: str) -> bool:
+        """Remove a station. Returns True if it was indexed."""
+        with self._lock:
+            entry = self._entries.pop(callsign, None)
+            if entry is None:
+                return False
+            self._unlink(entry)
+            return True
+
+    def add_spot(self, spot: Any) -> None:
+        """Index an RX.SPOT (params dict or Spot record)."""
+        if isinstance(spot, Mapping):
+            spot = Spot.from_params(spot)
+        self.update(spot.call, spot.grid, spot.utc or None, spot.snr)
+
+    def add_directed(self, message: Any) -> None:
+        """Index the sender of an RX.DIRECTED (params dict or DirectedMessage record)."""
+        if isinstance(message, Mapping):
+            message = DirectedMessage.from_params(message)
+        self.update(message.from_call, message.grid, message.utc or None, message.snr)
+
+    def add_call_activity(self, activity: Mapping[str, Any]) -> None:
+        """Index every entry of get_call_activity() output (dicts or records)."""
+        for call, entry in activity.items():
+            if isinstance(entry, Mapping):
+                self.update(call, entry.get('GRID') or '', entry.get('UTC') or None, entry.get('SNR'))
+            else:
+                self.update(call, entry.grid, entry.utc or None, entry.snr)
+
+    def attach(self, api: Any) -> List[Any]:
+        """
+        Index every RX.SPOT and RX.DIRECTED a client receives.
+
+        Returns:
+            list: The subscriptions; pass them to api.off() to stop indexing
+        """
+        subscriptions = [
+            api.on('RX.SPOT', lambda message: self.add_spot(message.get('params') or {})),
+            api.on('RX.DIRECTED', lambda message: self.add_directed(message.get('params') or {})),
+        ]
+        self._subscriptions.extend(subscriptions)
+        return subscriptions
+
+    # -- eviction ------------------------------------------------------------
+
+    def evict(self, now: Optional[int] = None) -> int:
+        """
+        Remove stations not heard for max_age seconds.
+
+        Args:
+            now (int, optional): Reference time in UTC milliseconds (default: now)
+
+        Returns:
+            int: Number of stations removed
+        """
+        cutoff = (_now_ms() if now is None else now) - int(self.max_age * 1000)
+        removed = 0
+        with self._lock:
+            expiry = self._expiry
+            while expiry and expiry[0][0] < cutoff:
+                utc, callsign = heapq.heappop(expiry)
+                entry = self._entries.get(callsign)
+                if entry is not None and entry.utc == utc:
+                    del self._entries[callsign]
+                    self._unlink(entry)
+                    removed += 1
+            # Re-reports leave stale heap items behind; rebuild when they dominate
+            if len(expiry) > 4 * len(self._entries) + 1024:
+                self._expiry = [(entry.utc, call) for call, entry in self._entries.items()]
+                heapq.heapify(self._expiry)
+            self._last_evict = time.monotonic()
+        return removed
+
+    def _maybe_evict(self) -> None:
+        if time.monotonic() - self._last_evict >= self.evict_interval:
+            self.evict()
+
+    # -- queries -------------------------------------------------------------
+
+    @staticmethod
+    def _since(entries: List[StationEntry], since: Optional[int]) -> List[StationEntry]:
+        if since is None:
+            return entries
+        return [entry for entry in entries if entry.utc >= since]
+
+    def _members(self, cell: _Cell) -> List[StationEntry]:
+        """Entries of every station in a cell, cached."""
+        if cell.members is None:
+            cell.members = list(map(self._entries.__getitem__, cell.stations))
+        return cell.members
+
+    def _points(self, cell: _Cell) -> Tuple[Any, ...]:
+        """(entries, lat, lon, unit vectors) arrays of every station in a cell, cached."""
+        if cell.points is None:
+            members = self._members(cell)
+            entries = np.empty(len(members), dtype=object)
+            entries[:] = members
+            lat = np.fromiter((entry.lat for entry in members), dtype='float64', count=len(members))
+            lon = np.fromiter((entry.lon for entry in members), dtype='float64', count=len(members))
+            phi, lmb = np.radians(lat), np.radians(lon)
+            vectors = np.column_stack((np.cos(phi) * np.cos(lmb), np.cos(phi) * np.sin(lmb), np.sin(phi)))
+            cell.points = (entries, lat, lon, vectors)
+        return cell.points
+
+    @staticmethod
+    def _child_points(node: _Node) -> Tuple[Any, ...]:
+        """(cells, unit vectors of their centres) of a node's children, cached."""
+        if node.child_points is None:
+            cells = list(node.children.values())
+            node.child_points = (cells, np.array([cell.vector for cell in cells], dtype='float64'))
+        return node.child_points
+
+    def get(self, callsign: str) -> Optional[StationEntry]:
+        """Return the entry for a callsign, or None."""
+        return self._entries.get(callsign)
+
+    def with_prefix(self, prefix: str, since: Optional[int] = None) -> List[StationEntry]:
+        """
+        Stations whose grid starts with prefix.
+
+        Args:
+            prefix (str): Grid prefix, e.g. 'FN', 'FN4' or 'FN42'
+            since (int, optional): Only stations heard at or after this UTC millisecond time
+        """
+        prefix = prefix.strip().upper()
+        if not prefix:
+            return []
+        with self._lock:
+            self._maybe_evict()
+            node = self._root
+            whole = len(prefix) - len(prefix) % 2
+            for end in range(2, whole + 1, 2):
+                node = node.children.get(prefix[:end])
+                if node is None:
+                    return []
+            if whole == len(prefix):
+                return self._since(list(self._members(node)), since)
+            # Odd length: the cells one level down whose names start with the prefix
+            found = []
+            for name, cell in node.children.items():
+                if name.startswith(prefix):
+                    found.extend(self._members(cell))
+            return self._since(found, since)
+
+    def within_radius(self, center: Any, radius_km: float, since: Optional[int] = None) -> List[StationEntry]:
+        """
+        Stations within radius_km of a point, measured to the centre of their grid.
+
+        Args:
+            center (str or tuple): Grid square, or (lat, lon) in degrees
+            radius_km (float): Search radius in km
+            since (int, optional): Only stations heard at or after this UTC millisecond time
+
+        Raises:
+            ValueError: If center is not a valid grid square
+        """
+        if isinstance(center, str):
+            point = grid_centroid(center.strip())
+            if point is None:
+                raise ValueError(f"Invalid grid square: {center!r}")
+        else:
+            point = (float(center[0]), float(center[1]))
+        x0, y0, z0 = origin = _unit_vector(point[0], point[1])
+        # Compare dot products of unit vectors instead of distances: a cell is out of range when
+        # even its nearest possible point is beyond the radius, wholly in range when its farthest is within
+        outside = [_cos_distance(radius_km + radius) for radius in _CELL_RADII]
+        inside = [_cos_distance(radius_km - radius) if radius_km > radius else 2.0 for radius in _CELL_RADII]
+        limit = _cos_distance(radius_km)
+        vectorize = np is not None
+        if vectorize:
+            origin = np.array(origin)
+        found: List[StationEntry] = []
+
+        def take(cell: _Cell, dot: float) -> bool:
+            """Collect a cell that is not out of range; return True if its children still need a look."""
+            if dot >= inside[cell.depth]:
+                found.extend(self._members(cell))
+                return False
+            count = len(cell.stations)
+            if vectorize and _VECTOR_MIN <= count and (count <= _SCAN_MAX or not cell.children):
+                entries, _, _, vectors = self._points(cell)
+                found.extend(entries[vectors @ origin >= limit].tolist())
+                return False
+            if dot >= limit:
+                found.extend(map(self._entries.__getitem__, cell.here))
+            return True
+
+        def visit(node: _Node) -> None:
+            children = node.children
+            if vectorize and len(children) >= _VECTOR_MIN:
+                cells, vectors = self._child_points(node)
+                dots = vectors @ origin
+                near = np.flatnonzero(dots >= outside[cells[0].depth])
+                for i, dot in zip(near.tolist(), dots[near].tolist()):
+                    if take(cells[i], dot):
+                        visit(cells[i])
+                return
+            for cell in children.values():
+                x, y, z = cell.vector
+                dot = x * x0 + y * y0 + z * z0
+                if dot >= outside[cell.depth] and take(cell, dot):
+                    visit(cell)
+
+        with self._lock:
+            self._maybe_evict()
+            visit(self._root)
+            return self._since(found, since)
+
+    def within_bbox(self, south: float, west: float, north: float, east: float,
+                    since: Optional[int] = None) -> List[StationEntry]:
+        """
+        Stations whose grid centre lies in a latitude/longitude box.
+
+        A box with west > east crosses the antimeridian.
+
+        Args:
+            south, west, north, east (float): Box edges in degrees
+            since (int, optional): Only stations heard at or after this UTC millisecond time
+        """
+        spans = [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+        vectorize = np is not None
+        found: List[StationEntry] = []
+
+        def visit(cells: Iterable[_Cell], lo: float, hi: float) -> None:
+            for cell in cells:
+                if cell.north < south or cell.south > north or cell.east < lo or cell.west > hi:
+                    continue
+                if south <= cell.south and cell.north <= north and lo <= cell.west and cell.east <= hi:
+                    found.extend(self._members(cell))
+                    continue
+                if vectorize and cell.depth and len(cell.stations) >= _VECTOR_MIN:
+                    entries, lat, lon = self._points(cell)[:3]
+                    found.extend(entries[(lat >= south) & (lat <= north) & (lon >= lo) & (lon <= hi)].tolist())
+                    continue
+                if south <= cell.lat <= north and lo <= cell.lon <= hi:
+                    found.extend(map(self._entries.__getitem__, cell.here))
+                visit(cell.children.values(), lo, hi)
+
+        with self._lock:
+            self._maybe_evict()
+            for lo, hi in spans:
+                visit(self._root.children.values(), lo, hi)
+            if len(spans) > 1:
+                # A cell on the antimeridian can match both spans
+                found = list({id(entry): entry for entry in found}.values())
+            return self._since(found, since)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, callsign: str) -> bool:
+        return callsign in self._entries
+
+    def close(self) -> None:
+        """Cancel the subscriptions made by attach()."""
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions = []
@@ -0,0 +1,104 @@
+import threading
+from typing import Any, Dict, Optional
+
+
+class StateMirror:
+    """
+    Local copy of JS8Call station state kept current from received messages.
+
+    Every message the client receives, whether a response to one of its own
+    requests or a notification JS8Call pushes on its own (RIG.FREQ, RIG.PTT,
+    MODE.SPEED, RX.CALL_SELECTED, TX.FRAME, ...), is passed to update(). The
+    getters of JS8CallAPI then answer from here without a network round trip
+    while the value is known, and fall back to the network once a setter has
+    invalidated it.
+
+    Keys:
+        frequency (dict): {'freq': int, 'dial': int, 'offset': int}
+        speed (int): Current speed mode
+        ptt (bool): True while transmitting
+        selected_call (str): Callsign selected in the UI
+        callsign (str): Station callsign
+        grid (str): Station grid locator
+        status (str): Station status text
+        station_info (str): Station information text
+        tx_frame (dict): Last TX.FRAME params
+    """
+
+    KEYS = ('frequency', 'speed', 'ptt', 'selected_call', 'callsign',
+            'grid', 'status', 'station_info', 'tx_frame')
+
+    # Message types update() looks at
+    TYPES = frozenset(('RIG.FREQ', 'MODE.SPEED', 'RIG.PTT', 'RX.CALL_SELECTED', 'STATION.CALLSIGN',
+                       'STATION.GRID', 'STATION.STATUS', 'STATION.INFO', 'TX.FRAME'))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Any] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the mirrored value, or None if it is unknown or invalidated."""
+        return self._values.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value."""
+        with self._lock:
+            self._values[key] = value
+
+    def invalidate(self, *keys: str) -> None:
+        """Forget the given keys, or everything when called without arguments."""
+        with self._lock:
+            if not keys:
+                self._values.clear()
+            for key in keys:
+                self._values.pop(key, None)
+
+    def seed(self, snapshot: Dict[str, Any]) -> None:
+        """Load every value from a JS8CallAPI.get_snapshot() result."""
+        with self._lock:
+            for key, value in snapshot.items():
+                if key in self.KEYS:
+                    self._values[key] = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of every value currently known."""
+        with self._lock:
+            return dict(self._values)
+
+    def update(self, message: Dict[str, Any]) -> None:
+        """Apply a message received from JS8Call."""
+        msg_type = message.get('type')
+        params = message.get('params')
+        if not isinstance(params, dict):
+            params = {}
+        value = message.get('value', '')
+
+        if msg_type == 'RIG.FREQ':
+            if 'DIAL' in params or 'FREQ' in params:
+                self.set('frequency', {
+                    'freq': params.get('FREQ', 0),
+                    'dial': params.get('DIAL', 0),
+                    'offset': params.get('OFFSET', 0)
+                })
+        elif msg_type == 'MODE.SPEED':
+            if 'SPEED' in params:
+                self.set('speed', params['SPEED'])
+        elif msg_type == 'RIG.PTT':
+            if 'PTT' in params:
+                self.set('ptt', bool(params['PTT']))
+            elif isinstance(value, str) and value:
+                self.set('ptt', value.lower() == 'on')
+        elif msg_type == 'RX.CALL_SELECTED':
+            self.set('selected_call', value)
+        elif msg_type == 'STATION.CALLSIGN':
+            self.set('callsign', value)
+        elif msg_type == 'STATION.GRID':
+            self.set('grid', value)
+        elif msg_type == 'STATION.STATUS':
+            self.set('status', value)
+        elif msg_type == 'STATION.INFO':
+            self.set('station_info', value)
+        elif msg_type == 'TX.FRAME':
+            frame = {k: v for k, v in params.items() if k != '_ID'}
+            if frame:
+                self.set('tx_frame', frame)
@@ -0,0 +1,460 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .delta import ActivityTracker
+from .records import DirectedMessage, Spot
+
+# Set up logging - but don't display to console by default
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Create null handler to avoid messages being printed to console
+logger.addHandler(logging.NullHandler())
+
+# Amateur band edges in Hz (widest ITU region limits)
+BAND_EDGES = (
+    ('160m', 1800000, 2000000),
+    ('80m', 3500000, 4000000),
+    ('60m', 5250000, 5450000),
+    ('40m', 7000000, 7300000),
+    ('30m', 10100000, 10150000),
+    ('20m', 14000000, 14350000),
+    ('17m', 18068000, 18168000),
+    ('15m', 21000000, 21450000),
+    ('12m', 24890000, 24990000),
+    ('10m', 28000000, 29700000),
+    ('6m', 50000000, 54000000),
+    ('2m', 144000000, 148000000),
+)
+
+
+def band_for_frequency(freq: Any) -> str:
+    """
+    Return the amateur band name for a frequency in Hz.
+
+    Args:
+        freq (int): Frequency in Hz
+
+    Returns:
+        str: Band name such as '20m', or '' if outside the amateur bands
+    """
+    if not isinstance(freq, (int, float)):
+        return ''
+    for band, low, high in BAND_EDGES:
+        if low <= freq <= high:
+            return band
+    return ''
+
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS heard (
+        call TEXT NOT NULL,
+        grid TEXT NOT NULL DEFAULT '',
+        field TEXT NOT NULL DEFAULT '',
+        band TEXT NOT NULL DEFAULT '',
+        snr INTEGER,
+        freq INTEGER,
+        utc INTEGER NOT NULL,
+        source TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS messages (
+        from_call TEXT NOT NULL,
+        to_call TEXT NOT NULL DEFAULT '',
+        cmd TEXT NOT NULL DEFAULT '',
+        text TEXT NOT NULL DEFAULT '',
+        grid TEXT NOT NULL DEFAULT '',
+        band TEXT NOT NULL DEFAULT '',
+        snr INTEGER,
+        freq INTEGER,
+        utc INTEGER NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS heard_call_utc ON heard (call, utc)",
+    "CREATE INDEX IF NOT EXISTS heard_grid ON heard (grid)",
+    "CREATE INDEX IF NOT EXISTS heard_field_utc ON heard (field, utc)",
+    "CREATE INDEX IF NOT EXISTS heard_band_utc ON heard (band, utc)",
+    "CREATE INDEX IF NOT EXISTS heard_utc ON heard (utc)",
+    "CREATE INDEX IF NOT EXISTS messages_from_utc ON messages (from_call, utc)",
+    "CREATE INDEX IF NOT EXISTS messages_to_utc ON messages (to_call, utc)",
+    "CREATE INDEX IF NOT EXISTS messages_utc ON messages (utc)",
+)
+
+_INSERT = {
+    'heard': "INSERT INTO heard (call, grid, field, band, snr, freq, utc, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    'messages': ("INSERT INTO messages (from_call, to_call, cmd, text, grid, band, snr, freq, utc) "
+                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"),
+}
+
+# Queue item that asks the writer to commit and signal the attached event
+_FLUSH = 'flush'
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class StationDatabase:
+    """
+    SQLite log of heard stations and directed messages.
+
+    Inserts are queued and written by a background thread in batches, one
+    transaction per batch, so logging from a JS8CallAPI event callback never
+    waits on disk. The database runs in WAL mode, so queries from other
+    threads (or processes) do not block the writer. Rows older than the
+    retention window are purged periodically.
+
+    Every sighting (spot, directed message or call activity entry) becomes a
+    row in ``heard``; directed messages are also kept with their text in
+    ``messages``. Times are UTC milliseconds, as reported by JS8Call.
+
+        db = StationDatabase('heard.db')
+        db.attach(api)                 # log every RX.SPOT and RX.DIRECTED
+        db.record_call_activity(api)   # log call activity changes since the last poll
+        print(db.last_heard('K1ABC'))
+    """
+
+    def __init__(self, path: str, retention: Optional[float] = 30 * 86400, batch_size: int = 500,
+                 flush_interval: float = 1.0, max_queue: int = 100000, purge_interval: float = 300.0):
+        """
+        Open (or create) the database and start the writer thread.
+
+        Args:
+            path (str): Database file path
+            retention (float, optional): Seconds of history to keep, None to keep everything
+                (default: 30 days)
+            batch_size (int): Most rows written per transaction (default: 500)
+            flush_interval (float): Longest time a queued row waits before being written (default: 1.0)
+            max_queue (int): Rows that may wait for the writer; further rows are dropped and
+                counted in ``dropped`` (default: 100000)
+            purge_interval (float): Seconds between retention purges (default: 300)
+        """
+        self.path = path
+        self.retention = retention
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.purge_interval = purge_interval
+        self.dropped = 0
+        self.written = 0
+
+        conn = self._open()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        conn.close()
+
+        self._read_conn = self._open(check_same_thread=False)
+        self._read_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._subscriptions: List[Any] = []
+        # The database's own call activity tracker per client, so other delta consumers do not steal changes
+        self._trackers: 'weakref.WeakKeyDictionary[Any, ActivityTracker]' = weakref.WeakKeyDictionary()
+        self._closed = False
+        self._writer = threading.Thread(target=self._writer_loop, name="JS8CallAPI-storage", daemon=True)
+        self._writer.start()
+
+    def _open(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=check_same_thread)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # -- writing -------------------------------------------------------------
+
+    def _enqueue(self, table: str, row: Tuple[Any, ...]) -> None:
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait((table, row))
+        except queue.Full:
+            self.dropped += 1
+
+    def _heard(self, call: str, grid: str, snr: Any, freq: Any, utc: Any, source: str) -> None:
+        if not call:
+            return
+        grid = grid or ''
+        # Stored upper case, as the queries look callsigns up
+        self._enqueue('heard', (call.upper(), grid, grid[:2].upper(), band_for_frequency(freq),
+                                snr, freq, utc or _now_ms(), source))
+
+    def add_spot(self, spot: Any) -> None:
+        """
+        Queue an RX.SPOT for writing.
+
+        Args:
+            spot (dict or Spot): The spot params (CALL, GRID, SNR, FREQ, UTC) or a Spot record
+        """
+        if not isinstance(spot, Spot):
+            spot = Spot.from_params(spot)
+        self._heard(spot.call, spot.grid, spot.snr, spot.freq, spot.utc, 'spot')
+
+    def add_directed(self, message: Any) -> None:
+        """
+        Queue an RX.DIRECTED message for writing.
+
+        Args:
+            message (dict or DirectedMessage): The message params or a DirectedMessage record
+        """
+        if not isinstance(message, DirectedMessage):
+            message = DirectedMessage.from_params(message)
+        utc = message.utc or _now_ms()
+        self._heard(message.from_call, message.grid, message.snr, message.freq, utc, 'directed')
+        self._enqueue('messages', (message.from_call.upper(), message.to.upper(), message.cmd, message.text,
+                                   message.grid, band_for_frequency(message.freq), message.snr, message.freq, utc))
+
+    def add_call_activity(self, activity: Mapping[str, Any], dial: Optional[int] = None) -> None:
+        """
+        Queue call activity entries for writing.
+
+        Args:
+            activity (dict): Callsigns mapped to their details, as returned by
+                get_call_activity() (dicts or CallActivityEntry records)
+            dial (int, optional): Dial frequency in Hz, used to file the entries under a band
+        """
+        for call, entry in activity.items():
+            if isinstance(entry, Mapping):
+                grid, snr, utc = entry.get('GRID', ''), entry.get('SNR'), entry.get('UTC')
+            else:
+                grid, snr, utc = entry.grid, entry.snr, entry.utc
+            self._heard(call, grid, snr, dial, utc, 'activity')
+
+    def attach(self, api: Any) -> List[Any]:
+        """
+        Log every RX.SPOT and RX.DIRECTED a client receives.
+
+        The callbacks only queue rows, so they add no disk I/O to the
+        client's reader.
+
+        Args:
+            api (JS8CallAPI): A connected client
+
+        Returns:
+            list: The subscriptions; pass them to api.off() to stop logging
+        """
+        subscriptions = [
+            api.on('RX.SPOT', lambda message: self.add_spot(message.get('params') or {})),
+            api.on('RX.DIRECTED', lambda message: self.add_directed(message.get('params') or {})),
+        ]
+        self._subscriptions.extend(subscriptions)
+        return subscriptions
+
+    def record_call_activity(self, api: Any) -> int:
+        """
+        Log the call activity entries that changed since the previous call.
+
+        Uses api.get_call_activity_delta() with a tracker owned by the
+        database, so only added and updated stations are written and other
+        delta consumers of the same client do not affect what is logged.
+
+        Args:
+            api (JS8CallAPI): A connected client
+
+        Returns:
+            int: Number of entries queued
+        """
+        tracker = self._trackers.get(api)
+        if tracker is None:
+            tracker = self._trackers[api] = api.activity_tracker()
+        delta = api.get_call_activity_delta(tracker=tracker)
+        changed = dict(delta.added)
+        changed.update(delta.updated)
+        if changed:
+            self.add_call_activity(changed, api.get_frequency().get('dial'))
+        return len(changed)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every row queued so far is committed.
+
+        Returns:
+            bool: True if the writer caught up within the timeout
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def _writer_loop(self) -> None:
+        conn = self._open()
+        next_purge = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = None
+                batch: Dict[str, List[Tuple[Any, ...]]] = {}
+                waiters = []
+                stop = False
+                count = 0
+                while item is not None:
+                    table, row = item
+                    if table == _FLUSH:
+                        waiters.append(row)
+                    elif table is None:
+                        stop = True
+                        break
+                    else:
+                        batch.setdefault(table, []).append(row)
+                        count += 1
+                    if count >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        item = None
+                if batch:
+                    self._write(conn, batch)
+                    self.written += count
+                if self.retention is not None and time.monotonic() >= next_purge:
+                    self._purge(conn)
+                    next_purge = time.monotonic() + self.purge_interval
+                for waiter in waiters:
+                    waiter.set()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, batch: Dict[str, List[Tuple[Any, ...]]]) -> None:
+        try:
+            with conn:
+                for table, rows in batch.items():
+                    conn.executemany(_INSERT[table], rows)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write {sum(len(rows) for rows in batch.values())} rows: {e}")
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        cutoff = _now_ms() - int(self.retention * 1000)
+        try:
+            with conn:
+                conn.execute("DELETE FROM heard WHERE utc < ?", (cutoff,))
+                conn.execute("DELETE FROM messages WHERE utc < ?", (cutoff,))
+        except sqlite3.Error as e:
+            logger.error(f"Retention purge failed: {e}")
+
+    def purge(self) -> None:
+        """Delete rows older than the retention window now."""
+        if self.retention is None:
+            return
+        self.flush()
+        with self._read_lock:
+            self._purge(self._read_conn)
+
+    # -- queries -------------------------------------------------------------
+
+    def _query(self, sql: str, args: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        with self._read_lock:
+            cursor = self._read_conn.execute(sql, args)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def last_heard(self, callsign: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent sighting of a station.
+
+        Returns:
+            dict or None: {'call', 'grid', 'band', 'snr', 'freq', 'utc', 'source'}
+        """
+        rows = self._query("SELECT call, grid, band, snr, freq, utc, source FROM heard "
+                           "WHERE call = ? ORDER BY utc DESC LIMIT 1", (callsign.upper(),))
+        return rows[0] if rows else None
+
+    def best_snr(self, since: Optional[int] = None, until: Optional[int] = None,
+                 band: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the strongest stations in a time window, one row per callsign.
+
+        Args:
+            since (int, optional): Start of the window, UTC milliseconds (default: one hour ago)
+            until (int, optional): End of the window, UTC milliseconds (default: now)
+            band (str, optional): Only this band, e.g. '20m'
+            limit (int): Most stations returned (default: 10)
+
+        Returns:
+            list: [{'call', 'snr', 'grid', 'band', 'utc'}, ...], strongest first
+        """
+        now = _now_ms()
+        args: List[Any] = [now - 3600000 if since is None else since, now if until is None else until]
+        sql = "SELECT call, MAX(snr) AS snr, grid, band, utc FROM heard WHERE utc BETWEEN ? AND ? AND snr IS NOT NULL"
+        if band:
+            sql += " AND band = ?"
+            args.append(band)
+        sql += " GROUP BY call ORDER BY snr DESC LIMIT ?"
+        args.append(limit)
+        return self._query(sql, args)
+
+    def stations_in_grid(self, prefix: str, since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get every station heard in a grid field or square.
+
+        Args:
+            prefix (str): Grid prefix of at least the 2-character field, e.g. 'FN' or 'FN42'
+            since (int, optional): Only sightings after this UTC millisecond timestamp
+
+        Returns:
+            list: [{'call', 'grid', 'last_utc', 'best_snr', 'count'}, ...], most recent first
+
+        Raises:
+            ValueError: If the prefix is shorter than a grid field
+        """
+        if len(prefix) < 2:
+            raise ValueError("Grid prefix must include at least the 2-character field")
+        sql = ("SELECT call, grid, MAX(utc) AS last_utc, MAX(snr) AS best_snr, COUNT(*) AS count "
+               "FROM heard WHERE field = ?")
+        args: List[Any] = [prefix[:2].upper()]
+        if len(prefix) > 2:
+            sql += " AND grid LIKE ?"
+            args.append(prefix.replace('%', '').replace('_', '') + '%')
+        if since is not None:
+            sql += " AND utc >= ?"
+            args.append(since)
+        sql += " GROUP BY call ORDER BY last_utc DESC"
+        return self._query(sql, args)
+
+    def messages(self, callsign: Optional[str] = None, since: Optional[int] = None,
+                 limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get logged directed messages, newest first.
+
+        Args:
+            callsign (str, optional): Only messages from or to this callsign
+            since (int, optional): Only messages after this UTC millisecond timestamp
+            limit (int): Most messages returned (default: 100)
+        """
+        sql = "SELECT from_call, to_call, cmd, text, grid, band, snr, freq, utc FROM messages WHERE 1"
+        args: List[Any] = []
+        if callsign:
+            sql += " AND (from_call = ? OR to_call = ?)"
+            args += [callsign.upper(), callsign.upper()]
+        if since is not None:
+            sql += " AND utc >= ?"
+            args.append(since)
+        sql += " ORDER BY utc DESC LIMIT ?"
+        args.append(limit)
+        return self._query(sql, args)
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def close(self) -> None:
+        """Write everything still queued, stop the writer and close the database."""
+        if self._closed:
+            return
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions = []
+        self._closed = True
+        self._queue.put((None, None))
+        self._writer.join()
+        with self._read_lock:
+            self._read_conn.close()
+
+    def __enter__(self) -> 'StationDatabase':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
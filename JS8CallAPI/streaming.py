@@ -0,0 +1,118 @@
+import codecs
+import json
+import re
+from typing import Any, Iterator, Optional, Union
+
+from .records import InboxMessage
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DELIMITER = re.compile(r'[ \t\n\r]*[,\]]')
+
+# Bytes decoded to text per step; the window holds about this much text at a time
+WINDOW_BYTES = 64 * 1024
+
+
+def iter_json_array(payload: Union[bytes, bytearray, memoryview, str], key: str,
+                    window_bytes: int = WINDOW_BYTES) -> Iterator[Any]:
+    """
+    Yield the elements of the first array stored under ``key``, one at a time.
+
+    The payload is not decoded to text as a whole. Bytes are decoded into a
+    sliding text window of about ``window_bytes``, elements are parsed from
+    the window, and the consumed text is dropped, so the caller holds one
+    window and one decoded element next to the payload itself. A quote
+    cannot appear unescaped inside a JSON string, so ``"key":`` can only
+    match a real object key, never message text.
+
+    Args:
+        payload (bytes, bytearray or memoryview): A complete JSON document, e.g. one response line
+        key (str): Object key whose array value to iterate, e.g. 'MESSAGES'
+        window_bytes (int): Bytes decoded per step (default: WINDOW_BYTES)
+
+    Yields:
+        The decoded array elements, in order
+
+    Raises:
+        ValueError: If the array is malformed or truncated
+    """
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    match = re.search(rb'"%s"\s*:\s*\[' % re.escape(key.encode('utf-8')), payload)
+    if match is None:
+        return
+    view = memoryview(payload)
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    position = match.end()
+    text = ''
+    index = 0
+
+    def more(size: int) -> bool:
+        # Drop consumed text and decode the next block of bytes onto the window
+        nonlocal text, index, position
+        if position >= len(view):
+            return False
+        end = min(position + size, len(view))
+        text = text[index:] + utf8.decode(view[position:end], end == len(view))
+        index = 0
+        position = end
+        return True
+
+    def skip_space() -> str:
+        # Skip whitespace and return the next character, or '' at the end of the payload
+        nonlocal index
+        while True:
+            index = _WHITESPACE.match(text, index).end()
+            if index < len(text) or not more(window_bytes):
+                return text[index:index + 1]
+
+    if skip_space() == ']':
+        return
+    while True:
+        size = window_bytes
+        while True:
+            try:
+                element, end = _decoder.raw_decode(text, index)
+            except ValueError:
+                # The element may run past the window: widen it and retry
+                if not more(size):
+                    raise
+                size *= 2
+                continue
+            # A number cut at the window edge parses short, so only accept it once a delimiter follows
+            if _DELIMITER.match(text, end) or not more(size):
+                break
+        index = end
+        yield element
+        char = skip_space()
+        if char == ',':
+            index += 1
+            skip_space()
+        elif char == ']':
+            return
+        else:
+            raise ValueError(f"Expected ',' or ']' in {key} array")
+
+
+def iter_inbox_payload(raw: bytes, max_bytes: Optional[int] = None, as_records: bool = False) -> Iterator[Any]:
+    """
+    Iterate over the messages of a raw INBOX.MESSAGES response line.
+
+    Messages are decoded from the bytes one by one; the line is never
+    decoded to text as a whole.
+
+    Args:
+        raw (bytes): The response line, e.g. from send_message_raw("INBOX.GET_MESSAGES")
+        max_bytes (int, optional): Refuse responses larger than this many bytes
+        as_records (bool): Yield InboxMessage records instead of dicts (default: False)
+
+    Raises:
+        ValueError: If the response is larger than max_bytes
+    """
+    if max_bytes is not None and len(raw) > max_bytes:
+        raise ValueError(f"Inbox response of {len(raw)} bytes exceeds max_bytes={max_bytes}")
+    messages = iter_json_array(raw, 'MESSAGES')
+    if as_records:
+        return (InboxMessage.from_params(message.get('params') or {}, type=message.get('type', ''))
+                for message in messages)
+    return messages
@@ -0,0 +1,314 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .airtime import SPEED_PERIODS, frame_count
+from .core import JS8CallAPI
+
+# Set up logging - but don't display to console by default
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.ERROR)
+# Create null handler to avoid messages being printed to console
+logger.addHandler(logging.NullHandler())
+
+
+def message_destination(text: str) -> str:
+    """Return the callsign or @GROUP a message is addressed to (its first word), upper-cased."""
+    words = text.split(None, 1)
+    return words[0].rstrip(':').upper() if words else ''
+
+
+class QueuedMessage(Future):
+    """
+    A message waiting in a TransmitQueue.
+
+    It is a concurrent.futures.Future: result() returns the time.time()
+    at which the message was handed to JS8Call, and cancel() removes it
+    from the queue if it has not been sent yet.
+
+    Attributes:
+        text (str): The message text
+        priority (int): Higher priorities are sent first
+        destination (str): Callsign or @GROUP used for rate limiting
+        submitted (float): time.time() when the message was queued
+    """
+
+    def __init__(self, text: str, priority: int, destination: str):
+        super().__init__()
+        self.text = text
+        self.priority = priority
+        self.destination = destination
+        self.submitted = time.time()
+
+    def __repr__(self) -> str:
+        return f"QueuedMessage({self.text!r}, priority={self.priority}, destination={self.destination!r})"
+
+
+class TransmitQueue:
+    """
+    Outbound message queue that hands messages to JS8Call one transmission at a time.
+
+    JS8Call transmits in fixed slots whose length depends on the speed mode
+    (15 s Normal, 10 s Fast, 6 s Turbo, 30 s Slow, 4 s Ultra) and has a
+    single transmit buffer, so sending a message while the previous one is
+    still on air clobbers it. The queue watches RIG.PTT and TX.FRAME to see
+    when the previous transmission has finished and sends the next message
+    straight away, so JS8Call can start it in the very next slot.
+
+    A transmission counts as finished when PTT drops after its last expected
+    frame. Without PTT events it is assumed to be finished one period after
+    the last TX.FRAME. If JS8Call reports neither, the queue falls back to
+    the estimated airtime of the message.
+
+    Messages are sent highest priority first, then in submission order. A
+    per-destination rate limit keeps a minimum interval between messages to
+    the same callsign or group; a rate-limited message does not hold up
+    messages to other destinations.
+
+        queue = TransmitQueue(api, rate_limit=60)
+        queue.start()
+        queue.submit("@ALLCALL QRV 20M", priority=-1)
+        queue.submit("K1ABC: SNR?", priority=5).result()
+    """
+
+    def __init__(self, api: JS8CallAPI, rate_limit: float = 0.0,
+                 rate_limits: Optional[Mapping[str, float]] = None, guard: float = 0.5,
+                 periods: Optional[Mapping[int, float]] = None):
+        """
+        Args:
+            api (JS8CallAPI): A connected client
+            rate_limit (float): Minimum seconds between messages to the same destination (default: 0)
+            rate_limits (dict, optional): Per-destination overrides of rate_limit, e.g. {'@ALLCALL': 300}
+            guard (float): Extra seconds to wait after a transmission ends (default: 0.5)
+            periods (dict, optional): Slot length in seconds per speed mode (default: SPEED_PERIODS)
+        """
+        self.api = api
+        self.rate_limit = rate_limit
+        self.rate_limits = {dest.upper(): interval for dest, interval in (rate_limits or {}).items()}
+        self.guard = guard
+        self.periods = dict(periods or SPEED_PERIODS)
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[int, int, QueuedMessage]] = []
+        self._counter = itertools.count()
+        self._last_sent: Dict[str, float] = {}
+        self._speed = JS8CallAPI.JS8_NORMAL
+        # Transmitter state, all times from time.monotonic()
+        self._ptt = False
+        self._ptt_off_at: Optional[float] = None
+        self._last_frame_at: Optional[float] = None
+        self._awaiting = False
+        self._sent_at = 0.0
+        self._busy_until = 0.0
+        self._frames_seen = 0
+        self._frames_expected = 0
+        self._subscriptions: List[Any] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    # -- queueing ------------------------------------------------------------
+
+    def submit(self, text: str, priority: int = 0, destination: Optional[str] = None) -> QueuedMessage:
+        """
+        Queue a message for transmission.
+
+        Args:
+            text (str): The message text, as for send_message_text()
+            priority (int): Higher priorities are sent first (default: 0)
+            destination (str, optional): Rate limit key (default: the first word of text)
+
+        Returns:
+            QueuedMessage: Future resolved when the message is handed to JS8Call
+        """
+        message = QueuedMessage(text, priority, (destination or message_destination(text)).upper())
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Transmit queue is stopped")
+            heapq.heappush(self._heap, (-priority, next(self._counter), message))
+            self._cond.notify_all()
+        return message
+
+    def pending(self) -> List[QueuedMessage]:
+        """Messages not yet sent, in the order they would go out ignoring rate limits."""
+        with self._cond:
+            return [entry[2] for entry in sorted(self._heap) if not entry[2].cancelled()]
+
+    def __len__(self) -> int:
+        return len(self.pending())
+
+    def period(self) -> float:
+        """Slot length in seconds for the current speed mode."""
+        return self.periods.get(self._speed, SPEED_PERIODS[JS8CallAPI.JS8_NORMAL])
+
+    # -- transmitter state ---------------------------------------------------
+
+    def _on_ptt(self, message: Dict[str, Any]) -> None:
+        params = message.get('params') or {}
+        if 'PTT' in params:
+            ptt = bool(params['PTT'])
+        else:
+            ptt = str(message.get('value', '')).lower() == 'on'
+        with self._cond:
+            self._ptt = ptt
+            if not ptt:
+                self._ptt_off_at = time.monotonic()
+            self._cond.notify_all()
+
+    def _on_frame(self, message: Dict[str, Any]) -> None:
+        with self._cond:
+            self._last_frame_at = time.monotonic()
+            if self._awaiting:
+                self._frames_seen += 1
+            self._cond.notify_all()
+
+    def _on_speed(self, message: Dict[str, Any]) -> None:
+        speed = (message.get('params') or {}).get('SPEED')
+        if speed is not None:
+            with self._cond:
+                self._speed = speed
+
+    def _busy_for(self, now: float) -> float:
+        """Seconds until the transmitter is free (0 when it is free now). Called with the lock held."""
+        period = self.period()
+        if self._ptt:
+            return period
+        started = self._frames_seen or (self._ptt_off_at is not None and self._ptt_off_at >= self._sent_at)
+        if self._awaiting and not started:
+            # JS8Call has not reported our transmission yet: fall back to its estimated airtime
+            if now < self._busy_until:
+                return self._busy_until - now
+            self._awaiting = False
+            return 0.0
+        if self._last_frame_at is not None:
+            done_at = self._last_frame_at + period
+            if (self._awaiting and self._frames_seen >= self._frames_expected
+                    and self._ptt_off_at is not None and self._ptt_off_at >= self._last_frame_at):
+                done_at = self._ptt_off_at
+            done_at += self.guard
+            if now < done_at:
+                return done_at - now
+        self._awaiting = False
+        return 0.0
+
+    def _next_message(self, now: float) -> Tuple[Optional[QueuedMessage], Optional[float]]:
+        """
+        Pop the best message that is not rate limited. Called with the lock held.
+
+        Returns:
+            (message, None), or (None, seconds until a rate-limited message becomes eligible or None)
+        """
+        deferred = []
+        chosen, wait = None, None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            message = entry[2]
+            if message.cancelled():
+                continue
+            interval = self.rate_limits.get(message.destination, self.rate_limit)
+            last = self._last_sent.get(message.destination)
+            if interval and last is not None and now < last + interval:
+                deferred.append(entry)
+                remaining = last + interval - now
+                wait = remaining if wait is None else min(wait, remaining)
+                continue
+            chosen = message
+            break
+        for entry in deferred:
+            heapq.heappush(self._heap, entry)
+        return chosen, (None if chosen else wait)
+
+    # -- scheduler -----------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    now = time.monotonic()
+                    busy = self._busy_for(now)
+                    if busy > 0:
+                        self._cond.wait(busy)
+                        continue
+                    message, wait = self._next_message(now)
+                    if message is not None and message.set_running_or_notify_cancel():
+                        break
+                    if message is None:
+                        self._cond.wait(wait)
+            self._send(message)
+
+    def _send(self, message: QueuedMessage) -> None:
+        try:
+            speed = self.api.get_speed()
+        except (TimeoutError, ConnectionError, OSError) as e:
+            logger.error(f"Could not read speed mode, assuming the last known one: {e}")
+            speed = self._speed
+        frames = max(1, frame_count(message.text))
+        with self._cond:
+            self._speed = speed
+            now = time.monotonic()
+            self._awaiting = True
+            self._sent_at = now
+            self._frames_seen = 0
+            self._frames_expected = frames
+            # Up to one period until the next slot starts, then the frames themselves
+            self._busy_until = now + (frames + 1) * self.period() + self.guard
+            self._last_sent[message.destination] = now
+        try:
+            self.api.send_message_text(message.text)
+        except (ConnectionError, OSError) as e:
+            logger.error(f"Failed to send queued message {message.text!r}: {e}")
+            with self._cond:
+                self._awaiting = False
+            message.set_exception(e)
+            return
+        message.set_result(time.time())
+
+    def start(self) -> None:
+        """Subscribe to transmitter events and start sending queued messages in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        try:
+            self._speed = self.api.get_speed()
+        except (TimeoutError, ConnectionError, OSError) as e:
+            logger.error(f"Could not read speed mode, assuming Normal: {e}")
+        self._subscriptions = [
+            self.api.on('RIG.PTT', self._on_ptt),
+            self.api.on('TX.FRAME', self._on_frame),
+            self.api.on('MODE.SPEED', self._on_speed),
+        ]
+        with self._cond:
+            self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="JS8CallAPI-tx-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self, cancel_pending: bool = True) -> None:
+        """
+        Stop the scheduler thread and unsubscribe.
+
+        Args:
+            cancel_pending (bool): Cancel messages that were not sent yet (default: True)
+        """
+        with self._cond:
+            self._stopped = True
+            if cancel_pending:
+                for entry in self._heap:
+                    entry[2].cancel()
+                self._heap = []
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions = []
+
+    def __enter__(self) -> 'TransmitQueue':
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -1,17 +1,25 @@
 # js8_band_predictor.py
 
+import argparse
 from datetime import datetime
 import gpsd
+import http.server
+import sys
+import tempfile
+import threading
 import time
 from timezonefinder import TimezoneFinder
 import pytz
 import requests
 import xml.etree.ElementTree as ET
-import socket
 import json
 from typing import Optional, Tuple
 import os
 from dotenv import load_dotenv
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl; the cache then works unlocked
+    fcntl = None
 from JS8CallAPI import JS8CallAPI
 
 # Load environment variables
@@ -32,24 +40,123 @@ JS8_BANDS = {
     "2m": 144.178
 }
 
-def check_internet_connection() -> bool:
-    """Check if there is an active internet connection."""
-    try:
-        socket.create_connection(("8.8.8.8", 53), timeout=3)
-        return True
-    except OSError:
-        return False
+# Seconds a cached response is served without asking the server again
+CACHE_TTLS = {
+    "hamqsl": 3 * 3600,   # HamQSL refreshes its solar data every few hours
+    "weather": 15 * 60,
+}
+# Shared by every band_predictor process on this machine
+CACHE_PATH = os.getenv('BAND_PREDICTOR_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'js8call_band_predictor.json'))
+# Directory of hamqsl.xml / weather.json to read instead of the network
+FIXTURES_DIR = os.getenv('BAND_PREDICTOR_FIXTURES')
+
+class ResponseCache:
+    """
+    On-disk cache of HTTP responses with per-source TTLs.
+
+    Entries live in one JSON file guarded by a lock file, so concurrent runs
+    share them. An expired entry is revalidated with If-None-Match /
+    If-Modified-Since, and a 304 just renews it. If the server cannot be
+    reached the stale body is served rather than nothing.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, ttls: dict = CACHE_TTLS, fixtures_dir: Optional[str] = FIXTURES_DIR):
+        self.path = path
+        self.ttls = ttls
+        self.fixtures_dir = fixtures_dir
+
+    def _lock(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        lock_file = open(self.path + '.lock', 'a')
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: dict) -> None:
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Warning: could not write cache {self.path}: {e}")
+
+    def get(self, source: str, key: str, url: Optional[str], fixture: str) -> Optional[str]:
+        """
+        Return the body of url, from the cache while it is fresh.
+
+        Args:
+            source: TTL name from self.ttls, e.g. "hamqsl"
+            key: Cache key; differs from url when url holds secrets such as an API key
+            url: URL to fetch; may be None when fixtures_dir is set
+            fixture: File in fixtures_dir served instead of the network, if fixtures_dir is set
+
+        Returns:
+            The response text, or None if it was never fetched and cannot be now
+        """
+        if self.fixtures_dir:
+            try:
+                with open(os.path.join(self.fixtures_dir, fixture)) as f:
+                    return f.read()
+            except OSError:
+                return None
+
+        with self._lock():
+            entries = self._load()
+            entry = entries.get(key)
+            now = time.time()
+            if entry and now - entry['fetched'] < self.ttls.get(source, 0):
+                return entry['body']
+
+            headers = {}
+            if entry and entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry and entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            try:
+                response = requests.get(url, headers=headers, timeout=5)
+                if response.status_code == 304 and entry:
+                    entry['fetched'] = now
+                else:
+                    response.raise_for_status()
+                    entry = {
+                        'fetched': now,
+                        'body': response.text,
+                        'etag': response.headers.get('ETag'),
+                        # Only echoed back when the server sent one; our own clock means nothing to it
+                        'last_modified': response.headers.get('Last-Modified'),
+                    }
+            except requests.RequestException as e:
+                if entry:
+                    print(f"Warning: {source} unavailable ({e}), using data from {time.ctime(entry['fetched'])}")
+                    return entry['body']
+                raise
+            entries[key] = entry
+            self._save(entries)
+            return entry['body']
+
+response_cache = ResponseCache()
 
 def fetch_weather_data(lat: float, lon: float) -> Optional[Tuple[float, str]]:
     """Fetch weather data from OpenWeatherMap API based on GPS coordinates."""
     try:
         api_key = os.getenv('OPENWEATHERMAP_API_KEY')
-        if not api_key:
+        if not api_key and not response_cache.fixtures_dir:
             return None
             
-        url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={api_key}&units=imperial"
-        response = requests.get(url, timeout=5)
-        data = response.json()
+        url = None
+        if api_key:
+            url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={api_key}&units=imperial"
+        # Key on a ~1 km position so the API key stays out of the cache file
+        body = response_cache.get("weather", f"weather:{lat:.2f},{lon:.2f}", url, "weather.json")
+        data = json.loads(body)
         
         temperature = data['main']['temp']
         weather = data['weather'][0]['main'].lower()
@@ -61,8 +168,7 @@ def fetch_hamqsl_conditions() -> Optional[Tuple[Optional[float], Optional[int],
     """Fetch solar conditions from HamQSL API."""
     try:
         url = "https://www.hamqsl.com/solarxml.php"
-        response = requests.get(url, timeout=5)
-        root = ET.fromstring(response.content)
+        root = ET.fromstring(response_cache.get("hamqsl", url, url, "hamqsl.xml"))
         
         # Get solar flux
         solarflux_elem = root.find('solardata/solarflux')
@@ -205,7 +311,7 @@ def recommend_js8_band(latitude: float, longitude: float, utc_time: datetime) ->
     temperature = None
     weather = None
     
-    if False: #check_internet_connection():
+    if False:
         weather_data = fetch_weather_data(latitude, longitude)
         if weather_data:
             temperature, weather = weather_data
@@ -265,39 +371,38 @@ def main():
 
     band, freq = recommend_js8_band(lat, lon, gps_time)
     
-    # Fetch and display solar conditions if available
-    if check_internet_connection():
-        solar_data = fetch_hamqsl_conditions()
-        if solar_data:
-            solarflux, kindex, muf = solar_data
-            print("\nSolar Conditions:")
-            if solarflux is not None:
-                print(f"Solar Flux: {solarflux}")
-            if kindex is not None:
-                print(f"K-index: {kindex}")
-            if muf is not None:
-                print(f"Maximum Usable Frequency: {muf:.1f} MHz")
-            
-            # Explain conditions
-            print("\nWhat this means:")
-            if solarflux is not None:
-                if solarflux > 150:
-                    print("• High solar activity - Good conditions for long-distance communication")
-                elif solarflux > 100:
-                    print("• Moderate solar activity - Fair conditions for long-distance communication")
-                else:
-                    print("• Low solar activity - Limited long-distance communication")
-                
-            if kindex is not None:
-                if kindex <= 2:
-                    print("• Quiet geomagnetic field - Good conditions for HF propagation")
-                elif kindex <= 4:
-                    print("• Slightly disturbed conditions - Some HF bands may be affected")
-                else:
-                    print("• Disturbed conditions - HF propagation may be poor")
+    # Fetch and display solar conditions if available (cached, so offline runs reuse the last data)
+    solar_data = fetch_hamqsl_conditions()
+    if solar_data:
+        solarflux, kindex, muf = solar_data
+        print("\nSolar Conditions:")
+        if solarflux is not None:
+            print(f"Solar Flux: {solarflux}")
+        if kindex is not None:
+            print(f"K-index: {kindex}")
+        if muf is not None:
+            print(f"Maximum Usable Frequency: {muf:.1f} MHz")
+        
+        # Explain conditions
+        print("\nWhat this means:")
+        if solarflux is not None:
+            if solarflux > 150:
+                print("• High solar activity - Good conditions for long-distance communication")
+            elif solarflux > 100:
+                print("• Moderate solar activity - Fair conditions for long-distance communication")
+            else:
+                print("• Low solar activity - Limited long-distance communication")
             
-            if muf is not None:
-                print(f"• Maximum usable frequency of {muf:.1f} MHz suggests {'good' if muf > 20 else 'limited'} high-band propagation")
+        if kindex is not None:
+            if kindex <= 2:
+                print("• Quiet geomagnetic field - Good conditions for HF propagation")
+            elif kindex <= 4:
+                print("• Slightly disturbed conditions - Some HF bands may be affected")
+            else:
+                print("• Disturbed conditions - HF propagation may be poor")
+        
+        if muf is not None:
+            print(f"• Maximum usable frequency of {muf:.1f} MHz suggests {'good' if muf > 20 else 'limited'} high-band propagation")
     
     print(f"\nRecommended: {band} ({freq} MHz)")
     
@@ -307,15 +412,14 @@ def main():
     day = 7 <= local_hour <= 18
     high_lat = abs(lat) > 45
     
-    if check_internet_connection():
-        weather_data = fetch_weather_data(lat, lon)
-        if weather_data:
-            temperature, weather = weather_data
-            print(f"• Current temperature: {temperature}°F")
-            print(f"• Weather conditions: {weather}")
-            
-            if temperature and temperature > 85 and weather == "sunny":
-                print("• High temperature and clear skies suggest enhanced high-band propagation")
+    weather_data = fetch_weather_data(lat, lon)
+    if weather_data:
+        temperature, weather = weather_data
+        print(f"• Current temperature: {temperature}°F")
+        print(f"• Weather conditions: {weather}")
+        
+        if temperature and temperature > 85 and weather == "sunny":
+            print("• High temperature and clear skies suggest enhanced high-band propagation")
     
     if not day:
         print("• Night time conditions favor lower frequency bands")
@@ -334,5 +438,94 @@ def main():
         else:
             print("Failed to update JS8Call frequency")
 
+def self_test() -> int:
+    """
+    Check the fetchers and the response cache without touching the network.
+
+    The fetchers parse fixtures/; the cache talks to a local HTTP server
+    that serves fixtures/hamqsl.xml with an ETag or a Last-Modified date.
+
+    Returns:
+        Number of failed checks
+    """
+    global response_cache
+    fixtures = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+    failures = []
+
+    def check(name: str, ok: bool) -> None:
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+        if not ok:
+            failures.append(name)
+
+    saved_cache = response_cache
+    try:
+        response_cache = ResponseCache(fixtures_dir=fixtures)
+        check("fetch_hamqsl_conditions parses fixtures/hamqsl.xml", fetch_hamqsl_conditions() == (142.0, 2, None))
+        check("fetch_weather_data parses fixtures/weather.json", fetch_weather_data(40.9, -74.3) == (61.3, 'clear'))
+    finally:
+        response_cache = saved_cache
+
+    with open(os.path.join(fixtures, 'hamqsl.xml'), 'rb') as f:
+        body = f.read()
+    last_modified = 'Sat, 17 Oct 2026 12:00:00 GMT'
+    seen = []  # Headers of each request the server received
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append(dict(self.headers))
+            if self.path == '/last-modified':
+                validator = {'Last-Modified': last_modified}
+                unchanged = self.headers.get('If-Modified-Since') == last_modified
+            else:
+                validator = {'ETag': '"v1"'}
+                unchanged = self.headers.get('If-None-Match') == '"v1"'
+            self.send_response(304 if unchanged else 200)
+            for name, value in validator.items():
+                self.send_header(name, value)
+            self.send_header('Content-Type', 'text/xml; charset=ISO-8859-1')
+            self.send_header('Content-Length', '0' if unchanged else str(len(body)))
+            self.end_headers()
+            if not unchanged:
+                self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    text = body.decode('iso-8859-1')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ResponseCache(path=os.path.join(cache_dir, 'cache.json'), ttls={'test': 3600}, fixtures_dir=None)
+        etag_url, modified_url = base + '/etag', base + '/last-modified'
+        try:
+            check("first get fetches", cache.get('test', etag_url, etag_url, '') == text and len(seen) == 1)
+            check("fresh entry is served from the cache", cache.get('test', etag_url, etag_url, '') == text and len(seen) == 1)
+
+            cache.ttls['test'] = 0
+            fetched = cache._load()[etag_url]['fetched']
+            check("expired entry is renewed by a 304",
+                  cache.get('test', etag_url, etag_url, '') == text and len(seen) == 2
+                  and seen[-1].get('If-None-Match') == '"v1"' and cache._load()[etag_url]['fetched'] >= fetched)
+            check("no If-Modified-Since without Last-Modified", 'If-Modified-Since' not in seen[-1])
+
+            cache.get('test', modified_url, modified_url, '')
+            check("If-Modified-Since echoes the server's Last-Modified",
+                  cache.get('test', modified_url, modified_url, '') == text
+                  and seen[-1].get('If-Modified-Since') == last_modified)
+        finally:
+            server.shutdown()
+            server.server_close()
+        check("stale entry is served when the server is down", cache.get('test', etag_url, etag_url, '') == text)
+
+    print(f"{len(failures)} check(s) failed" if failures else "All checks passed")
+    return len(failures)
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recommend a JS8Call band for the current time and location")
+    parser.add_argument('--self-test', action='store_true',
+                        help="check the fetchers and the response cache offline, then exit")
+    if parser.parse_args().self_test:
+        sys.exit(1 if self_test() else 0)
     main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Transport benchmarks for JS8CallAPI against the in-process FakeJS8CallServer.
+
+Usage:
+    python -m benchmarks.bench_client [--quick] [--output FILE] [--compare FILE] [--only NAME ...]
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from JS8CallAPI import JS8CallAPI
+from JS8CallAPI.codec import PREFERENCE, get_codec
+from JS8CallAPI.fake_server import FakeJS8CallServer
+from JS8CallAPI.grid_utils import (grid_square_to_lat_lon, grid_squares_to_lat_lon, lat_lon_to_grid_square,
+                                   lat_lon_to_grid_squares, np)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct-th percentile of values using linear interpolation."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def connected_client(server: FakeJS8CallServer) -> JS8CallAPI:
+    api = JS8CallAPI(port=server.port, timeout=10)
+    api.connect()
+    return api
+
+
+def bench_latency(scale: float) -> Dict[str, Any]:
+    """Round-trip latency of sequential send_message calls."""
+    count = int(2000 * scale)
+    with FakeJS8CallServer(seed=1) as server:
+        api = connected_client(server)
+        try:
+            for _ in range(50):
+                api.send_message("RIG.GET_FREQ")
+            samples = []
+            for _ in range(count):
+                start = time.perf_counter()
+                api.send_message("RIG.GET_FREQ")
+                samples.append((time.perf_counter() - start) * 1000.0)
+        finally:
+            api.close()
+    return {
+        'requests': count,
+        'mean_ms': statistics.mean(samples),
+        'p50_ms': percentile(samples, 50),
+        'p90_ms': percentile(samples, 90),
+        'p99_ms': percentile(samples, 99),
+        'max_ms': max(samples),
+    }
+
+
+def bench_throughput_sequential(scale: float) -> Dict[str, Any]:
+    """Requests per second issuing one request at a time."""
+    count = int(3000 * scale)
+    with FakeJS8CallServer(seed=1) as server:
+        api = connected_client(server)
+        try:
+            start = time.perf_counter()
+            for _ in range(count):
+                api.send_message("RIG.GET_FREQ")
+            elapsed = time.perf_counter() - start
+        finally:
+            api.close()
+    return {'requests': count, 'seconds': elapsed, 'requests_per_sec': count / elapsed}
+
+
+def bench_throughput_pipelined(scale: float, batch_size: int = 32) -> Dict[str, Any]:
+    """Requests per second when requests are pipelined with send_batch."""
+    batches = max(1, int(3000 * scale) // batch_size)
+    batch = ["RIG.GET_FREQ"] * batch_size
+    with FakeJS8CallServer(seed=1) as server:
+        api = connected_client(server)
+        try:
+            start = time.perf_counter()
+            for _ in range(batches):
+                api.send_batch(batch)
+            elapsed = time.perf_counter() - start
+        finally:
+            api.close()
+    count = batches * batch_size
+    return {'requests': count, 'batch_size': batch_size, 'seconds': elapsed,
+            'requests_per_sec': count / elapsed}
+
+
+def bench_throughput_threaded(scale: float, threads: int = 8) -> Dict[str, Any]:
+    """Requests per second with several threads sharing one client."""
+    per_thread = max(1, int(3000 * scale) // threads)
+    with FakeJS8CallServer(seed=1, latency=0.002) as server:
+        api = connected_client(server)
+        try:
+            def worker():
+                for _ in range(per_thread):
+                    api.send_message("RIG.GET_FREQ")
+            workers = [threading.Thread(target=worker) for _ in range(threads)]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            api.close()
+    count = per_thread * threads
+    return {'requests': count, 'threads': threads, 'server_latency_ms': 2.0,
+            'seconds': elapsed, 'requests_per_sec': count / elapsed}
+
+
+def bench_event_ingest(scale: float) -> Dict[str, Any]:
+    """Unsolicited events per second delivered to a subscriber."""
+    count = int(20000 * scale)
+    params = {'CALL': 'K1ABC', 'GRID': 'FN42', 'SNR': -12, 'FREQ': 14079500,
+              'DIAL': 14078000, 'OFFSET': 1500, 'UTC': 0, '_ID': -1}
+    with FakeJS8CallServer(seed=1) as server:
+        api = connected_client(server)
+        received = [0]
+        done = threading.Event()
+
+        def on_spot(message):
+            received[0] += 1
+            if received[0] >= count:
+                done.set()
+
+        api.on('RX.SPOT', on_spot)
+        try:
+            start = time.perf_counter()
+            for _ in range(count):
+                server.push_event('RX.SPOT', params)
+            done.wait(timeout=60)
+            elapsed = time.perf_counter() - start
+        finally:
+            api.close()
+    return {'events': received[0], 'seconds': elapsed, 'events_per_sec': received[0] / elapsed}
+
+
+def bench_dispatch(scale: float) -> Dict[str, Any]:
+    """Reader CPU per received event, with and without a subscriber for its type."""
+    count = int(100000 * scale)
+    server = FakeJS8CallServer(seed=1)
+    line = server._encode('RX.SPOT', '', {'CALL': 'K1ABC', 'GRID': 'FN42', 'SNR': -12, 'FREQ': 14079500,
+                                          'DIAL': 14078000, 'OFFSET': 1500, 'UTC': 0, '_ID': -1}).rstrip(b"\n")
+    # Never connected; _dispatch_line is driven directly
+    api = JS8CallAPI(port=server.port)
+
+    def per_line() -> float:
+        start = time.perf_counter()
+        for _ in range(count):
+            api._dispatch_line(line)
+        return (time.perf_counter() - start) * 1e6 / count
+
+    filtered = per_line()
+    subscription = api.on('RX.SPOT', lambda message: None)
+    decoded = per_line()
+    subscription.cancel()
+    api.close()
+    return {'events': count, 'filtered_us_per_event': filtered, 'decoded_us_per_event': decoded}
+
+
+def _time_decode(payload: bytes, loads: Callable[[bytes], Any], repeat: int) -> float:
+    """Return the best per-call decode time in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loads(payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_decode(scale: float) -> Dict[str, Any]:
+    """Decode cost of large band activity and inbox responses, per installed JSON codec."""
+    stations = int(2000 * scale) or 1
+    inbox_size = int(5000 * scale) or 1
+    server = FakeJS8CallServer(stations=stations, inbox_size=inbox_size, seed=1)
+    band = server._encode('RX.BAND_ACTIVITY', '', server._respond('RX.GET_BAND_ACTIVITY', '', {})['params'])
+    inbox = server._encode('INBOX.MESSAGES', '', server._respond('INBOX.GET_MESSAGES', '', {})['params'])
+    codecs = []
+    for codec_name in PREFERENCE:
+        try:
+            codecs.append(get_codec(codec_name))
+        except ImportError:
+            continue
+    results = {}
+    for name, payload, entries in (('band_activity', band, len(server.band_activity)),
+                                   ('inbox', inbox, len(server.inbox))):
+        results[name] = {'bytes': len(payload), 'entries': entries}
+        for codec in codecs:
+            seconds = _time_decode(payload, codec.loads, repeat=10)
+            results[name][codec.name] = {
+                'decode_ms': seconds * 1000.0,
+                'us_per_entry': seconds * 1e6 / max(entries, 1),
+                'mb_per_sec': len(payload) / seconds / 1e6,
+            }
+    return results
+
+
+def bench_grid(scale: float) -> Dict[str, Any]:
+    """Maidenhead conversion rate, scalar loop vs batch (NumPy when installed), both directions."""
+    count = int(200000 * scale) or 1
+    rng = random.Random(1)
+    lats = [rng.uniform(-90, 90) for _ in range(count)]
+    lons = [rng.uniform(-180, 180) for _ in range(count)]
+    grids = [lat_lon_to_grid_square(lat, lon) for lat, lon in zip(lats, lons)]
+    if np is not None:
+        lats, lons, grid_input = np.array(lats), np.array(lons), np.array(grids)
+    else:
+        grid_input = grids
+
+    def rate(function: Callable[[], Any]) -> float:
+        start = time.perf_counter()
+        function()
+        return count / (time.perf_counter() - start)
+
+    return {
+        'coordinates': count,
+        'numpy': np is not None,
+        'to_grid_scalar_per_sec': rate(lambda: [lat_lon_to_grid_square(lat, lon) for lat, lon in zip(lats, lons)]),
+        'to_grid_batch_per_sec': rate(lambda: lat_lon_to_grid_squares(lats, lons)),
+        'to_lat_lon_scalar_per_sec': rate(lambda: [grid_square_to_lat_lon(grid) for grid in grids]),
+        'to_lat_lon_batch_per_sec': rate(lambda: grid_squares_to_lat_lon(grid_input)),
+    }
+
+
+BENCHMARKS: Dict[str, Callable[[float], Dict[str, Any]]] = {
+    'latency': bench_latency,
+    'throughput_sequential': bench_throughput_sequential,
+    'throughput_pipelined': bench_throughput_pipelined,
+    'throughput_threaded': bench_throughput_threaded,
+    'event_ingest': bench_event_ingest,
+    'dispatch': bench_dispatch,
+    'decode': bench_decode,
+    'grid': bench_grid,
+}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def flatten(data: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    """Flatten nested results to dotted keys with numeric values."""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline_path: str) -> None:
+    """Print each numeric result next to a previous run."""
+    with open(baseline_path) as f:
+        baseline = flatten(json.load(f).get('results', {}))
+    print(f"{'metric':<50} {'baseline':>14} {'current':>14} {'ratio':>8}")
+    for key, value in flatten(current).items():
+        if key in baseline and baseline[key]:
+            print(f"{key:<50} {baseline[key]:>14.4f} {value:>14.4f} {value / baseline[key]:>8.2f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the JS8CallAPI transport")
+    parser.add_argument('--quick', action='store_true', help="run at 10%% of the default sizes")
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    parser.add_argument('--compare', help="previous JSON results to compare against")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    args = parser.parse_args(argv)
+
+    scale = 0.1 if args.quick else 1.0
+    results = {}
+    for name in args.only or BENCHMARKS:
+        print(f"running {name}...", file=sys.stderr)
+        results[name] = BENCHMARKS[name](scale)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'scale': scale,
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
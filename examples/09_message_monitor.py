@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """
 Example 9: Message Monitor
-Demonstrates how to monitor received messages and spots
+Demonstrates how to monitor received messages and spots as JS8Call pushes them
 """
 from JS8CallAPI import JS8CallAPI
-import time
 from datetime import datetime
+import time
 
 def monitor_messages():
     api = JS8CallAPI()
@@ -15,35 +15,32 @@ def monitor_messages():
         api.connect()
         
         # Monitor for 60 seconds
-        end_time = time.time() + 60
         print("\nMonitoring messages for 60 seconds...")
+        deadline = time.monotonic() + 60
         
-        while time.time() < end_time:
-            print(f"\n--- Message Activity at {datetime.now().strftime('%H:%M:%S')} ---")
-            
-            # Check for directed messages
-            directed = api.get_directed_message()
-            if directed:
-                print("\nDirected Message:")
-                print(f"From: {directed.get('FROM')}")
-                print(f"To: {directed.get('TO')}")
-                print(f"Text: {directed.get('TEXT')}")
-            
-            # Check for spots
-            spot = api.get_spot()
-            if spot:
-                print("\nSpot:")
-                print(f"Station: {spot.get('STATION')}")
-                print(f"Frequency: {spot.get('FREQ')/1000:.1f} kHz")
-                print(f"SNR: {spot.get('SNR')} dB")
-            
-            # Check for TX frames
-            tx_frame = api.get_tx_frame()
-            if tx_frame:
-                print("\nTX Frame:")
-                print(f"Text: {tx_frame.get('TEXT')}")
-            
-            time.sleep(5)  # Check every 5 seconds
+        # Events arrive as soon as JS8Call sends them - no polling required.
+        # The stream's timeout only ends it after that long without events,
+        # so it is shortened to the time left before each wait.
+        with api.events(['RX.DIRECTED', 'RX.SPOT', 'TX.FRAME'], timeout=60) as stream:
+            for message in stream:
+                params = message.get('params', {})
+                print(f"\n--- {message['type']} at {datetime.now().strftime('%H:%M:%S')} ---")
+                
+                if message['type'] == 'RX.DIRECTED':
+                    print(f"From: {params.get('FROM')}")
+                    print(f"To: {params.get('TO')}")
+                    print(f"Text: {params.get('TEXT')}")
+                elif message['type'] == 'RX.SPOT':
+                    print(f"Station: {params.get('CALL')}")
+                    print(f"Frequency: {params.get('FREQ', 0)/1000:.1f} kHz")
+                    print(f"SNR: {params.get('SNR')} dB")
+                else:
+                    print(f"Text: {params.get('TEXT')}")
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                stream.timeout = remaining
             
     except Exception as e:
         print(f"Error: {e}")
@@ -51,4 +48,4 @@ def monitor_messages():
         api.close()
 
 if __name__ == "__main__":
-    monitor_messages() 
\ No newline at end of file
+    monitor_messages() 